@@ -1,11 +1,11 @@
 """FastAPI service for Face Recognition."""
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 import sys
+import time
 import base64
 import cv2
 import numpy as np
@@ -14,13 +14,18 @@ import numpy as np
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
-from face_app.config.settings import DB_PATH, TOLERANCE
+from face_app.config.settings import DB_PATH, TOLERANCE, ENABLE_METRICS
 from face_app.infrastructure.face_engines.fr_dlib_engine import FRDlibEngine
 from face_app.infrastructure.repos.filesystem_known_repo import FilesystemKnownRepo
 from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from face_app.infrastructure.repos.recognition_schema import open_database
+from face_app.infrastructure.repos.recognition_queries import EVENT_COLUMNS, to_epoch_ms, recent_events, event_stats
+from face_app.infrastructure.repos.gallery_index_store import GalleryIndexBuilder, GalleryIndexStore
 from face_app.domain.policies import MatchPolicy
 from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
 from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.infrastructure.metrics import PrometheusMetrics
+from face_app.infrastructure.metrics.http_exporter import CONTENT_TYPE as METRICS_CONTENT_TYPE
 from api.models import (
     RecognitionEventResponse,
     RecognitionStatsResponse,
@@ -45,6 +50,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics of this process (requests, and recognitions run by the API)
+_metrics = PrometheusMetrics() if ENABLE_METRICS else None
+
+if _metrics:
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Count requests and their latency per route."""
+        started = time.perf_counter()
+        response = await call_next(request)
+        # Route template, not the raw URL, keeps the number of series bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        _metrics.observe("http_request_seconds", time.perf_counter() - started, path=path)
+        _metrics.inc("http_requests_total", path=path, status=str(response.status_code))
+        return response
+
 # Initialize components (lazy loading)
 _face_engine = None
 _recognize_usecase = None
@@ -58,25 +79,37 @@ def get_recognize_usecase():
         # Initialize infrastructure
         _face_engine = FRDlibEngine()
         known_repo = FilesystemKnownRepo()
-        recognition_repo = SQLiteRecognitionRepo()
+        recognition_repo = SQLiteRecognitionRepo(metrics=_metrics)
         
         # Initialize domain
         match_policy = MatchPolicy(tolerance=TOLERANCE)
         
         # Initialize application
-        load_known_usecase = LoadKnownFacesUseCase(known_repo)
+        load_known_usecase = LoadKnownFacesUseCase(
+            known_repo,
+            metric=_face_engine.distance_metric,
+            index_builder=GalleryIndexBuilder(store=GalleryIndexStore.for_repo(known_repo))
+        )
         load_known_usecase.execute()  # Load known faces
         
         _recognize_usecase = RecognizeFrameUseCase(
             face_engine=_face_engine,
             load_known_usecase=load_known_usecase,
             recognition_repo=recognition_repo,
-            match_policy=match_policy
+            match_policy=match_policy,
+            metrics=_metrics
         )
     
     return _recognize_usecase
 
 
+@app.on_event("shutdown")
+def close_database():
+    """Write recognition events still queued for the database."""
+    if _recognize_usecase is not None:
+        _recognize_usecase.recognition_repo.close()
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
@@ -87,36 +120,44 @@ def root():
             "GET /events": "Get recognition events",
             "GET /stats": "Get statistics",
             "POST /recognize": "Recognize faces in image",
-            "POST /recognize/upload": "Recognize faces from uploaded file"
+            "POST /recognize/upload": "Recognize faces from uploaded file",
+            "GET /metrics": "Prometheus metrics (ENABLE_METRICS)"
         }
     }
 
 
 @app.get("/events", response_model=List[RecognitionEventResponse])
-def get_events(limit: int = 100, name: Optional[str] = None):
+def get_events(
+    limit: int = 100,
+    name: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
     """
     Get recognition events from database.
     
     Args:
         limit: Maximum number of events to return
         name: Filter by person name (optional)
+        since: Only events at or after this time (YYYY-MM-DD[ HH:MM:SS], optional)
+        until: Only events before this time (optional)
     """
+    since_ms = to_epoch_ms(since) if since else None
+    until_ms = to_epoch_ms(until) if until else None
+    if (since and since_ms is None) or (until and until_ms is None):
+        raise HTTPException(status_code=400, detail="since/until must be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS")
+    
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        
-        if name:
-            query = "SELECT id, name, time FROM recognitions WHERE name = ? ORDER BY id DESC LIMIT ?"
-            cursor.execute(query, (name, limit))
-        else:
-            query = "SELECT id, name, time FROM recognitions ORDER BY id DESC LIMIT ?"
-            cursor.execute(query, (limit,))
-        
-        results = cursor.fetchall()
-        conn.close()
+        conn = open_database(DB_PATH)
+        try:
+            results = recent_events(
+                conn, limit, names=[name] if name else None, since_ms=since_ms, until_ms=until_ms
+            )
+        finally:
+            conn.close()
         
         return [
-            RecognitionEventResponse(id=r[0], name=r[1], time=r[2])
+            RecognitionEventResponse(**dict(zip(EVENT_COLUMNS, r)))
             for r in results
         ]
     
@@ -128,38 +169,17 @@ def get_events(limit: int = 100, name: Optional[str] = None):
 def get_statistics():
     """Get recognition statistics."""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        
-        # Total events
-        cursor.execute("SELECT COUNT(*) FROM recognitions")
-        total = cursor.fetchone()[0]
-        
-        # Unique people
-        cursor.execute("SELECT COUNT(DISTINCT name) FROM recognitions")
-        unique_people = cursor.fetchone()[0]
-        
-        # Today's events
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("SELECT COUNT(*) FROM recognitions WHERE time LIKE ?", (f"{today}%",))
-        today_count = cursor.fetchone()[0]
-        
-        # Most frequent person
-        cursor.execute("""
-            SELECT name, COUNT(*) as count 
-            FROM recognitions 
-            GROUP BY name 
-            ORDER BY count DESC 
-            LIMIT 1
-        """)
-        most_frequent = cursor.fetchone()
-        
-        conn.close()
+        conn = open_database(DB_PATH)
+        try:
+            stats = event_stats(conn)
+        finally:
+            conn.close()
         
+        most_frequent = stats["most_frequent"]
         return RecognitionStatsResponse(
-            total_events=total,
-            unique_people=unique_people,
-            today_events=today_count,
+            total_events=stats["total"],
+            unique_people=stats["unique_people"],
+            today_events=stats["today"],
             most_frequent_person=most_frequent[0] if most_frequent else None,
             most_frequent_count=most_frequent[1] if most_frequent else None
         )
@@ -168,6 +188,14 @@ def get_statistics():
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus scrape endpoint."""
+    if _metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics disabled (set ENABLE_METRICS = True)")
+    return Response(content=_metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/recognize", response_model=RecognizeResponse)
 def recognize_image(request: RecognizeRequest):
     """
@@ -269,10 +297,23 @@ async def recognize_upload(file: UploadFile = File(...)):
 
 
 @app.post("/reload")
-def reload_known_faces():
-    """Reload known faces from dataset."""
+def reload_known_faces(wait: bool = False):
+    """
+    Reload known faces from dataset.
+    
+    Args:
+        wait: Block until the reload finished (default: reload in background)
+    """
     try:
         usecase = get_recognize_usecase()
+        
+        if not wait:
+            usecase.load_known_usecase.reload_async()
+            return {
+                "success": True,
+                "message": "Reload started in background"
+            }
+        
         encodings, names = usecase.load_known_usecase.reload()
         
         return {
@@ -9,6 +9,9 @@ class RecognitionEventResponse(BaseModel):
     id: int
     name: str
     time: str
+    camera_id: Optional[str] = None
+    distance: Optional[float] = None
+    track_id: Optional[int] = None
 
 
 class RecognitionStatsResponse(BaseModel):
@@ -0,0 +1,218 @@
+"""
+Gallery index benchmark - recall, latency and memory of IVF, templates and compact storage against exact search.
+
+Builds clustered synthetic galleries (several photos per identity), holds
+one photo per identity out as probes and compares every IVF nprobe setting,
+template method and float16/int8 storage with brute force: recall of the exact top-1 row, overlap of the top-k,
+agreement of the matched name after MatchPolicy, search latency and the
+gallery's resident memory.
+
+Usage:
+    python benchmarks/bench_index.py --gallery-sizes 20000,100000 --nprobe 1,4,8,16 --json index.json
+    python benchmarks/bench_index.py --per-identity 50 --nprobe "" --templates mean,weighted --rerank 0,3
+    python benchmarks/bench_index.py --nprobe "" --templates "" --storage float32,float16,int8
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+
+from face_app.config import settings
+from face_app.domain.policies import MatchPolicy
+from face_app.domain.gallery import (
+    FaceGallery, GallerySearchResult, METRIC_COSINE, METRIC_EUCLIDEAN, STORAGE_FLOAT32, STORAGES
+)
+from face_app.domain.gallery_index import IVFIndex, TemplateIndex
+from face_app.infrastructure.repos.gallery_index_store import memory_map_rows
+from synthetic import clustered_embeddings
+from bench_pipeline import ENGINE_DIMS, environment, parse_list, percentiles
+
+
+# Noise per metric so same-person distances sit well inside TOLERANCE
+SPREADS = {METRIC_EUCLIDEAN: 0.35, METRIC_COSINE: 0.6}
+
+
+def timed_search(gallery: FaceGallery, probes: np.ndarray, k: int, batch: int, repeats: int) -> tuple:
+    """
+    Search all probes in batches of ``batch`` (a frame's worth of faces).
+    
+    Returns:
+        (GallerySearchResult of every probe, per-batch latency samples in seconds)
+    """
+    results, samples = [], []
+    for start in range(0, probes.shape[0], batch):
+        block = probes[start:start + batch]
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = gallery.search(block, k)
+            samples.append(time.perf_counter() - started)
+        results.append(result)
+    
+    merged = GallerySearchResult(
+        indices=np.concatenate([r.indices for r in results]),
+        distances=np.concatenate([r.distances for r in results]),
+        labels=np.concatenate([r.labels for r in results]),
+        label_names=results[0].label_names
+    )
+    return merged, samples
+
+
+def recall(exact: GallerySearchResult, approx: GallerySearchResult, policy: MatchPolicy) -> dict:
+    """Fraction of the exact answers the approximate search also returned."""
+    k = exact.indices.shape[1]
+    top1 = float(np.mean(exact.indices[:, 0] == approx.indices[:, 0]))
+    overlap = np.mean([
+        len(set(e) & set(a)) / k for e, a in zip(exact.indices.tolist(), approx.indices.tolist())
+    ])
+    names = np.mean([
+        e.name == a.name for e, a in zip(policy.match_batch(exact), policy.match_batch(approx))
+    ])
+    return {"recall_at_1": top1, f"recall_at_{k}": float(overlap), "name_agreement": float(names)}
+
+
+def bench_index(
+    metric: str,
+    gallery_size: int,
+    per_identity: int,
+    nlist: int,
+    nprobes: List[int],
+    template_methods: List[str],
+    templates_per_identity: int,
+    reranks: List[int],
+    storages: List[str],
+    rerank_candidates: int,
+    probes_n: int,
+    batch: int,
+    k: int,
+    repeats: int
+) -> List[dict]:
+    """Exact baseline, then every IVF nprobe, template method and compact storage for one metric x gallery size."""
+    dim = ENGINE_DIMS[metric]
+    identities = max(1, gallery_size // per_identity)
+    vectors, labels = clustered_embeddings(identities, per_identity + 1, dim, metric, SPREADS[metric], seed=1)
+    
+    # Last photo of each identity is a probe, the others are enrolled
+    held_out = np.arange(per_identity, vectors.shape[0], per_identity + 1)
+    enrolled = np.setdiff1d(np.arange(vectors.shape[0]), held_out)
+    rng = np.random.default_rng(2)
+    probes = vectors[rng.choice(held_out, min(probes_n, held_out.size), replace=False)]
+    names = [f"person_{label:06d}" for label in labels[enrolled]]
+    gallery = FaceGallery(list(vectors[enrolled]), names, metric=metric)
+    del vectors
+    
+    policy = MatchPolicy(tolerance=settings.TOLERANCE)
+    config = {"metric": metric, "gallery_size": len(gallery), "probes": probes.shape[0], "batch": batch, "k": k}
+    
+    exact, samples = timed_search(gallery, probes, k, batch, repeats)
+    exact_ms = percentiles(samples)
+    results = [{"config": dict(config, index="exact"), "search_ms": exact_ms, "memory_bytes": gallery.memory_bytes}]
+    print(f"   {metric:9s} gallery={len(gallery):>7d} exact: p50 {exact_ms['p50']:.2f} ms, "
+          f"{gallery.memory_bytes / 1e6:.1f} MB")
+    
+    def measure(index, build_seconds: float, label: str, **index_config) -> None:
+        gallery.index = index
+        approx, samples = timed_search(gallery, probes, k, batch, repeats)
+        search_ms = percentiles(samples)
+        scores = recall(exact, approx, policy)
+        results.append({
+            "config": dict(config, index=index.kind if index else "exact", **index_config),
+            "build_ms": build_seconds * 1000,
+            "memory_bytes": gallery.memory_bytes,
+            "search_ms": search_ms,
+            "speedup_p50": exact_ms["p50"] / search_ms["p50"] if search_ms["p50"] else None,
+            **scores,
+        })
+        print(f"   {metric:9s} gallery={len(gallery):>7d} {label}: "
+              f"p50 {search_ms['p50']:.2f} ms, recall@1 {scores['recall_at_1']:.3f}, "
+              f"names {scores['name_agreement']:.3f}")
+    
+    if nprobes:
+        started = time.perf_counter()
+        index = IVFIndex.train(gallery, nlist=nlist)
+        build_seconds = time.perf_counter() - started
+        for nprobe in nprobes:
+            index.nprobe = nprobe
+            measure(index, build_seconds, f"ivf nlist={index.nlist} nprobe={nprobe:<3d}",
+                    nlist=index.nlist, nprobe=nprobe)
+    
+    for method in template_methods:
+        started = time.perf_counter()
+        index = TemplateIndex.build(gallery, method=method, per_identity=templates_per_identity)
+        build_seconds = time.perf_counter() - started
+        for rerank in reranks:
+            index.rerank = rerank
+            measure(index, build_seconds, f"templates {method} x{len(index)} rerank={rerank}",
+                    method=method, templates=len(index), rerank=rerank)
+    
+    # Last: the float32 rows end up memory-mapped as in the app
+    for storage in storages:
+        started = time.perf_counter()
+        gallery.quantize(storage, rerank_candidates)
+        if storage != STORAGE_FLOAT32 and not isinstance(gallery.matrix, np.memmap):
+            memory_map_rows(gallery)
+        build_seconds = time.perf_counter() - started
+        measure(None, build_seconds, f"storage {storage} ({gallery.memory_bytes / 1e6:.1f} MB)",
+                storage=storage, rerank_candidates=rerank_candidates)
+    
+    return results
+
+
+def parse_args():
+    """Benchmark matrix and output options."""
+    parser = argparse.ArgumentParser(description="Benchmark the gallery indexes against exact search")
+    parser.add_argument("--metrics", default=f"{METRIC_EUCLIDEAN},{METRIC_COSINE}", help="Comma list of metrics")
+    parser.add_argument("--gallery-sizes", default="20000,100000", help="Comma list of gallery rows")
+    parser.add_argument("--per-identity", type=int, default=5, help="Enrolled photos per identity")
+    parser.add_argument("--nlist", type=int, default=settings.IVF_NLIST, help="IVF cells (0 = sqrt of the gallery)")
+    parser.add_argument("--nprobe", default="1,4,8,16,32", help="Comma list of cells searched per probe (empty = skip IVF)")
+    parser.add_argument("--templates", default="mean,medoid,weighted",
+                        help="Comma list of template methods (empty = skip templates)")
+    parser.add_argument("--templates-per-identity", type=int, default=settings.TEMPLATES_PER_IDENTITY,
+                        help="Templates per person")
+    parser.add_argument("--rerank", default="0,3", help="Comma list of people re-ranked on their photos")
+    parser.add_argument("--storage", default=",".join(STORAGES),
+                        help="Comma list of exact-search storages (empty = skip)")
+    parser.add_argument("--rerank-candidates", type=int, default=settings.GALLERY_RERANK_CANDIDATES,
+                        help="Rows re-ranked at full precision after a compact scan")
+    parser.add_argument("--probes", type=int, default=256, help="Held-out probes per configuration")
+    parser.add_argument("--batch", type=int, default=4, help="Probes per search call (faces in a frame)")
+    parser.add_argument("--k", type=int, default=5, help="Candidates per probe")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions of every batch")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    return parser.parse_args()
+
+
+def main():
+    """Run every metric x gallery size."""
+    args = parse_args()
+    report = {"environment": environment(), "args": {k: str(v) for k, v in vars(args).items()}, "index": []}
+    
+    print("=" * 70)
+    print("🗂️  Gallery Index Benchmark")
+    print("=" * 70)
+    
+    for metric, size in itertools.product(parse_list(args.metrics), parse_list(args.gallery_sizes, int)):
+        report["index"].extend(bench_index(
+            metric, size, args.per_identity, args.nlist, parse_list(args.nprobe, int),
+            parse_list(args.templates), args.templates_per_identity, parse_list(args.rerank, int),
+            parse_list(args.storage), args.rerank_candidates,
+            args.probes, args.batch, args.k, args.repeats
+        ))
+    
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Results written to {args.json}")
+    else:
+        print("\n" + json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Recognition benchmark - FPS and p50/p95/p99 per stage, emitted as JSON.
+
+Runs headless on synthetic frames (enrollment photos pasted on a
+background) or on a replayed recording, so it works on a CI box without a
+camera or GPU. Engines that are not installed are skipped and reported.
+
+Usage:
+    python benchmarks/bench_pipeline.py --engines hog,buffalo_s --widths 320,640 \\
+        --gallery-sizes 1000,10000,100000 --faces 1,4 --tracking off,on --json out.json
+    python benchmarks/compare.py before.json after.json
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+import cv2
+
+from face_app.config import settings
+from face_app.domain.ports import FaceEnginePort
+from face_app.domain.policies import MatchPolicy
+from face_app.domain.gallery import FaceGallery, METRIC_COSINE, METRIC_EUCLIDEAN
+from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
+from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.application.usecases.recognize_tracked import RecognizeTrackedUseCase
+from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from synthetic import SyntheticKnownRepo, FrameSynthesizer, load_face_images, synthetic_embeddings
+
+
+STAGES = ("preprocess", "detect", "encode", "match", "persist", "total")
+ENGINE_DIMS = {METRIC_EUCLIDEAN: 128, METRIC_COSINE: 512}
+
+
+class TimedEngine(FaceEnginePort):
+    """Engine wrapper that accumulates time spent in encode_faces."""
+    
+    def __init__(self, engine: FaceEnginePort):
+        """Wrap ``engine``; encode_seconds is reset by the caller per frame."""
+        self.engine = engine
+        self.distance_metric = engine.distance_metric
+        self.embeds_on_detect = engine.embeds_on_detect
+        self.encode_seconds = 0.0
+    
+    def detect_faces(self, rgb_frame):
+        return self.engine.detect_faces(rgb_frame)
+    
+    def encode_faces(self, rgb_frame, boxes):
+        started = time.perf_counter()
+        try:
+            return self.engine.encode_faces(rgb_frame, boxes)
+        finally:
+            self.encode_seconds += time.perf_counter() - started
+    
+    def compute_distances(self, known_encodings, probe_encoding):
+        return self.engine.compute_distances(known_encodings, probe_encoding)
+    
+    def analyze_faces(self, rgb_frame):
+        # Detection + embedding in one pass: counted as detect
+        return self.engine.analyze_faces(rgb_frame)
+    
+    def analyze_regions(self, rgb_frame, regions):
+        return self.engine.analyze_regions(rgb_frame, regions)
+
+
+def create_engine(spec: str) -> FaceEnginePort:
+    """
+    Build an engine from a short name.
+    
+    Args:
+        spec: "hog" / "cnn" (face_recognition) or an InsightFace pack ("buffalo_s", "buffalo_l")
+    """
+    if spec in ("hog", "cnn"):
+        from face_app.infrastructure.face_engines.fr_dlib_engine import FRDlibEngine
+        return FRDlibEngine(model=spec)
+    if spec.startswith("buffalo"):
+        from face_app.infrastructure.face_engines.insightface_engine import InsightFaceEngine
+        return InsightFaceEngine(model_name=spec, ctx_id=-1)
+    raise ValueError(f"Unknown engine '{spec}'")
+
+
+def percentiles(samples_s: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean in milliseconds."""
+    samples = np.array(samples_s, dtype=np.float64) * 1000
+    if samples.size == 0:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "mean": float(samples.mean())}
+
+
+def bench_matching(gallery_sizes: List[int], probe_counts: List[int], repeats: int) -> List[dict]:
+    """Gallery search + match policy alone (no engine needed)."""
+    results = []
+    policy = MatchPolicy(tolerance=settings.TOLERANCE)
+    
+    for metric, size in itertools.product((METRIC_EUCLIDEAN, METRIC_COSINE), gallery_sizes):
+        dim = ENGINE_DIMS[metric]
+        vectors = synthetic_embeddings(size, dim, metric, seed=1)
+        names = [f"person_{i // 5:06d}" for i in range(size)]
+        build_started = time.perf_counter()
+        gallery = FaceGallery(list(vectors), names, metric=metric)
+        build_seconds = time.perf_counter() - build_started
+        
+        for probes_n in probe_counts:
+            probes = synthetic_embeddings(probes_n, dim, metric, seed=2)
+            samples = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                policy.match_batch(gallery.search(probes, k=1))
+                samples.append(time.perf_counter() - started)
+            
+            results.append({
+                "config": {"metric": metric, "gallery_size": size, "probes": probes_n},
+                "build_ms": build_seconds * 1000,
+                "match_ms": percentiles(samples),
+            })
+            print(f"   match {metric:9s} gallery={size:>7d} probes={probes_n}: "
+                  f"p50 {results[-1]['match_ms']['p50']:.2f} ms")
+        
+        del gallery, vectors
+    return results
+
+
+def bench_recognition(
+    engine_name: str,
+    engine: TimedEngine,
+    sprites: List,
+    real_encodings: List[np.ndarray],
+    real_names: List[str],
+    frame_width: int,
+    tracking: bool,
+    gallery_size: int,
+    faces: int,
+    frames: int,
+    warmup: int,
+    roi: bool,
+    replay_frames: Optional[List[np.ndarray]],
+    db_path: Path
+) -> dict:
+    """One configuration: run every stage of the use case on each frame and time it."""
+    load_known_usecase = LoadKnownFacesUseCase(
+        SyntheticKnownRepo(
+            gallery_size, ENGINE_DIMS[engine.distance_metric], engine.distance_metric,
+            real_encodings=real_encodings, real_names=real_names
+        ),
+        metric=engine.distance_metric
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_known_usecase.execute()
+    
+    # Synchronous writes: "persist" then times the INSERT + commit, not just a queue put
+    recognition_repo = SQLiteRecognitionRepo(db_path, async_writes=False)
+    usecase_kwargs = dict(
+        face_engine=engine,
+        load_known_usecase=load_known_usecase,
+        recognition_repo=recognition_repo,
+        match_policy=MatchPolicy(tolerance=settings.TOLERANCE),
+        cooldown_seconds=0,  # Every face is written: measures the persistence path
+        motion_gate=None,
+        process_every_n_frames=1,
+        roi_detection=roi,
+        frame_width=frame_width,
+        camera_id="benchmark"
+    )
+    if tracking:
+        from face_app.infrastructure.tracking.face_tracker import FaceTracker
+        tracker = FaceTracker(
+            detect_interval=settings.TRACK_DETECT_INTERVAL,
+            max_disappeared=settings.TRACK_MAX_DISAPPEARED,
+            iou_threshold=settings.TRACK_IOU_THRESHOLD,
+            appearance_weight=settings.TRACK_APPEARANCE_WEIGHT
+        )
+        usecase = RecognizeTrackedUseCase(
+            tracker=tracker,
+            reverify_interval=settings.TRACK_REVERIFY_INTERVAL,
+            confidence_margin=settings.TRACK_CONFIDENCE_MARGIN,
+            **usecase_kwargs
+        )
+    else:
+        usecase = RecognizeFrameUseCase(**usecase_kwargs)
+    
+    if replay_frames:
+        next_frame = lambda i: replay_frames[i % len(replay_frames)]
+    else:
+        next_frame = FrameSynthesizer(sprites, faces, seed=faces).frame
+    
+    samples = {stage: [] for stage in STAGES}
+    detected = 0
+    run_started = None
+    
+    for i in range(warmup + frames):
+        if i == warmup:
+            run_started = time.perf_counter()
+        frame = next_frame(i)
+        engine.encode_seconds = 0.0
+        
+        t0 = time.perf_counter()
+        context = usecase.preprocess(frame, active=True)
+        t1 = time.perf_counter()
+        context = usecase.detect(context)
+        t2 = time.perf_counter()
+        context = usecase.embed_and_match(context)
+        t3 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = usecase.apply_side_effects(context)
+        t4 = time.perf_counter()
+        
+        if i < warmup:
+            continue
+        
+        encode = engine.encode_seconds
+        samples["preprocess"].append(t1 - t0)
+        samples["detect"].append(t2 - t1)
+        samples["encode"].append(encode)
+        samples["match"].append(max(0.0, t3 - t2 - encode))
+        samples["persist"].append(t4 - t3)
+        samples["total"].append(t4 - t0)
+        detected += len(result.faces)
+    
+    elapsed = time.perf_counter() - run_started
+    recognition_repo.close()
+    return {
+        "config": {
+            "engine": engine_name,
+            "frame_width": frame_width,
+            "tracking": tracking,
+            "gallery_size": gallery_size,
+            "faces": faces if not replay_frames else None,
+            "roi": roi,
+        },
+        "frames": frames,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "faces_detected_per_frame": detected / frames if frames else 0.0,
+        "encode_in_detect": engine.embeds_on_detect or roi,
+        "stages_ms": {stage: percentiles(values) for stage, values in samples.items()},
+    }
+
+
+def encode_sprites(engine: FaceEnginePort, sprites: List[tuple]) -> tuple:
+    """Encode the sprite photos so they are part of the gallery (some probes then match)."""
+    encodings, names = [], []
+    for name, image in sprites:
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        faces = engine.analyze_faces(rgb)
+        if faces:
+            encodings.append(np.asarray(faces[0].encoding, dtype=np.float32))
+            names.append(name)
+    return encodings, names
+
+
+def environment() -> dict:
+    """Machine and code version, to tell results apart."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def parse_list(value: str, cast=str) -> list:
+    """Split a comma list from the command line."""
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def parse_args():
+    """Benchmark matrix and output options."""
+    parser = argparse.ArgumentParser(description="Benchmark the face recognition stages")
+    parser.add_argument("--engines", default="hog", help="Comma list: hog, cnn, buffalo_s, buffalo_l")
+    parser.add_argument("--widths", default=str(settings.FRAME_WIDTH), help="Comma list of FRAME_WIDTH values")
+    parser.add_argument("--tracking", default="off", help="Comma list of on/off")
+    parser.add_argument("--gallery-sizes", default="1000,10000", help="Comma list of gallery rows (up to 100000)")
+    parser.add_argument("--faces", default="1,4", help="Comma list of faces per synthetic frame")
+    parser.add_argument("--frames", type=int, default=60, help="Measured frames per configuration")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured frames per configuration")
+    parser.add_argument("--roi", action="store_true", help="Enable ROI detection (encoding then counts as detect)")
+    parser.add_argument("--faces-dir", type=Path, default=settings.KNOWN_FACES_DIR,
+                        help="Photos pasted into synthetic frames")
+    parser.add_argument("--replay", default=None, help="Video file or frame folder instead of synthetic frames")
+    parser.add_argument("--skip-matching", action="store_true", help="Skip the engine-free matching benchmark")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    return parser.parse_args()
+
+
+def main():
+    """Run the matching benchmark, then every engine x width x tracking x gallery x faces."""
+    args = parse_args()
+    engines = parse_list(args.engines)
+    widths = parse_list(args.widths, int)
+    tracking_modes = [t.lower() in ("on", "true", "1") for t in parse_list(args.tracking)]
+    gallery_sizes = parse_list(args.gallery_sizes, int)
+    faces_list = parse_list(args.faces, int)
+    
+    report = {"environment": environment(), "args": {k: str(v) for k, v in vars(args).items()},
+              "matching": [], "recognition": [], "skipped": [], "failed": []}
+    
+    print("=" * 70)
+    print("⏱️  Face Recognition Benchmark")
+    print("=" * 70)
+    
+    if not args.skip_matching:
+        print("\n🔎 Matching (gallery search + policy):")
+        report["matching"] = bench_matching(gallery_sizes, faces_list, repeats=max(20, args.frames))
+    
+    sprites = load_face_images(args.faces_dir)
+    replay_frames = None
+    if args.replay:
+        from face_app.infrastructure.camera.replay_camera import open_replay_camera
+        camera = open_replay_camera(args.replay)
+        replay_frames = []
+        while len(replay_frames) < args.frames + args.warmup:
+            ret, frame = camera.read()
+            if not ret:
+                break
+            replay_frames.append(frame)
+        camera.release()
+        faces_list = [0]  # Whatever the recording contains
+    elif not sprites:
+        print(f"\n⚠️  No face photos in {args.faces_dir}: recognition benchmark skipped")
+        engines = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine_name in engines:
+            print(f"\n🧠 Engine {engine_name}:")
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    engine = TimedEngine(create_engine(engine_name))
+            except (ImportError, FileNotFoundError) as e:
+                # Not installed / no models: keep going with the other engines
+                reason = f"{type(e).__name__}: {e}"
+                print(f"   ⚠️  skipped ({reason})")
+                report["skipped"].append({"engine": engine_name, "reason": reason})
+                continue
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+                print(f"   ❌ engine could not be created ({reason})")
+                report["failed"].append({"engine": engine_name, "reason": reason})
+                continue
+            
+            real_encodings, real_names = encode_sprites(engine, sprites)
+            
+            for width, tracking, gallery_size, faces in itertools.product(
+                widths, tracking_modes, gallery_sizes, faces_list
+            ):
+                db_path = Path(tmp) / f"bench-{len(report['recognition'])}.sqlite"
+                try:
+                    result = bench_recognition(
+                        engine_name, engine, [image for _, image in sprites],
+                        real_encodings, real_names, width, tracking, gallery_size, faces,
+                        args.frames, args.warmup, args.roi, replay_frames, db_path
+                    )
+                except Exception as e:
+                    # A bug, not a missing dependency: record it and fail the run at the end
+                    reason = f"{type(e).__name__}: {e}"
+                    print(f"   ❌ width={width} tracking={tracking} gallery={gallery_size} faces={faces}: {reason}")
+                    traceback.print_exc()
+                    report["failed"].append({"engine": engine_name, "width": width, "tracking": tracking,
+                                             "gallery_size": gallery_size, "faces": faces, "reason": reason})
+                    continue
+                
+                report["recognition"].append(result)
+                total = result["stages_ms"]["total"]
+                print(f"   width={width} tracking={'on' if tracking else 'off'} gallery={gallery_size} "
+                      f"faces={faces}: {result['fps']:.1f} FPS, total p50/p95/p99 "
+                      f"{total['p50']:.1f}/{total['p95']:.1f}/{total['p99']:.1f} ms")
+    
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Results written to {args.json}")
+    else:
+        print("\n" + json.dumps(report, indent=2))
+    
+    if report["failed"]:
+        print(f"\n❌ {len(report['failed'])} configuration(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
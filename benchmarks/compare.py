@@ -0,0 +1,65 @@
+"""
+Compare two benchmark JSON files (e.g. before/after a commit).
+
+Usage:
+    python benchmarks/compare.py before.json after.json [--stage total] [--percentile p95]
+"""
+import argparse
+import json
+from pathlib import Path
+
+
+def _key(config: dict) -> tuple:
+    """Hashable identity of a configuration."""
+    return tuple(sorted((k, str(v)) for k, v in config.items()))
+
+
+def _label(config: dict) -> str:
+    """Configuration as one line."""
+    return " ".join(f"{k}={v}" for k, v in config.items())
+
+
+def _delta(before: float, after: float) -> str:
+    """Relative change, flagged above 5%."""
+    if before <= 0:
+        return "   n/a"
+    change = (after - before) / before * 100
+    marker = "🔺" if change > 5 else ("🟢" if change < -5 else "  ")
+    return f"{change:+6.1f}% {marker}"
+
+
+def main():
+    """Print matching and recognition changes for configurations present in both files."""
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument("--stage", default="total", help="Recognition stage to compare")
+    parser.add_argument("--percentile", default="p50", choices=["p50", "p95", "p99", "mean"])
+    args = parser.parse_args()
+    
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+    p = args.percentile
+    
+    print(f"Before: {before['environment'].get('commit')}  After: {after['environment'].get('commit')}")
+    
+    old = {_key(r["config"]): r for r in before.get("matching", [])}
+    print(f"\nMatching ({p} ms):")
+    for result in after.get("matching", []):
+        previous = old.get(_key(result["config"]))
+        if previous:
+            b, a = previous["match_ms"][p], result["match_ms"][p]
+            print(f"  {_label(result['config']):60s} {b:9.2f} -> {a:9.2f}  {_delta(b, a)}")
+    
+    old = {_key(r["config"]): r for r in before.get("recognition", [])}
+    print(f"\nRecognition, {args.stage} ({p} ms) / FPS:")
+    for result in after.get("recognition", []):
+        previous = old.get(_key(result["config"]))
+        if previous:
+            b, a = previous["stages_ms"][args.stage][p], result["stages_ms"][args.stage][p]
+            print(f"  {_label(result['config']):60s} {b:9.2f} -> {a:9.2f}  {_delta(b, a)}  "
+                  f"{previous['fps']:6.1f} -> {result['fps']:6.1f} FPS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Synthetic inputs for the benchmarks - galleries of random embeddings and frames with pasted faces."""
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+import cv2
+from face_app.domain.ports import KnownFaceRepoPort
+from face_app.domain.gallery import METRIC_COSINE
+
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def synthetic_embeddings(count: int, dim: int, metric: str, seed: int = 0) -> np.ndarray:
+    """
+    Random embeddings shaped like real ones.
+    
+    Unit vectors for cosine engines (InsightFace); for dlib the vectors are
+    scaled to the ~0.9 norm typical of face_recognition encodings, which
+    keeps them well outside TOLERANCE of each other and of real faces.
+    
+    Returns:
+        (count, dim) float32 array
+    """
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    if metric != METRIC_COSINE:
+        vectors *= 0.9
+    return vectors
+
+
+def clustered_embeddings(
+    identities: int,
+    per_identity: int,
+    dim: int,
+    metric: str,
+    spread: float = 0.35,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Embeddings grouped by identity, like an enrollment with several photos per person.
+    
+    Random data has no neighbourhood structure, which makes approximate
+    indexes look worse than they are on real faces; here every identity is
+    a random direction and its photos are noisy copies of it.
+    
+    Args:
+        identities: Number of people
+        per_identity: Photos per person
+        dim: Embedding dimension
+        metric: Engine distance metric (scales like synthetic_embeddings)
+        spread: Noise norm relative to the identity vector
+        seed: Random seed
+    
+    Returns:
+        ((identities * per_identity, dim) float32 rows, identity id per row)
+    """
+    rng = np.random.default_rng(seed)
+    centers = synthetic_embeddings(identities, dim, METRIC_COSINE, seed)
+    labels = np.repeat(np.arange(identities), per_identity)
+    noise = rng.standard_normal((labels.size, dim), dtype=np.float32) * (spread / np.sqrt(dim))
+    vectors = centers[labels] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    if metric != METRIC_COSINE:
+        vectors *= 0.9
+    return vectors, labels
+
+
+class SyntheticKnownRepo(KnownFaceRepoPort):
+    """Known faces = a few real encodings plus ``size`` random identities."""
+    
+    def __init__(
+        self,
+        size: int,
+        dim: int,
+        metric: str,
+        real_encodings: Optional[List[np.ndarray]] = None,
+        real_names: Optional[List[str]] = None,
+        images_per_person: int = 5,
+        seed: int = 0
+    ):
+        """
+        Args:
+            size: Total gallery rows (real encodings included)
+            dim: Embedding dimension of the engine
+            metric: Engine distance metric
+            real_encodings: Encodings of the faces pasted into the frames (so some probes match)
+            real_names: Names of real_encodings
+            images_per_person: Synthetic rows per synthetic identity
+            seed: Random seed (same gallery for every run)
+        """
+        self.size = size
+        self.dim = dim
+        self.metric = metric
+        self.real_encodings = list(real_encodings or [])
+        self.real_names = list(real_names or [])
+        self.images_per_person = max(1, images_per_person)
+        self.seed = seed
+    
+    def load_known_faces(self) -> Tuple[List[np.ndarray], List[str]]:
+        """Real encodings first, then the synthetic identities."""
+        synthetic = max(0, self.size - len(self.real_encodings))
+        vectors = synthetic_embeddings(synthetic, self.dim, self.metric, self.seed)
+        names = [f"person_{i // self.images_per_person:06d}" for i in range(synthetic)]
+        return self.real_encodings + list(vectors), self.real_names + names
+
+
+def load_face_images(directory: Path, limit: int = 16) -> List[Tuple[str, np.ndarray]]:
+    """
+    Load enrollment photos used as face sprites.
+    
+    Args:
+        directory: known_faces/ layout (one sub-folder per person)
+        limit: Maximum number of images
+    
+    Returns:
+        List of (person name, BGR image)
+    """
+    images = []
+    for path in sorted(Path(directory).rglob("*")):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS or path.name.startswith("."):
+            continue
+        image = cv2.imread(str(path))
+        if image is not None:
+            images.append((path.parent.name, image))
+        if len(images) >= limit:
+            break
+    return images
+
+
+class FrameSynthesizer:
+    """
+    Camera-sized frames with N face photos drifting slowly across a background.
+    
+    Faces move a few pixels per frame so the motion gate, ROI search and the
+    tracker behave as they would on a live camera.
+    """
+    
+    def __init__(
+        self,
+        sprites: List[np.ndarray],
+        faces_per_frame: int,
+        width: int = 1280,
+        height: int = 720,
+        seed: int = 0
+    ):
+        """
+        Args:
+            sprites: BGR face photos (resized to fit the frame grid)
+            faces_per_frame: Photos pasted into every frame
+            width: Frame width (camera resolution)
+            height: Frame height
+            seed: Random seed for positions and drift
+        """
+        if not sprites:
+            raise ValueError("FrameSynthesizer needs at least one face image")
+        
+        self.width = width
+        self.height = height
+        self.faces_per_frame = faces_per_frame
+        
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(90, 140, (height, width, 3), dtype=np.uint8)
+        
+        # One grid cell per face, sprite sized to the cell
+        cols = int(np.ceil(np.sqrt(max(1, faces_per_frame))))
+        rows = int(np.ceil(max(1, faces_per_frame) / cols))
+        self.cell = (width // cols, height // rows)
+        side = int(min(self.cell) * 0.7)
+        
+        self.sprites = []
+        for i in range(faces_per_frame):
+            sprite = sprites[i % len(sprites)]
+            scale = side / max(sprite.shape[:2])
+            self.sprites.append(cv2.resize(sprite, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+        
+        self.origins = [
+            ((i % cols) * self.cell[0], (i // cols) * self.cell[1])
+            for i in range(faces_per_frame)
+        ]
+        self.phases = rng.uniform(0, 2 * np.pi, faces_per_frame)
+    
+    def frame(self, index: int) -> np.ndarray:
+        """Frame number ``index`` (deterministic)."""
+        frame = self.background.copy()
+        for sprite, (x0, y0), phase in zip(self.sprites, self.origins, self.phases):
+            h, w = sprite.shape[:2]
+            slack_x = max(0, self.cell[0] - w)
+            slack_y = max(0, self.cell[1] - h)
+            x = x0 + int(slack_x * (0.5 + 0.5 * np.sin(index * 0.05 + phase)))
+            y = y0 + int(slack_y * (0.5 + 0.5 * np.cos(index * 0.04 + phase)))
+            frame[y:y + h, x:x + w] = sprite
+        return frame
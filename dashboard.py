@@ -1,9 +1,8 @@
 """Streamlit dashboard for viewing recognition events."""
 import streamlit as st
-import sqlite3
 import pandas as pd
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 
 # Add src to path
@@ -11,58 +10,53 @@ src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
 from face_app.config.settings import DB_PATH
+from face_app.infrastructure.repos.recognition_schema import open_database
+from face_app.infrastructure.repos.recognition_queries import (
+    EVENT_COLUMNS, day_range_ms, recent_events, distinct_names, event_stats
+)
 
 
-def load_events(limit: int = 100):
-    """Load recognition events from database."""
+def load_events(limit: int = 100, names=None, day=None):
+    """
+    Load recognition events from database.
+    
+    Name and date filters run in SQL on the (name, ts) / (ts) indexes, so
+    they search the whole table, not only the newest ``limit`` rows.
+    """
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        query = f"SELECT id, name, time FROM recognitions ORDER BY id DESC LIMIT {limit}"
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        conn = open_database(DB_PATH)
+        try:
+            since_ms, until_ms = day_range_ms(day) if day else (None, None)
+            rows = recent_events(conn, limit, names=names, since_ms=since_ms, until_ms=until_ms)
+        finally:
+            conn.close()
+        return pd.DataFrame(rows, columns=list(EVENT_COLUMNS))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()
 
 
+def load_names():
+    """Every person in the database (for the name filter)."""
+    try:
+        conn = open_database(DB_PATH)
+        try:
+            return distinct_names(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        st.error(f"Error loading names: {e}")
+        return []
+
+
 def get_statistics():
     """Get recognition statistics."""
     try:
-        conn = sqlite3.connect(str(DB_PATH))
-        cursor = conn.cursor()
-        
-        # Total events
-        cursor.execute("SELECT COUNT(*) FROM recognitions")
-        total = cursor.fetchone()[0]
-        
-        # Unique people
-        cursor.execute("SELECT COUNT(DISTINCT name) FROM recognitions")
-        unique_people = cursor.fetchone()[0]
-        
-        # Today's events
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("SELECT COUNT(*) FROM recognitions WHERE time LIKE ?", (f"{today}%",))
-        today_count = cursor.fetchone()[0]
-        
-        # Most frequent person
-        cursor.execute("""
-            SELECT name, COUNT(*) as count 
-            FROM recognitions 
-            GROUP BY name 
-            ORDER BY count DESC 
-            LIMIT 1
-        """)
-        most_frequent = cursor.fetchone()
-        
-        conn.close()
-        
-        return {
-            "total": total,
-            "unique_people": unique_people,
-            "today": today_count,
-            "most_frequent": most_frequent
-        }
+        conn = open_database(DB_PATH)
+        try:
+            return event_stats(conn)
+        finally:
+            conn.close()
     except Exception as e:
         st.error(f"Error getting statistics: {e}")
         return None
@@ -117,35 +111,25 @@ def main():
     # Recent events
     st.header("📝 Recent Recognition Events")
     
-    df = load_events(limit)
+    # Filtering (applied by the query)
+    col1, col2 = st.columns(2)
     
-    if not df.empty:
-        # Add filtering
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            name_filter = st.multiselect(
-                "Filter by name",
-                options=df['name'].unique().tolist(),
-                default=[]
-            )
-        
-        with col2:
-            date_filter = st.date_input(
-                "Filter by date",
-                value=None
-            )
-        
-        # Apply filters
-        filtered_df = df.copy()
-        
-        if name_filter:
-            filtered_df = filtered_df[filtered_df['name'].isin(name_filter)]
-        
-        if date_filter:
-            date_str = date_filter.strftime("%Y-%m-%d")
-            filtered_df = filtered_df[filtered_df['time'].str.startswith(date_str)]
-        
+    with col1:
+        name_filter = st.multiselect(
+            "Filter by name",
+            options=load_names(),
+            default=[]
+        )
+    
+    with col2:
+        date_filter = st.date_input(
+            "Filter by date",
+            value=None
+        )
+    
+    filtered_df = load_events(limit, names=name_filter or None, day=date_filter or None)
+    
+    if not filtered_df.empty:
         # Display data
         st.dataframe(
             filtered_df,
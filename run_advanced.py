@@ -1,5 +1,6 @@
 """Advanced main entry point with Phase 4 features."""
 import sys
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
@@ -32,10 +33,16 @@ else:
     camera_kwargs = {}
 
 from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from face_app.infrastructure.repos.gallery_index_store import GalleryIndexBuilder, GalleryIndexStore
+from face_app.infrastructure.repos.dataset_watcher import DatasetWatcher
+from face_app.infrastructure.motion.motion_gate import MotionGate
+from face_app.infrastructure.runtime.staged_pipeline import StagedRecognitionPipeline
+from face_app.infrastructure.runtime.process_pipeline import ProcessRecognitionPipeline
 from face_app.infrastructure.monitoring.stranger_monitor import StrangerMonitor
 from face_app.infrastructure.monitoring.person_detection_monitor import PersonDetectionMonitor
 from face_app.infrastructure.notifications.email_service import EmailNotificationService
 from face_app.infrastructure.iot.mqtt_client import MQTTClient
+from face_app.infrastructure.metrics import PrometheusMetrics, MetricsHTTPServer
 
 # Choose repo based on engine
 if settings.USE_INSIGHTFACE:
@@ -47,6 +54,8 @@ else:
 from face_app.domain.policies import MatchPolicy
 from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
 from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.application.usecases.recognize_tracked import RecognizeTrackedUseCase
+from face_app.infrastructure.tracking.face_tracker import FaceTracker
 from face_app.presentation.opencv_app import OpenCVApp
 
 
@@ -61,19 +70,28 @@ def main():
     print(f"   Engine: {'InsightFace' if settings.USE_INSIGHTFACE else 'face_recognition (dlib)'}")
     print(f"   Tracking: {'Enabled' if settings.ENABLE_TRACKING else 'Disabled'}")
     print(f"   Threaded Camera: {'Enabled' if settings.USE_THREADED_CAMERA else 'Disabled'}")
+    print(f"   Pipeline: {'Enabled' if settings.USE_PIPELINE else 'Disabled'}")
     print(f"   Anti-spoofing: {'Enabled' if settings.ENABLE_ANTISPOOFING else 'Disabled'}")
     print(f"   Stranger Alerts: {'Enabled' if settings.ENABLE_STRANGER_ALERTS else 'Disabled'}")
+    print(f"   Metrics: {f'Enabled (port {settings.METRICS_PORT})' if settings.ENABLE_METRICS else 'Disabled'}")
     print(f"   Tolerance: {settings.TOLERANCE}")
     
     try:
         # Initialize infrastructure (adapters)
         print("\n📦 Initializing components...")
         
+        # Runtime metrics (None = every component records nothing)
+        metrics = None
+        if settings.ENABLE_METRICS:
+            metrics = PrometheusMetrics()
+            metrics_server = MetricsHTTPServer(metrics, settings.METRICS_HOST, settings.METRICS_PORT)
+            metrics_server.start()
+        
         face_engine = FaceEngine(**engine_kwargs)
         print("   ✅ Face engine initialized")
         
         known_repo = KnownRepo()
-        recognition_repo = SQLiteRecognitionRepo()
+        recognition_repo = SQLiteRecognitionRepo(metrics=metrics)
         print("   ✅ Repositories initialized")
         
         # Initialize domain
@@ -90,7 +108,8 @@ def main():
                     sender_email=settings.SENDER_EMAIL,
                     sender_password=settings.SENDER_PASSWORD,
                     recipient_emails=settings.RECIPIENT_EMAILS,
-                    enabled=True
+                    enabled=True,
+                    metrics=metrics
                 )
                 print(f"   ✅ Email alerts enabled → {', '.join(settings.RECIPIENT_EMAILS)}")
             else:
@@ -131,12 +150,17 @@ def main():
                 time_window_seconds=settings.STRANGER_TIME_WINDOW,
                 threshold=settings.STRANGER_THRESHOLD,
                 alert_callback=on_stranger_alert,
-                alert_cooldown_seconds=settings.STRANGER_ALERT_COOLDOWN
+                alert_cooldown_seconds=settings.STRANGER_ALERT_COOLDOWN,
+                metrics=metrics
             )
             print(f"   ✅ Stranger monitor: {settings.STRANGER_THRESHOLD} detections/{settings.STRANGER_TIME_WINDOW}s")
         
         # Initialize application (use cases)
-        load_known_usecase = LoadKnownFacesUseCase(known_repo)
+        load_known_usecase = LoadKnownFacesUseCase(
+            known_repo,
+            metric=face_engine.distance_metric,
+            index_builder=GalleryIndexBuilder(store=GalleryIndexStore.for_repo(known_repo))
+        )
         print("   ✅ Use cases initialized")
         
         # Load known faces
@@ -145,32 +169,35 @@ def main():
         print("=" * 70)
         
         # Initialize known person monitors (one per person)
+        def make_known_person_monitor(person_name: str) -> PersonDetectionMonitor:
+            """Create a monitor that logs a known person once the threshold is reached."""
+            def on_known_person_detected(person: str, count: int, timestamp: datetime):
+                """Callback when known person threshold exceeded."""
+                print(f"\n✅ Xác nhận: {person_name} xuất hiện {count} lần trong {settings.KNOWN_PERSON_TIME_WINDOW}s")
+                
+                # Log to database when threshold reached
+                time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                recognition_repo.insert_event(person_name, time_str)
+                print(f"📝 Logged: {person_name} at {time_str}")
+            
+            monitor = PersonDetectionMonitor(
+                person_name=person_name,
+                time_window_seconds=settings.KNOWN_PERSON_TIME_WINDOW,
+                threshold=settings.KNOWN_PERSON_THRESHOLD,
+                alert_callback=on_known_person_detected,
+                alert_cooldown_seconds=settings.KNOWN_PERSON_LOG_COOLDOWN,
+                metrics=metrics
+            )
+            print(f"   ✅ {person_name}: {settings.KNOWN_PERSON_THRESHOLD} detections/{settings.KNOWN_PERSON_TIME_WINDOW}s")
+            return monitor
+        
         known_person_monitors = {}
         if settings.ENABLE_KNOWN_PERSON_TRACKING and encodings:
             unique_names = set(names)
             print(f"\n📊 Thiết lập tracking cho {len(unique_names)} người thân:")
             
             for person_name in unique_names:
-                def make_callback(name):
-                    def on_known_person_detected(person: str, count: int, timestamp: datetime):
-                        """Callback when known person threshold exceeded."""
-                        print(f"\n✅ Xác nhận: {name} xuất hiện {count} lần trong {settings.KNOWN_PERSON_TIME_WINDOW}s")
-                        
-                        # Log to database when threshold reached
-                        time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                        recognition_repo.insert_event(name, time_str)
-                        print(f"📝 Logged: {name} at {time_str}")
-                    return on_known_person_detected
-                
-                monitor = PersonDetectionMonitor(
-                    person_name=person_name,
-                    time_window_seconds=settings.KNOWN_PERSON_TIME_WINDOW,
-                    threshold=settings.KNOWN_PERSON_THRESHOLD,
-                    alert_callback=make_callback(person_name),
-                    alert_cooldown_seconds=settings.KNOWN_PERSON_LOG_COOLDOWN
-                )
-                known_person_monitors[person_name] = monitor
-                print(f"   ✅ {person_name}: {settings.KNOWN_PERSON_THRESHOLD} detections/{settings.KNOWN_PERSON_TIME_WINDOW}s")
+                known_person_monitors[person_name] = make_known_person_monitor(person_name)
         
         if not encodings:
             print("\n⚠️  WARNING: No known faces loaded!")
@@ -181,18 +208,61 @@ def main():
                 print("👋 Exiting...")
                 return
         
-        recognize_usecase = RecognizeFrameUseCase(
+        # Skip detection on static frames (cheap thumbnail differencing)
+        motion_gate = None
+        if settings.ENABLE_MOTION_GATE:
+            motion_gate = MotionGate(
+                thumb_width=settings.MOTION_THUMB_WIDTH,
+                pixel_threshold=settings.MOTION_PIXEL_THRESHOLD,
+                min_area=settings.MOTION_MIN_AREA,
+                hold_frames=settings.MOTION_HOLD_FRAMES,
+                max_region_fraction=settings.MOTION_REGION_MAX_FRACTION
+            )
+        
+        usecase_kwargs = dict(
             face_engine=face_engine,
             load_known_usecase=load_known_usecase,
             recognition_repo=recognition_repo,
             match_policy=match_policy,
             stranger_monitor=stranger_monitor,
-            known_person_monitors=known_person_monitors
+            known_person_monitors=known_person_monitors,
+            known_person_monitor_factory=make_known_person_monitor if settings.ENABLE_KNOWN_PERSON_TRACKING else None,
+            motion_gate=motion_gate,
+            process_every_n_frames=settings.PROCESS_EVERY_N_FRAMES,
+            metrics=metrics
         )
         
+        if settings.ENABLE_TRACKING:
+            # Detect every N frames, re-encode only new/uncertain/stale tracks
+            tracker = FaceTracker(
+                detect_interval=settings.TRACK_DETECT_INTERVAL,
+                max_disappeared=settings.TRACK_MAX_DISAPPEARED,
+                iou_threshold=settings.TRACK_IOU_THRESHOLD,
+                appearance_weight=settings.TRACK_APPEARANCE_WEIGHT
+            )
+            recognize_usecase = RecognizeTrackedUseCase(
+                tracker=tracker,
+                reverify_interval=settings.TRACK_REVERIFY_INTERVAL,
+                confidence_margin=settings.TRACK_CONFIDENCE_MARGIN,
+                **usecase_kwargs
+            )
+            print(f"   ✅ Tracking: detect every {settings.TRACK_DETECT_INTERVAL} frames, "
+                  f"re-verify every {settings.TRACK_REVERIFY_INTERVAL} frames")
+        else:
+            recognize_usecase = RecognizeFrameUseCase(**usecase_kwargs)
+        
+        # Reload known faces in background whenever known_faces/ changes
+        if settings.ENABLE_DATASET_WATCH:
+            dataset_watcher = DatasetWatcher(
+                settings.KNOWN_FACES_DIR,
+                on_change=load_known_usecase.reload_async,
+                interval_seconds=settings.DATASET_WATCH_INTERVAL
+            )
+            dataset_watcher.start()
+        
         # Initialize camera
         print(f"\n📷 Opening camera (threaded: {settings.USE_THREADED_CAMERA})...")
-        camera = Camera(settings.CAMERA_INDEX, **camera_kwargs)
+        camera = Camera(settings.CAMERA_INDEX, metrics=metrics, **camera_kwargs)
         print("   ✅ Camera opened successfully")
         
         # Initialize MQTT client for PIR sensor
@@ -205,7 +275,8 @@ def main():
                 broker=settings.MQTT_BROKER,
                 port=settings.MQTT_PORT,
                 client_id=settings.MQTT_CLIENT_ID,
-                keepalive=settings.MQTT_KEEPALIVE
+                keepalive=settings.MQTT_KEEPALIVE,
+                metrics=metrics
             )
             
             # Connect to broker (non-blocking)
@@ -217,11 +288,34 @@ def main():
                 mqtt_client = None
         
         # Initialize presentation with MQTT client
+        # Recognition stages run in the background when the pipeline is enabled
+        pipeline = None
+        if settings.USE_PIPELINE and settings.PIPELINE_BACKEND == "processes":
+            if recognize_usecase.parallel_stages:
+                # One engine per worker process, frames passed through shared memory
+                pipeline = ProcessRecognitionPipeline(
+                    recognize_usecase,
+                    engine_factory=partial(FaceEngine, **engine_kwargs),
+                    workers=settings.PIPELINE_PROCESS_WORKERS,
+                    queue_size=settings.PIPELINE_QUEUE_SIZE
+                )
+            else:
+                print("   ⚠️  Process backend does not support tracking, using threads")
+        if settings.USE_PIPELINE and pipeline is None:
+            pipeline = StagedRecognitionPipeline(
+                recognize_usecase,
+                queue_size=settings.PIPELINE_QUEUE_SIZE,
+                detect_workers=settings.PIPELINE_DETECT_WORKERS,
+                embed_workers=settings.PIPELINE_EMBED_WORKERS
+            )
+        
         app = OpenCVApp(
             camera,
             recognize_usecase,
             stranger_monitor=stranger_monitor,
-            mqtt_client=mqtt_client
+            mqtt_client=mqtt_client,
+            pipeline=pipeline,
+            stats_interval=settings.PIPELINE_STATS_INTERVAL
         )
         
         # Subscribe to PIR topic using app's callback (after app created)
@@ -248,6 +342,17 @@ def main():
         # Cleanup MQTT connection
         if 'mqtt_client' in locals() and mqtt_client:
             mqtt_client.disconnect()
+        
+        # Stop watching known_faces/
+        if 'dataset_watcher' in locals():
+            dataset_watcher.stop()
+        
+        if 'metrics_server' in locals():
+            metrics_server.stop()
+        
+        # Write events still queued for the database
+        if 'recognition_repo' in locals():
+            recognition_repo.close()
     
     print("\n" + "=" * 70)
     print("👋 Face Recognition App terminated")
@@ -0,0 +1,192 @@
+"""Replay a recorded clip (video file or frame folder) through recognition - no camera, no window."""
+import argparse
+import json
+import sys
+from functools import partial
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from face_app.config import settings
+
+# Choose components based on config
+if settings.USE_INSIGHTFACE:
+    from face_app.infrastructure.face_engines.insightface_engine import InsightFaceEngine
+    from face_app.infrastructure.repos.insightface_known_repo import InsightFaceKnownRepo
+    FaceEngine = InsightFaceEngine
+    KnownRepo = InsightFaceKnownRepo
+    engine_kwargs = {
+        'model_name': settings.INSIGHTFACE_MODEL,
+        'ctx_id': settings.INSIGHTFACE_CTX_ID
+    }
+else:
+    from face_app.infrastructure.face_engines.fr_dlib_engine import FRDlibEngine
+    from face_app.infrastructure.repos.filesystem_known_repo import FilesystemKnownRepo
+    FaceEngine = FRDlibEngine
+    KnownRepo = FilesystemKnownRepo
+    engine_kwargs = {}
+
+from face_app.infrastructure.camera.replay_camera import open_replay_camera, REPLAY_MODES, REPLAY_FAST
+from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from face_app.infrastructure.repos.gallery_index_store import GalleryIndexBuilder, GalleryIndexStore
+from face_app.infrastructure.motion.motion_gate import MotionGate
+from face_app.infrastructure.runtime.staged_pipeline import StagedRecognitionPipeline
+from face_app.infrastructure.runtime.process_pipeline import ProcessRecognitionPipeline
+from face_app.infrastructure.tracking.face_tracker import FaceTracker
+from face_app.domain.policies import MatchPolicy
+from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
+from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.application.usecases.recognize_tracked import RecognizeTrackedUseCase
+from face_app.infrastructure.metrics import PrometheusMetrics, MetricsHTTPServer
+from face_app.presentation.headless_app import HeadlessApp
+
+
+def parse_args():
+    """Command line options (recognition settings come from settings.py)."""
+    parser = argparse.ArgumentParser(description="Replay a recording through face recognition and report throughput")
+    parser.add_argument("source", help="Video file (MP4, AVI, ...) or folder of frames")
+    parser.add_argument("--mode", choices=REPLAY_MODES, default=REPLAY_FAST,
+                        help="fast = every frame as fast as possible, realtime = paced at the recorded FPS")
+    parser.add_argument("--loop", action="store_true", help="Restart at the end (use with --max-frames)")
+    parser.add_argument("--fps", type=float, default=None, help="Playback FPS (frame folders, or override the video)")
+    parser.add_argument("--max-frames", type=int, default=0, help="Stop after N frames (0 = whole recording)")
+    parser.add_argument("--pipeline", action="store_true", help="Use the background pipeline (settings.PIPELINE_*)")
+    parser.add_argument("--log-events", action="store_true", help="Write recognitions to the database")
+    parser.add_argument("--json", type=Path, default=None, help="Write the summary to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    """Build the recognition stack, replay the recording, print (and save) the summary."""
+    args = parse_args()
+    
+    print("=" * 70)
+    print("🎞️  Face Recognition - Replay Benchmark")
+    print("=" * 70)
+    
+    metrics_server = None
+    recognition_repo = None
+    try:
+        # Scrape while the replay runs (e.g. a long --loop soak test)
+        metrics = None
+        if settings.ENABLE_METRICS:
+            metrics = PrometheusMetrics()
+            metrics_server = MetricsHTTPServer(metrics, settings.METRICS_HOST, settings.METRICS_PORT)
+            metrics_server.start()
+        
+        replay_kwargs = {'mode': args.mode, 'loop': args.loop, 'metrics': metrics}
+        if args.fps:
+            replay_kwargs['fps'] = args.fps
+        camera = open_replay_camera(args.source, **replay_kwargs)
+        
+        face_engine = FaceEngine(**engine_kwargs)
+        known_repo = KnownRepo()
+        load_known_usecase = LoadKnownFacesUseCase(
+            known_repo,
+            metric=face_engine.distance_metric,
+            index_builder=GalleryIndexBuilder(store=GalleryIndexStore.for_repo(known_repo))
+        )
+        encodings, names = load_known_usecase.execute()
+        print(f"   ✅ {len(encodings)} known encodings, {len(set(names))} people")
+        
+        motion_gate = None
+        if settings.ENABLE_MOTION_GATE:
+            motion_gate = MotionGate(
+                thumb_width=settings.MOTION_THUMB_WIDTH,
+                pixel_threshold=settings.MOTION_PIXEL_THRESHOLD,
+                min_area=settings.MOTION_MIN_AREA,
+                hold_frames=settings.MOTION_HOLD_FRAMES,
+                max_region_fraction=settings.MOTION_REGION_MAX_FRACTION
+            )
+        
+        recognition_repo = SQLiteRecognitionRepo(metrics=metrics)
+        usecase_kwargs = dict(
+            face_engine=face_engine,
+            load_known_usecase=load_known_usecase,
+            recognition_repo=recognition_repo,
+            match_policy=MatchPolicy(tolerance=settings.TOLERANCE),
+            motion_gate=motion_gate,
+            process_every_n_frames=settings.PROCESS_EVERY_N_FRAMES,
+            camera_id=f"replay:{Path(args.source).name}",
+            metrics=metrics
+        )
+        
+        if settings.ENABLE_TRACKING:
+            tracker = FaceTracker(
+                detect_interval=settings.TRACK_DETECT_INTERVAL,
+                max_disappeared=settings.TRACK_MAX_DISAPPEARED,
+                iou_threshold=settings.TRACK_IOU_THRESHOLD,
+                appearance_weight=settings.TRACK_APPEARANCE_WEIGHT
+            )
+            recognize_usecase = RecognizeTrackedUseCase(
+                tracker=tracker,
+                reverify_interval=settings.TRACK_REVERIFY_INTERVAL,
+                confidence_margin=settings.TRACK_CONFIDENCE_MARGIN,
+                **usecase_kwargs
+            )
+        else:
+            recognize_usecase = RecognizeFrameUseCase(**usecase_kwargs)
+        
+        pipeline = None
+        if args.pipeline:
+            if settings.PIPELINE_BACKEND == "processes" and recognize_usecase.parallel_stages:
+                pipeline = ProcessRecognitionPipeline(
+                    recognize_usecase,
+                    engine_factory=partial(FaceEngine, **engine_kwargs),
+                    workers=settings.PIPELINE_PROCESS_WORKERS,
+                    queue_size=settings.PIPELINE_QUEUE_SIZE
+                )
+            else:
+                pipeline = StagedRecognitionPipeline(
+                    recognize_usecase,
+                    queue_size=settings.PIPELINE_QUEUE_SIZE,
+                    detect_workers=settings.PIPELINE_DETECT_WORKERS,
+                    embed_workers=settings.PIPELINE_EMBED_WORKERS
+                )
+        
+        app = HeadlessApp(
+            camera,
+            recognize_usecase,
+            pipeline=pipeline,
+            active=args.log_events,
+            max_frames=args.max_frames,
+            # Fast replay keeps the pipeline full without overflowing it,
+            # realtime replay drops frames like a live camera
+            max_in_flight=pipeline.capacity if pipeline and args.mode == REPLAY_FAST else 0,
+            stats_interval=settings.PIPELINE_STATS_INTERVAL
+        )
+        
+        print("\n" + "=" * 70)
+        summary = app.run()
+        summary.update({
+            "source": str(args.source),
+            "mode": args.mode,
+            "engine": FaceEngine.__name__,
+            "frame_width": settings.FRAME_WIDTH,
+            "tracking": settings.ENABLE_TRACKING,
+            "skipped_by_camera": getattr(camera, "frames_skipped", 0),
+        })
+        
+        print(HeadlessApp.format_summary(summary))
+        if pipeline:
+            print(pipeline.format_stats())
+        
+        if args.json:
+            args.json.write_text(json.dumps(summary, indent=2))
+            print(f"💾 Summary written to {args.json}")
+    
+    except RuntimeError as e:
+        print(f"\n❌ Runtime Error: {e}")
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+    finally:
+        if metrics_server:
+            metrics_server.stop()
+        if recognition_repo:
+            recognition_repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Expire old recognition events - archive, delete in chunks, shrink the database. Safe while the app is running."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from face_app.config import settings
+from face_app.infrastructure.repos.recognition_retention import RetentionJob, ARCHIVE_FORMATS
+
+
+def parse_args():
+    """Command line options (defaults come from settings.RETENTION_*)."""
+    parser = argparse.ArgumentParser(description="Archive and delete expired recognition events")
+    parser.add_argument("--db", type=Path, default=settings.DB_PATH, help="SQLite database file")
+    parser.add_argument("--days", type=int, default=settings.RETENTION_RAW_DAYS,
+                        help="Keep raw events this many days (0 = forever)")
+    parser.add_argument("--hourly-days", type=int, default=settings.RETENTION_HOURLY_DAYS,
+                        help="Keep hourly rollups this many days (0 = forever)")
+    parser.add_argument("--archive-dir", type=Path, default=settings.RETENTION_ARCHIVE_DIR,
+                        help="Export expired events to this folder")
+    parser.add_argument("--no-archive", action="store_true", help="Delete expired events without exporting them")
+    parser.add_argument("--format", choices=ARCHIVE_FORMATS, default=settings.RETENTION_ARCHIVE_FORMAT,
+                        help="Archive format (parquet needs pyarrow)")
+    parser.add_argument("--chunk-size", type=int, default=settings.RETENTION_CHUNK_SIZE,
+                        help="Rows deleted per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the expired events")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Convert an older database once with a full VACUUM (stop the app first)")
+    return parser.parse_args()
+
+
+def main():
+    """Run one retention pass and print what it did (schedule with cron or a systemd timer)."""
+    args = parse_args()
+    
+    print("=" * 70)
+    print("🧹 Recognition Event Retention")
+    print("=" * 70)
+    
+    job = RetentionJob(
+        db_path=args.db,
+        raw_days=args.days,
+        hourly_days=args.hourly_days,
+        archive_dir=None if args.no_archive else args.archive_dir,
+        archive_format=args.format,
+        chunk_size=args.chunk_size
+    )
+    
+    if args.enable_incremental_vacuum:
+        job.enable_incremental_vacuum()
+    
+    report = job.run(dry_run=args.dry_run)
+    
+    if report.cutoff is None:
+        print("♾️  Raw events are kept forever (--days 0)")
+    elif args.dry_run:
+        print(f"🔎 {report.expired} events before {report.cutoff} would expire")
+    else:
+        print(f"🗑️  Deleted {report.deleted}/{report.expired} events before {report.cutoff}")
+        if report.archive_path:
+            print(f"📦 Archived {report.archived} events to {report.archive_path}")
+    if report.hourly_deleted:
+        print(f"🗑️  Deleted {report.hourly_deleted} hourly rollup rows")
+    if report.pages_freed:
+        print(f"🗜️  Returned {report.pages_freed} pages to the file system")
+    print(f"⏱️  Done in {report.seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
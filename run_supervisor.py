@@ -0,0 +1,301 @@
+"""Headless multi-camera entry point - one engine pool and one gallery for N cameras."""
+import argparse
+import sys
+from functools import partial
+from pathlib import Path
+from datetime import datetime
+from typing import Union
+
+# Add src to path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from face_app.config import settings
+
+# Choose components based on config
+if settings.USE_INSIGHTFACE:
+    from face_app.infrastructure.face_engines.insightface_engine import InsightFaceEngine
+    from face_app.infrastructure.repos.insightface_known_repo import InsightFaceKnownRepo
+    FaceEngine = InsightFaceEngine
+    KnownRepo = InsightFaceKnownRepo
+    engine_kwargs = {
+        'model_name': settings.INSIGHTFACE_MODEL,
+        'ctx_id': settings.INSIGHTFACE_CTX_ID
+    }
+else:
+    from face_app.infrastructure.face_engines.fr_dlib_engine import FRDlibEngine
+    from face_app.infrastructure.repos.filesystem_known_repo import FilesystemKnownRepo
+    FaceEngine = FRDlibEngine
+    KnownRepo = FilesystemKnownRepo
+    engine_kwargs = {}
+
+from face_app.infrastructure.camera.opencv_camera import OpenCVCamera
+from face_app.infrastructure.face_engines.pooled_engine import PooledFaceEngine
+from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from face_app.infrastructure.repos.gallery_index_store import GalleryIndexBuilder, GalleryIndexStore
+from face_app.infrastructure.repos.dataset_watcher import DatasetWatcher
+from face_app.infrastructure.motion.motion_gate import MotionGate
+from face_app.infrastructure.runtime.camera_supervisor import CameraStream, CameraSupervisor
+from face_app.infrastructure.monitoring.stranger_monitor import StrangerMonitor
+from face_app.infrastructure.monitoring.person_detection_monitor import PersonDetectionMonitor
+from face_app.infrastructure.notifications.email_service import EmailNotificationService
+from face_app.infrastructure.tracking.face_tracker import FaceTracker
+from face_app.infrastructure.metrics import PrometheusMetrics, MetricsHTTPServer
+from face_app.domain.policies import MatchPolicy
+from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
+from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.application.usecases.recognize_tracked import RecognizeTrackedUseCase
+
+
+def parse_source(spec: str) -> tuple:
+    """
+    Parse a camera argument.
+    
+    Args:
+        spec: "0", "video.mp4", "rtsp://..." or "name=<source>"
+    
+    Returns:
+        (camera_id or None, source) - numeric sources become device indices
+    """
+    camera_id = None
+    name, sep, rest = spec.partition("=")
+    if sep and name.isidentifier():
+        camera_id, spec = name, rest
+    
+    source: Union[int, str] = int(spec) if spec.isdigit() else spec
+    return camera_id, source
+
+
+def parse_args():
+    """Command line options (defaults from settings)."""
+    parser = argparse.ArgumentParser(description="Run face recognition on several cameras without a display")
+    parser.add_argument("sources", nargs="*", default=settings.SUPERVISOR_CAMERA_SOURCES,
+                        help="Camera indices, video files or RTSP URLs (name=source to set the camera id)")
+    parser.add_argument("--fps", type=float, default=settings.SUPERVISOR_FPS_BUDGET,
+                        help="Max recognitions per second per camera (0 = unlimited)")
+    parser.add_argument("--engines", type=int, default=settings.SUPERVISOR_ENGINE_POOL_SIZE,
+                        help="Face engines shared by all cameras")
+    parser.add_argument("--workers", type=int, default=settings.SUPERVISOR_WORKERS,
+                        help="Recognition threads (0 = number of engines)")
+    parser.add_argument("--stats-interval", type=float, default=settings.PIPELINE_STATS_INTERVAL,
+                        help="Seconds between per-camera stats reports")
+    return parser.parse_args()
+
+
+def main():
+    """Initialize shared components, one use case per camera, then run headless."""
+    args = parse_args()
+    
+    print("=" * 70)
+    print("🏢 Face Recognition - Multi-camera Supervisor")
+    print("=" * 70)
+    
+    if not args.sources:
+        print("❌ No cameras given (pass sources or set SUPERVISOR_CAMERA_SOURCES)")
+        return
+    
+    print("\n⚙️  Configuration:")
+    print(f"   Engine: {'InsightFace' if settings.USE_INSIGHTFACE else 'face_recognition (dlib)'} x{args.engines}")
+    print(f"   Cameras: {len(args.sources)}, budget {args.fps} FPS each")
+    print(f"   Tracking: {'Enabled' if settings.ENABLE_TRACKING else 'Disabled'}")
+    print(f"   Stranger Alerts: {'Enabled' if settings.ENABLE_STRANGER_ALERTS else 'Disabled'}")
+    
+    streams = []
+    dataset_watcher = None
+    metrics_server = None
+    recognition_repo = None
+    
+    try:
+        print("\n📦 Initializing shared components...")
+        
+        # One registry for every camera (series carry a camera label)
+        metrics = None
+        if settings.ENABLE_METRICS:
+            metrics = PrometheusMetrics()
+            metrics_server = MetricsHTTPServer(metrics, settings.METRICS_HOST, settings.METRICS_PORT)
+            metrics_server.start()
+        
+        # Model stacks are shared: memory grows with the pool, not with the cameras
+        face_engine = PooledFaceEngine.create(partial(FaceEngine, **engine_kwargs), args.engines)
+        print(f"   ✅ Engine pool: {face_engine.size} engines")
+        
+        known_repo = KnownRepo()
+        recognition_repo = SQLiteRecognitionRepo(metrics=metrics)
+        match_policy = MatchPolicy(tolerance=settings.TOLERANCE)
+        
+        # One immutable gallery snapshot, read by every camera
+        load_known_usecase = LoadKnownFacesUseCase(
+            known_repo,
+            metric=face_engine.distance_metric,
+            index_builder=GalleryIndexBuilder(store=GalleryIndexStore.for_repo(known_repo))
+        )
+        print("\n" + "=" * 70)
+        encodings, names = load_known_usecase.execute()
+        print("=" * 70)
+        
+        if not encodings:
+            print("\n⚠️  WARNING: No known faces loaded! Everyone will be reported as Stranger")
+        
+        email_service = None
+        if settings.ENABLE_STRANGER_ALERTS:
+            if settings.SENDER_EMAIL and settings.RECIPIENT_EMAILS[0]:
+                email_service = EmailNotificationService(
+                    smtp_server=settings.SMTP_SERVER,
+                    smtp_port=settings.SMTP_PORT,
+                    sender_email=settings.SENDER_EMAIL,
+                    sender_password=settings.SENDER_PASSWORD,
+                    recipient_emails=settings.RECIPIENT_EMAILS,
+                    enabled=True,
+                    metrics=metrics
+                )
+                print(f"   ✅ Email alerts enabled → {', '.join(settings.RECIPIENT_EMAILS)}")
+            else:
+                print("   ⚠️  Email alerts enabled but credentials not configured!")
+        
+        def build_usecase(camera_id: str):
+            """Recognition use case with its own monitors, motion gate and tracker."""
+            stranger_monitor = None
+            if settings.ENABLE_STRANGER_ALERTS and email_service:
+                def on_stranger_alert(count: int, timestamp: datetime):
+                    """Callback when this camera's stranger threshold is exceeded."""
+                    print(f"\n🚨 CẢNH BÁO [{camera_id}]: Phát hiện {count} người lạ trong {settings.STRANGER_TIME_WINDOW}s!")
+                    email_service.send_stranger_alert(count, timestamp)
+                    
+                    time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                    recognition_repo.insert_event("Stranger", time_str, camera_id=camera_id)
+                    print(f"📝 Logged: Stranger (Alert Triggered) at {time_str} [{camera_id}]")
+                
+                stranger_monitor = StrangerMonitor(
+                    time_window_seconds=settings.STRANGER_TIME_WINDOW,
+                    threshold=settings.STRANGER_THRESHOLD,
+                    alert_callback=on_stranger_alert,
+                    alert_cooldown_seconds=settings.STRANGER_ALERT_COOLDOWN,
+                    metrics=metrics
+                )
+            
+            def make_known_person_monitor(person_name: str) -> PersonDetectionMonitor:
+                """Monitor that logs a known person seen by this camera."""
+                def on_known_person_detected(person: str, count: int, timestamp: datetime):
+                    print(f"\n✅ Xác nhận [{camera_id}]: {person_name} xuất hiện {count} lần trong {settings.KNOWN_PERSON_TIME_WINDOW}s")
+                    time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                    recognition_repo.insert_event(person_name, time_str, camera_id=camera_id)
+                    print(f"📝 Logged: {person_name} at {time_str} [{camera_id}]")
+                
+                return PersonDetectionMonitor(
+                    person_name=person_name,
+                    time_window_seconds=settings.KNOWN_PERSON_TIME_WINDOW,
+                    threshold=settings.KNOWN_PERSON_THRESHOLD,
+                    alert_callback=on_known_person_detected,
+                    alert_cooldown_seconds=settings.KNOWN_PERSON_LOG_COOLDOWN,
+                    metrics=metrics
+                )
+            
+            known_person_monitors = {}
+            if settings.ENABLE_KNOWN_PERSON_TRACKING:
+                known_person_monitors = {name: make_known_person_monitor(name) for name in set(names)}
+            
+            motion_gate = None
+            if settings.ENABLE_MOTION_GATE:
+                motion_gate = MotionGate(
+                    thumb_width=settings.MOTION_THUMB_WIDTH,
+                    pixel_threshold=settings.MOTION_PIXEL_THRESHOLD,
+                    min_area=settings.MOTION_MIN_AREA,
+                    hold_frames=settings.MOTION_HOLD_FRAMES,
+                    max_region_fraction=settings.MOTION_REGION_MAX_FRACTION
+                )
+            
+            usecase_kwargs = dict(
+                face_engine=face_engine,
+                load_known_usecase=load_known_usecase,
+                recognition_repo=recognition_repo,
+                match_policy=match_policy,
+                stranger_monitor=stranger_monitor,
+                known_person_monitors=known_person_monitors,
+                known_person_monitor_factory=make_known_person_monitor if settings.ENABLE_KNOWN_PERSON_TRACKING else None,
+                motion_gate=motion_gate,
+                process_every_n_frames=1,  # The FPS budget already decides which frames are processed
+                camera_id=camera_id,
+                metrics=metrics
+            )
+            
+            if settings.ENABLE_TRACKING:
+                tracker = FaceTracker(
+                    detect_interval=settings.TRACK_DETECT_INTERVAL,
+                    max_disappeared=settings.TRACK_MAX_DISAPPEARED,
+                    iou_threshold=settings.TRACK_IOU_THRESHOLD,
+                    appearance_weight=settings.TRACK_APPEARANCE_WEIGHT
+                )
+                return RecognizeTrackedUseCase(
+                    tracker=tracker,
+                    reverify_interval=settings.TRACK_REVERIFY_INTERVAL,
+                    confidence_margin=settings.TRACK_CONFIDENCE_MARGIN,
+                    **usecase_kwargs
+                )
+            return RecognizeFrameUseCase(**usecase_kwargs)
+        
+        # Open cameras
+        print(f"\n📷 Opening {len(args.sources)} cameras...")
+        for index, spec in enumerate(args.sources):
+            camera_id, source = parse_source(str(spec))
+            camera_id = camera_id or f"cam{index}"
+            try:
+                camera = OpenCVCamera(source, metrics=metrics, camera_id=camera_id)
+            except RuntimeError as e:
+                print(f"   ❌ {camera_id}: {e}")
+                continue
+            
+            streams.append(CameraStream(
+                camera_id=camera_id,
+                camera=camera,
+                recognize_usecase=build_usecase(camera_id),
+                fps_budget=args.fps
+            ))
+            print(f"   ✅ {camera_id}: {source}")
+        
+        if not streams:
+            print("❌ No camera could be opened")
+            return
+        
+        # Reload known faces in background whenever known_faces/ changes
+        if settings.ENABLE_DATASET_WATCH:
+            dataset_watcher = DatasetWatcher(
+                settings.KNOWN_FACES_DIR,
+                on_change=load_known_usecase.reload_async,
+                interval_seconds=settings.DATASET_WATCH_INTERVAL
+            )
+            dataset_watcher.start()
+        
+        supervisor = CameraSupervisor(streams, workers=args.workers or face_engine.size)
+        
+        print("\n" + "=" * 70)
+        print("▶️  Running (Ctrl+C to stop)")
+        supervisor.run(stats_interval=args.stats_interval)
+    
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+    except Exception as e:
+        print(f"\n❌ Unexpected Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        if dataset_watcher:
+            dataset_watcher.stop()
+        
+        if metrics_server:
+            metrics_server.stop()
+        
+        # Write events still queued for the database
+        if recognition_repo:
+            recognition_repo.close()
+        
+        # Cameras opened before a startup failure
+        for stream in streams:
+            stream.camera.release()
+    
+    print("\n" + "=" * 70)
+    print("👋 Supervisor terminated")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
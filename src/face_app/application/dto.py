@@ -1,7 +1,8 @@
 """Data Transfer Objects for application layer."""
-from dataclasses import dataclass
-from typing import List
-from face_app.domain.entities import BoundingBox, FaceMatch
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import numpy as np
+from face_app.domain.entities import BoundingBox, FaceMatch, DetectedFace
 
 
 @dataclass
@@ -29,3 +30,21 @@ class FaceRecognitionDTO:
         """Get color based on known/unknown."""
         from face_app.config.settings import BBOX_COLOR_KNOWN, BBOX_COLOR_UNKNOWN
         return BBOX_COLOR_KNOWN if self.is_known else BBOX_COLOR_UNKNOWN
+
+
+@dataclass
+class FrameContext:
+    """Work item handed from one recognition stage to the next (one per frame)."""
+    frame_bgr: np.ndarray
+    active: bool = True
+    skipped: bool = False  # Not processed (frame skip / no motion): reuse last faces
+    gated: bool = False  # Skipped by the motion gate: the last faces are still in front of the camera
+    frame_index: int = 0  # Position of the frame in the stream (orders ROI updates)
+    small_frame: Optional[np.ndarray] = None  # Resized BGR frame
+    rgb_frame: Optional[np.ndarray] = None  # Image given to the detector
+    scale: float = 1.0  # rgb_frame pixels per original frame pixel
+    offset: Tuple[int, int] = (0, 0)  # (dx, dy) of rgb_frame inside the resized frame
+    region: Optional[BoundingBox] = None  # Motion crop; faces outside it are carried over
+    regions: Optional[List[BoundingBox]] = None  # ROI mode: detect inside these at native resolution
+    detected_faces: List[DetectedFace] = field(default_factory=list)
+    matches: List[FaceMatch] = field(default_factory=list)
@@ -1,23 +1,60 @@
 """Use case for loading known faces from dataset."""
-from typing import List, Tuple
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
 import numpy as np
 from face_app.domain.ports import KnownFaceRepoPort
+from face_app.domain.gallery import FaceGallery, METRIC_EUCLIDEAN
+from face_app.domain.gallery_index import GalleryIndex
+
+
+@dataclass(frozen=True)
+class KnownFacesSnapshot:
+    """Immutable view of the loaded gallery (swapped as a whole on reload)."""
+    names: List[str]
+    gallery: FaceGallery
+    
+    @property
+    def encodings(self) -> List[np.ndarray]:
+        """
+        Known encodings as float32 rows of the gallery matrix (L2-normalized for cosine).
+        
+        The repository's per-image arrays are not kept: the gallery matrix
+        is the only copy.
+        """
+        return list(self.gallery.matrix)
 
 
 class LoadKnownFacesUseCase:
     """Load known faces from dataset."""
     
-    def __init__(self, known_repo: KnownFaceRepoPort):
+    def __init__(
+        self,
+        known_repo: KnownFaceRepoPort,
+        metric: str = METRIC_EUCLIDEAN,
+        index_builder: Optional[Callable[[FaceGallery], Optional[GalleryIndex]]] = None
+    ):
         """
         Initialize use case.
         
         Args:
             known_repo: Repository for loading known faces
+            metric: Gallery distance metric (use face_engine.distance_metric)
+            index_builder: Optional function gallery -> search index (None = exact
+                search), run for every (re)load before the new gallery is swapped in
         """
         self.known_repo = known_repo
-        self._known_encodings: List[np.ndarray] = []
-        self._known_names: List[str] = []
+        self.metric = metric
+        self.index_builder = index_builder
+        self._snapshot = KnownFacesSnapshot([], FaceGallery([], [], metric=metric))
         self._loaded = False
+        
+        # Background reload state
+        self._load_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._reload_thread = None
+        self._reload_pending = False
+        self._listeners: List[Callable[[List[str]], None]] = []
     
     def execute(self) -> Tuple[List[np.ndarray], List[str]]:
         """
@@ -27,26 +64,107 @@ class LoadKnownFacesUseCase:
             (encodings, names)
         """
         if not self._loaded:
-            self._known_encodings, self._known_names = self.known_repo.load_known_faces()
-            self._loaded = True
+            self._load(force=False)
         
-        return self._known_encodings, self._known_names
+        snapshot = self._snapshot
+        return snapshot.encodings, snapshot.names
     
     def reload(self) -> Tuple[List[np.ndarray], List[str]]:
-        """Force reload of known faces (for hot reload feature)."""
-        self._loaded = False
-        return self.execute()
+        """Force reload of known faces (blocking)."""
+        self._load()
+        snapshot = self._snapshot
+        return snapshot.encodings, snapshot.names
+    
+    def reload_async(self) -> bool:
+        """
+        Reload known faces in a background thread.
+        
+        Recognition keeps using the current gallery until the new one is
+        fully built, then both are swapped in a single assignment. A request
+        made while a reload is running schedules one more pass afterwards.
+        
+        Returns:
+            True if a new reload thread was started
+        """
+        with self._state_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                self._reload_pending = True
+                return False
+            
+            self._reload_pending = False
+            self._reload_thread = threading.Thread(target=self._reload_loop, daemon=True)
+            self._reload_thread.start()
+            return True
+    
+    def is_reloading(self) -> bool:
+        """Check if a background reload is running."""
+        thread = self._reload_thread
+        return thread is not None and thread.is_alive()
+    
+    def add_reload_listener(self, callback: Callable[[List[str]], None]) -> None:
+        """
+        Register a callback invoked with the new names after every (re)load.
+        
+        Args:
+            callback: Function receiving the list of names (one per encoding)
+        """
+        self._listeners.append(callback)
+    
+    def _reload_loop(self) -> None:
+        """Background thread: reload until no more requests are pending."""
+        while True:
+            try:
+                self._load()
+            except Exception as e:
+                print(f"❌ Background reload failed: {e}")
+            
+            with self._state_lock:
+                if not self._reload_pending:
+                    self._reload_thread = None
+                    return
+                self._reload_pending = False
+    
+    def _load(self, force: bool = True) -> None:
+        """Load from the repository, build the gallery, then swap atomically."""
+        with self._load_lock:
+            if not force and self._loaded:
+                return
+            
+            encodings, names = self.known_repo.load_known_faces()
+            gallery = FaceGallery(encodings, names, metric=self.metric)
+            del encodings  # The gallery matrix is the only copy from here on
+            if self.index_builder is not None:
+                try:
+                    gallery.index = self.index_builder(gallery)
+                except Exception as e:
+                    print(f"⚠️  Gallery index build failed, using exact search: {e}")
+            self._snapshot = KnownFacesSnapshot(names, gallery)
+            self._loaded = True
+        
+        for listener in self._listeners:
+            try:
+                listener(names)
+            except Exception as e:
+                print(f"⚠️  Reload listener error: {e}")
     
     @property
-    def known_encodings(self) -> List[np.ndarray]:
-        """Get cached encodings."""
+    def snapshot(self) -> KnownFacesSnapshot:
+        """Get the current encodings/names/gallery as one consistent object."""
         if not self._loaded:
             self.execute()
-        return self._known_encodings
+        return self._snapshot
+    
+    @property
+    def known_encodings(self) -> List[np.ndarray]:
+        """Get cached encodings."""
+        return self.snapshot.encodings
     
     @property
     def known_names(self) -> List[str]:
         """Get cached names."""
-        if not self._loaded:
-            self.execute()
-        return self._known_names
+        return self.snapshot.names
+    
+    @property
+    def gallery(self) -> FaceGallery:
+        """Get gallery matrix built from the cached encodings."""
+        return self.snapshot.gallery
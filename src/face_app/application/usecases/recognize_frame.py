@@ -1,18 +1,29 @@
 """Use case for recognizing faces in a frame."""
+import math
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import numpy as np
 import cv2
-from face_app.domain.ports import FaceEnginePort, RecognitionRepoPort
+from face_app.domain.entities import BoundingBox, FaceMatch, DetectedFace
+from face_app.domain.ports import FaceEnginePort, RecognitionRepoPort, MetricsPort, NULL_METRICS
 from face_app.domain.policies import MatchPolicy
-from face_app.application.dto import RecognitionResult, FaceRecognitionDTO
+from face_app.domain.regions import merge_boxes, pad_box
+from face_app.application.dto import RecognitionResult, FaceRecognitionDTO, FrameContext
 from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
-from face_app.config.settings import COOLDOWN_SECONDS, FRAME_WIDTH
+from face_app.config.settings import (
+    COOLDOWN_SECONDS, FRAME_WIDTH, PROCESS_EVERY_N_FRAMES,
+    ENABLE_ROI_DETECTION, ROI_FULL_SWEEP_INTERVAL, ROI_PADDING, ROI_MAX_SIDE
+)
 
 
 class RecognizeFrameUseCase:
     """Recognize faces in a video frame."""
     
+    # Stages 2 and 3 keep no state, so a pipeline may run them on several workers
+    parallel_stages = True
+    
     def __init__(
         self,
         face_engine: FaceEnginePort,
@@ -21,7 +32,17 @@ class RecognizeFrameUseCase:
         match_policy: MatchPolicy,
         cooldown_seconds: int = COOLDOWN_SECONDS,
         stranger_monitor=None,  # Optional StrangerMonitor instance
-        known_person_monitors: dict = None  # Dict of PersonDetectionMonitor per known person
+        known_person_monitors: dict = None,  # Dict of PersonDetectionMonitor per known person
+        known_person_monitor_factory: Optional[Callable[[str], object]] = None,
+        motion_gate=None,  # Optional MotionGate instance
+        process_every_n_frames: int = PROCESS_EVERY_N_FRAMES,
+        roi_detection: bool = ENABLE_ROI_DETECTION,
+        roi_sweep_interval: int = ROI_FULL_SWEEP_INTERVAL,
+        roi_padding: float = ROI_PADDING,
+        roi_max_side: int = ROI_MAX_SIDE,
+        camera_id: Optional[str] = None,
+        frame_width: int = FRAME_WIDTH,
+        metrics: Optional[MetricsPort] = None
     ):
         """
         Initialize use case.
@@ -34,6 +55,20 @@ class RecognizeFrameUseCase:
             cooldown_seconds: Minimum seconds between logging same person
             stranger_monitor: Optional stranger detection monitor
             known_person_monitors: Optional dict of {name: PersonDetectionMonitor}
+            known_person_monitor_factory: Optional function name -> monitor, used to
+                add monitors for people enrolled by a later (hot) reload
+            motion_gate: Optional motion gate; static frames skip detection and
+                moving frames are only searched inside the motion region
+            process_every_n_frames: Run recognition on every Nth frame only
+            roi_detection: Detect at native resolution around the previous faces
+                (and the motion region) instead of on the downscaled full frame
+            roi_sweep_interval: Full-frame detection every N processed frames in ROI mode
+            roi_padding: Search area around a previous face, as a fraction of its size
+            roi_max_side: Regions larger than this use the downscaled full frame
+            camera_id: Camera this use case serves; stored with every logged event
+            frame_width: Width frames are resized to before full-frame detection
+            metrics: Optional metrics registry (stage latency, faces per frame,
+                match distances); pipelines driving the stages report through it too
         """
         self.face_engine = face_engine
         self.load_known_usecase = load_known_usecase
@@ -42,72 +77,351 @@ class RecognizeFrameUseCase:
         self.cooldown_seconds = cooldown_seconds
         self.stranger_monitor = stranger_monitor
         self.known_person_monitors = known_person_monitors or {}
+        self.known_person_monitor_factory = known_person_monitor_factory
+        self.motion_gate = motion_gate
+        self.process_every_n_frames = max(1, process_every_n_frames)
+        self.roi_detection = roi_detection
+        self.roi_sweep_interval = max(1, roi_sweep_interval)
+        self.roi_padding = roi_padding
+        self.roi_max_side = roi_max_side
+        self.camera_id = camera_id
+        self.frame_width = frame_width
+        self.metrics = metrics or NULL_METRICS
+        self._metrics_camera = camera_id or "default"
+        
+        if known_person_monitor_factory:
+            load_known_usecase.add_reload_listener(self._on_known_faces_reloaded)
         
         # Cache for last recognition time (in-memory)
         self._last_recognition: Dict[str, datetime] = {}
+        
+        # Skipped frames re-use the last result
+        self._frame_index = 0
+        self._last_faces: List[FaceRecognitionDTO] = []
+        self._processed_frames = 0
+        
+        # ROI mode: face boxes (frame pixels) of the newest detected frame.
+        # Written by embed_and_match, read by preprocess; pipelines run them
+        # on different threads, so guarded by a lock and ordered by frame index
+        self._roi_lock = threading.Lock()
+        self._roi_boxes: List[BoundingBox] = []
+        self._roi_frame_index = -1
     
     def execute(self, frame_bgr: np.ndarray, active: bool = True) -> RecognitionResult:
         """
         Recognize faces in a frame.
         
+        Runs the four stages back to back. StagedRecognitionPipeline runs
+        the same stages on separate threads.
+        
         Args:
             frame_bgr: BGR frame from camera
             active: Control database logging and email (True = enable, False = disable)
+        
+        Returns:
+            RecognitionResult with detected faces (processed=False when the
+            frame was skipped and the previous faces are returned)
+        """
+        context = self._run_stage("preprocess", self.preprocess, frame_bgr, active)
+        context = self._run_stage("detect", self.detect, context)
+        context = self._run_stage("embed", self.embed_and_match, context)
+        result = self._run_stage("apply", self.apply_side_effects, context)
+        self.observe_result(result)
+        return result
+    
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """
+        Report the service time of one stage for one frame.
+        
+        Args:
+            stage: "preprocess", "detect", "embed" or "apply"
+            seconds: Time spent in the stage
+        """
+        if self.metrics.enabled:
+            self.metrics.observe("stage_seconds", seconds, stage=stage, camera=self._metrics_camera)
+    
+    def observe_result(self, result: RecognitionResult) -> None:
+        """Report a finished frame (processed or skipped, faces found)."""
+        if not self.metrics.enabled:
+            return
+        
+        if result.processed:
+            self.metrics.inc("frames_total", camera=self._metrics_camera, outcome="processed")
+            self.metrics.observe("faces_per_frame", len(result.faces), camera=self._metrics_camera)
+        else:
+            self.metrics.inc("frames_total", camera=self._metrics_camera, outcome="skipped")
+    
+    def preprocess(self, frame_bgr: np.ndarray, active: bool = True) -> FrameContext:
+        """
+        Stage 1: frame skipping, motion gate, ROI choice, resize + BGR->RGB.
+        
+        Keeps gate/ROI state, so frames must go through it one at a time, in order.
+        """
+        context = self._new_context(frame_bgr, active)
+        
+        frame_index = self._frame_index
+        self._frame_index += 1
+        context.frame_index = frame_index
+        
+        if frame_index % self.process_every_n_frames != 0:
+            context.skipped = True
+            return context
+        
+        region = None
+        if self.motion_gate is not None:
+            motion = self.motion_gate.update(frame_bgr)
+            if not motion.has_motion:
+                # Static scene: nothing can have changed
+                context.skipped = True
+                context.gated = True
+                return context
+            region = motion.region
+        
+        self._prepare(context, region)
+        return context
+    
+    def detect(self, context: FrameContext) -> FrameContext:
+        """Stage 2: find faces (with embeddings when the engine yields them together)."""
+        if context.skipped:
+            return context
+        
+        if context.regions:
+            context.detected_faces = self.face_engine.analyze_regions(context.rgb_frame, context.regions)
+        elif self.face_engine.embeds_on_detect:
+            # Detect + encode faces in a single engine pass
+            context.detected_faces = self.face_engine.analyze_faces(context.rgb_frame)
+        else:
+            context.detected_faces = [
+                DetectedFace(box=box, encoding=None)
+                for box in self.face_engine.detect_faces(context.rgb_frame)
+            ]
+        
+        return context
+    
+    def embed_and_match(self, context: FrameContext) -> FrameContext:
+        """Stage 3: encode faces that have no embedding yet, then match them in one batch."""
+        if context.skipped:
+            return context
+        
+        if self.roi_detection:
+            self._update_roi_boxes(context)
+        
+        if not context.detected_faces:
+            return context
+        
+        missing = [detected for detected in context.detected_faces if detected.encoding is None]
+        if missing:
+            encodings = self.face_engine.encode_faces(context.rgb_frame, [detected.box for detected in missing])
+            for detected, encoding in zip(missing, encodings):
+                detected.encoding = encoding
+            # The engine found no face in these boxes
+            context.detected_faces = [
+                detected for detected in context.detected_faces if detected.encoding is not None
+            ]
+            if not context.detected_faces:
+                return context
+        
+        # Match all faces of the frame against the gallery in one batch
+        context.matches = self._match_encodings([detected.encoding for detected in context.detected_faces])
+        return context
+    
+    def apply_side_effects(self, context: FrameContext) -> RecognitionResult:
+        """
+        Stage 4: monitors / database logging and DTOs.
+        
+        Must see frames in order (cooldowns, monitor windows, last faces).
+        """
+        if context.skipped:
+            if context.gated:
+                # People standing still are still seen (monitors count per frame)
+                self._report_carried(self._last_faces, context.active)
+            return RecognitionResult(faces=self._last_faces, processed=False)
+        
+        results = []
+        dx, dy = context.offset
+        
+        for detected, match in zip(context.detected_faces, context.matches):
+            box = detected.box
+            if dx or dy:
+                box = self._offset_box(box, dx, dy)
+            results.append(self._report_face(box, match, context.scale, context.active))
+        
+        if context.region is not None:
+            # Faces outside the motion region have not moved: keep them
+            carried = [
+                face for face in self._last_faces
+                if not self._boxes_overlap(face.box, context.region)
+            ]
+            self._report_carried(carried, context.active)
+            results.extend(carried)
+        
+        self._last_faces = results
+        return RecognitionResult(faces=results)
+    
+    def _run_stage(self, stage: str, fn: Callable, *args):
+        """Call a stage, timing it only when metrics are enabled."""
+        if not self.metrics.enabled:
+            return fn(*args)
+        
+        started = time.perf_counter()
+        output = fn(*args)
+        self.observe_stage(stage, time.perf_counter() - started)
+        return output
+    
+    def _new_context(self, frame_bgr: np.ndarray, active: bool) -> FrameContext:
+        """Create the work item for a frame."""
+        return FrameContext(frame_bgr=frame_bgr, active=active)
+    
+    def _prepare(self, context: FrameContext, region: Optional[BoundingBox]) -> None:
+        """
+        Choose where to search and build the detector input.
+        
+        Args:
+            context: Frame being processed
+            region: Motion region (None = whole frame)
+        """
+        frame_bgr = context.frame_bgr
+        
+        if self.roi_detection:
+            sweep = self._processed_frames % self.roi_sweep_interval == 0
+            self._processed_frames += 1
             
+            if sweep:
+                # Periodic full-frame pass picks up faces that entered elsewhere
+                region = None
+            else:
+                regions = self._candidate_regions(frame_bgr, region)
+                if regions:
+                    # Boxes come back in frame pixels
+                    context.regions = regions
+                    context.rgb_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+                    context.scale = 1.0
+                    return
+        
+        if region is None:
+            context.small_frame, context.rgb_frame, context.scale = self._preprocess(frame_bgr)
+        else:
+            # Same scale as the full frame, just a smaller area
+            scale = self.frame_width / frame_bgr.shape[1]
+            crop = frame_bgr[region.top:region.bottom, region.left:region.right]
+            context.small_frame, context.rgb_frame, context.scale = self._preprocess(crop, scale)
+            context.region = region
+            context.offset = (int(region.left * scale), int(region.top * scale))
+    
+    def _candidate_regions(self, frame_bgr: np.ndarray, motion_region: Optional[BoundingBox]) -> List[BoundingBox]:
+        """
+        Regions to search in ROI mode: around the previous faces plus the motion region.
+        
         Returns:
-            RecognitionResult with detected faces
+            Merged regions in frame pixels, or [] to use the full frame instead
         """
-        # Preprocess: resize for faster processing
         height, width = frame_bgr.shape[:2]
-        scale = FRAME_WIDTH / width
+        
+        with self._roi_lock:
+            boxes = list(self._roi_boxes)
+        
+        regions = [pad_box(box, self.roi_padding, width, height) for box in boxes]
+        if motion_region is not None:
+            regions.append(motion_region)
+        
+        regions = merge_boxes(regions)
+        
+        # A large region costs as much as the downscaled frame at native resolution
+        if any(max(r.right - r.left, r.bottom - r.top) > self.roi_max_side for r in regions):
+            return []
+        
+        return regions
+    
+    def _update_roi_boxes(self, context: FrameContext) -> None:
+        """Remember where this frame's faces are, for the next frames' search regions."""
+        dx, dy = context.offset
+        boxes = [
+            self._scale_box(self._offset_box(detected.box, dx, dy), 1 / context.scale)
+            for detected in context.detected_faces
+        ]
+        
+        with self._roi_lock:
+            if context.frame_index < self._roi_frame_index:
+                # A newer frame already finished detection (parallel workers)
+                return
+            if context.region is not None:
+                # Only the motion region was searched: faces elsewhere are still there
+                boxes.extend(box for box in self._roi_boxes if not self._boxes_overlap(box, context.region))
+            self._roi_boxes = boxes
+            self._roi_frame_index = context.frame_index
+    
+    def _preprocess(self, frame_bgr: np.ndarray, scale: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Resize for faster processing and convert to RGB.
+        
+        Args:
+            frame_bgr: BGR frame (or crop of a frame)
+            scale: Resize factor (default: fit frame_width)
+        
+        Returns:
+            (small BGR frame, small RGB frame, scale applied)
+        """
+        if scale is None:
+            scale = self.frame_width / frame_bgr.shape[1]
         small_frame = cv2.resize(frame_bgr, (0, 0), fx=scale, fy=scale)
         
         # Convert BGR to RGB
         rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
         
-        # Detect faces
-        boxes = self.face_engine.detect_faces(rgb_frame)
-        
-        if not boxes:
-            return RecognitionResult(faces=[])
-        
-        # Encode faces
-        encodings = self.face_engine.encode_faces(rgb_frame, boxes)
+        return small_frame, rgb_frame, scale
+    
+    def _match_encodings(self, encodings: List[np.ndarray]) -> List[FaceMatch]:
+        """Match a batch of encodings against the current gallery."""
+        probes = np.vstack(encodings)
+        search_result = self.load_known_usecase.gallery.search(probes, k=1)
+        matches = self.match_policy.match_batch(search_result)
         
-        # Get known faces
-        known_encodings = self.load_known_usecase.known_encodings
-        known_names = self.load_known_usecase.known_names
+        if self.metrics.enabled:
+            for match in matches:
+                result = "known" if match.is_known else "stranger"
+                if math.isfinite(match.distance):
+                    # Index searches report inf when they had no candidate
+                    self.metrics.observe("match_distance", match.distance, result=result)
+                self.metrics.inc("recognitions_total", camera=self._metrics_camera, result=result)
         
-        # Match each detected face
-        results = []
+        return matches
+    
+    def _report_face(
+        self,
+        box: BoundingBox,
+        match: FaceMatch,
+        scale: float,
+        active: bool,
+        track_id: Optional[int] = None
+    ) -> FaceRecognitionDTO:
+        """Persist a recognized face (monitors/cooldown) and build its DTO."""
+        # Scale box back to original frame size
+        scaled_box = self._scale_box(box, 1/scale)
         
-        for box, encoding in zip(boxes, encodings):
-            # Scale box back to original frame size
-            scaled_box = self._scale_box(box, 1/scale)
-            
-            # Compute distances
-            distances = self.face_engine.compute_distances(known_encodings, encoding)
-            
-            # Match using policy
-            match = self.match_policy.match(known_encodings, known_names, encoding, distances)
-            
-            # Persist to database (with cooldown) - chỉ khi active=True
-            self._persist_if_needed(match.label, active=active)
-            
-            # Create DTO
-            face_dto = FaceRecognitionDTO(
-                box=scaled_box,
-                name=match.label,
-                is_known=match.is_known,
-                distance=match.distance
-            )
-            results.append(face_dto)
+        # Persist to database (with cooldown) - chỉ khi active=True
+        self._persist_if_needed(match.label, active=active, distance=match.distance, track_id=track_id)
         
-        return RecognitionResult(faces=results)
+        # Create DTO
+        return FaceRecognitionDTO(
+            box=scaled_box,
+            name=match.label,
+            is_known=match.is_known,
+            distance=match.distance
+        )
+    
+    def _report_carried(self, faces: List[FaceRecognitionDTO], active: bool) -> None:
+        """Feed faces carried over from an earlier frame to the monitors / cooldown logger."""
+        for face in faces:
+            self._persist_if_needed(face.name, active=active, distance=face.distance)
+    
+    def _on_known_faces_reloaded(self, names: List[str]) -> None:
+        """Create detection monitors for people added by a reload."""
+        for name in dict.fromkeys(names):
+            if name not in self.known_person_monitors:
+                self.known_person_monitors[name] = self.known_person_monitor_factory(name)
     
     def _scale_box(self, box, scale: float):
         """Scale bounding box coordinates."""
-        from face_app.domain.entities import BoundingBox
         return BoundingBox(
             top=int(box.top * scale),
             right=int(box.right * scale),
@@ -115,13 +429,36 @@ class RecognizeFrameUseCase:
             left=int(box.left * scale)
         )
     
-    def _persist_if_needed(self, name: str, active: bool = True) -> None:
+    @staticmethod
+    def _offset_box(box: BoundingBox, dx: int, dy: int) -> BoundingBox:
+        """Translate a bounding box."""
+        return BoundingBox(
+            top=box.top + dy,
+            right=box.right + dx,
+            bottom=box.bottom + dy,
+            left=box.left + dx
+        )
+    
+    @staticmethod
+    def _boxes_overlap(a: BoundingBox, b: BoundingBox) -> bool:
+        """Check if two boxes intersect."""
+        return a.left < b.right and b.left < a.right and a.top < b.bottom and b.top < a.bottom
+    
+    def _persist_if_needed(
+        self,
+        name: str,
+        active: bool = True,
+        distance: Optional[float] = None,
+        track_id: Optional[int] = None
+    ) -> None:
         """
         Persist recognition event using detection monitors.
         
         Args:
             name: Person name or "Stranger"
             active: If False, skip all DB logging and email sending
+            distance: Match distance stored with the event
+            track_id: Tracker id stored with the event
         """
         # Nếu active=False, không ghi DB và không gửi email
         if not active:
@@ -146,5 +483,8 @@ class RecognizeFrameUseCase:
         
         self._last_recognition[name] = now
         time_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        self.recognition_repo.insert_event(name, time_str)
-        print(f"📝 Logged: {name} at {time_str}")
+        self.recognition_repo.insert_event(
+            name, time_str, camera_id=self.camera_id, distance=distance, track_id=track_id
+        )
+        where = f" [{self.camera_id}]" if self.camera_id else ""
+        print(f"📝 Logged: {name} at {time_str}{where}")
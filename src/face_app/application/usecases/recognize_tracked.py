@@ -0,0 +1,178 @@
+"""Use case for recognizing faces with tracking between detections."""
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import numpy as np
+from face_app.domain.entities import BoundingBox
+from face_app.domain.ports import FaceEnginePort, RecognitionRepoPort
+from face_app.domain.policies import MatchPolicy
+from face_app.application.dto import RecognitionResult, FrameContext
+from face_app.application.usecases.load_known_faces import LoadKnownFacesUseCase
+from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+from face_app.config.settings import TRACK_REVERIFY_INTERVAL, TRACK_CONFIDENCE_MARGIN
+
+
+@dataclass
+class TrackedFrameContext(FrameContext):
+    """Frame work item carrying track state between stages."""
+    visible: List[Tuple[object, BoundingBox]] = field(default_factory=list)  # (track, box this frame)
+    pending: List[Tuple[object, BoundingBox]] = field(default_factory=list)  # Tracks to encode + match
+    pending_encodings: Optional[List[np.ndarray]] = None  # Embeddings already produced by detection
+
+
+class RecognizeTrackedUseCase(RecognizeFrameUseCase):
+    """
+    Recognize faces, re-using identities of tracked faces.
+    
+    Detection runs every ``tracker.detect_interval`` frames and the tracker
+    moves boxes in between. A face is encoded + matched only when its track
+    is new, its last match was close to the tolerance, or its identity is
+    older than ``reverify_interval`` frames. Every visible track is reported
+    once per frame, so monitors keep receiving one detection per person.
+    """
+    
+    # Tracker state changes in stages 2 and 3: one worker each, in order
+    parallel_stages = False
+    
+    def __init__(
+        self,
+        face_engine: FaceEnginePort,
+        load_known_usecase: LoadKnownFacesUseCase,
+        recognition_repo: RecognitionRepoPort,
+        match_policy: MatchPolicy,
+        tracker,  # FaceTracker instance
+        reverify_interval: int = TRACK_REVERIFY_INTERVAL,
+        confidence_margin: float = TRACK_CONFIDENCE_MARGIN,
+        **kwargs
+    ):
+        """
+        Initialize use case.
+        
+        Args:
+            face_engine: Face detection/encoding engine
+            load_known_usecase: Use case for loading known faces
+            recognition_repo: Repository for persisting events
+            match_policy: Policy for matching faces
+            tracker: FaceTracker carrying boxes/identities between detections
+            reverify_interval: Re-encode a tracked face after N frames (0 = never)
+            confidence_margin: Re-encode while the match distance is within this
+                margin of the tolerance
+            **kwargs: Forwarded to RecognizeFrameUseCase (cooldown, monitors...)
+        """
+        super().__init__(face_engine, load_known_usecase, recognition_repo, match_policy, **kwargs)
+        self.tracker = tracker
+        self.reverify_interval = reverify_interval
+        self.confidence_margin = confidence_margin
+        
+        # Identities cached before a gallery reload may be outdated
+        self._gallery_changed = threading.Event()
+        load_known_usecase.add_reload_listener(lambda names: self._gallery_changed.set())
+    
+    def _new_context(self, frame_bgr: np.ndarray, active: bool) -> "TrackedFrameContext":
+        """Create the work item for a frame."""
+        return TrackedFrameContext(frame_bgr=frame_bgr, active=active)
+    
+    def _prepare(self, context: FrameContext, region: Optional[BoundingBox]) -> None:
+        """
+        Resize the whole frame.
+        
+        The motion region is not used here: tracks must see the whole
+        frame to follow faces that leave it.
+        """
+        context.small_frame, context.rgb_frame, context.scale = self._preprocess(context.frame_bgr)
+    
+    def detect(self, context: FrameContext) -> FrameContext:
+        """Stage 2: detect every N frames (track in between) and pick tracks to verify."""
+        if context.skipped:
+            return context
+        
+        if self._gallery_changed.is_set():
+            self._gallery_changed.clear()
+            self.tracker.invalidate_identities()
+        
+        if self.tracker.should_detect():
+            tracks = self._detect_tracks(context)
+        else:
+            # Tracking frame: boxes from the tracker, identities from cache
+            tracks = self.tracker.update_tracks(context.small_frame)
+        
+        # Snapshot boxes: later frames move the same track objects
+        context.visible = [(track, track.bbox) for track in tracks if track.frames_since_update == 0]
+        return context
+    
+    def embed_and_match(self, context: FrameContext) -> FrameContext:
+        """Stage 3: encode + match only the tracks that need a (new) identity."""
+        if context.skipped or not context.pending:
+            return context
+        
+        encodings = context.pending_encodings
+        if encodings is None:
+            encodings = self.face_engine.encode_faces(context.rgb_frame, [bbox for _, bbox in context.pending])
+        
+        # No face in a track's box: it stays unverified and is retried on the next detection frame
+        encoded = [
+            (track, encoding) for (track, _), encoding in zip(context.pending, encodings)
+            if encoding is not None
+        ]
+        if not encoded:
+            return context
+        
+        matches = self._match_encodings([encoding for _, encoding in encoded])
+        
+        for (track, encoding), match in zip(encoded, matches):
+            self.tracker.mark_verified(track, match, encoding)
+        
+        return context
+    
+    def apply_side_effects(self, context: FrameContext) -> RecognitionResult:
+        """Stage 4: report every visible, identified track once."""
+        if context.skipped:
+            return super().apply_side_effects(context)
+        
+        results = [
+            self._report_face(bbox, track.match, context.scale, context.active, track_id=track.track_id)
+            for track, bbox in context.visible
+            if track.match is not None
+        ]
+        
+        self._last_faces = results
+        return RecognitionResult(faces=results)
+    
+    def _detect_tracks(self, context: "TrackedFrameContext") -> List:
+        """Detection frame: associate boxes with tracks and queue the ones to verify."""
+        if self.face_engine.embeds_on_detect:
+            # Embeddings come with detection, keep them instead of encoding again
+            detected_faces = self.face_engine.analyze_faces(context.rgb_frame)
+            boxes = [detected.box for detected in detected_faces]
+            encodings = [detected.encoding for detected in detected_faces]
+        else:
+            detected_faces = None
+            boxes = self.face_engine.detect_faces(context.rgb_frame)
+            encodings = None
+        
+        # Embeddings (when available) help keep identities apart in crowds
+        tracks = self.tracker.update_tracks(context.small_frame, boxes, encodings=encodings)
+        
+        context.pending = [
+            (track, track.bbox) for track in tracks
+            if track.frames_since_update == 0 and self._needs_verification(track)
+        ]
+        
+        if context.pending and detected_faces is not None:
+            # Tracks detected this frame hold exactly the detected box objects
+            encoding_by_box = {id(detected.box): detected.encoding for detected in detected_faces}
+            context.pending_encodings = [encoding_by_box[id(bbox)] for _, bbox in context.pending]
+        
+        return tracks
+    
+    def _needs_verification(self, track) -> bool:
+        """Check if a track's cached identity must be refreshed."""
+        if track.match is None or track.verified_frame < 0:
+            return True
+        
+        # Close to the decision boundary: could flip either way
+        if abs(track.match.distance - self.match_policy.tolerance) < self.confidence_margin:
+            return True
+        
+        age = self.tracker.frame_count - track.verified_frame
+        return self.reverify_interval > 0 and age >= self.reverify_interval
@@ -8,14 +8,60 @@ KNOWN_FACES_DIR = BASE_DIR / "known_faces"
 DATA_DIR = BASE_DIR / "data"
 DB_PATH = DATA_DIR / "attendance.sqlite"
 
+# Database settings
+DB_ASYNC_WRITES = True  # Write events from a background thread in batches (recognition never waits for the disk)
+DB_WRITE_QUEUE_SIZE = 1000  # Events waiting to be written before new ones are dropped (with a warning)
+DB_WRITE_BATCH_SIZE = 50  # Most events committed in one transaction
+DB_WRITE_FLUSH_INTERVAL = 0.05  # Seconds the writer waits for more events before committing
+DB_SYNCHRONOUS = "NORMAL"  # SQLite synchronous pragma in WAL mode (NORMAL = no fsync per commit)
+DB_BUSY_TIMEOUT_MS = 5000  # Wait this long for a lock instead of failing with "database is locked"
+
+# Retention (run_retention.py)
+RETENTION_RAW_DAYS = 90  # Keep raw recognition events this many days (0 = forever)
+RETENTION_HOURLY_DAYS = 0  # Keep hourly rollups this many days (0 = forever; daily/per-person rollups are always kept)
+RETENTION_ARCHIVE_DIR = DATA_DIR / "archive"  # Expired events are exported here before they are deleted
+RETENTION_ARCHIVE_FORMAT = "csv"  # "csv" (gzip) or "parquet" (needs pyarrow, falls back to csv)
+RETENTION_CHUNK_SIZE = 5000  # Rows deleted per transaction (short transactions keep the app's writer unblocked)
+RETENTION_CHUNK_PAUSE = 0.05  # Seconds between delete chunks
+RETENTION_VACUUM_PAGES = 2000  # Free pages returned to the file system per incremental_vacuum step
+
 # Camera settings
 CAMERA_INDEX = 0  # 0 = default camera
 FRAME_WIDTH = 640  # Resize width for faster processing
 PROCESS_EVERY_N_FRAMES = 1  # Process every frame (1) or skip frames for performance
+ENABLE_MOTION_GATE = False  # Skip face detection on static frames, search only the moving area (still faces keep feeding the monitors)
+MOTION_THUMB_WIDTH = 160  # Thumbnail width used for frame differencing
+MOTION_PIXEL_THRESHOLD = 25  # Gray-level change (0-255) for a pixel to count as motion
+MOTION_MIN_AREA = 0.002  # Fraction of changed pixels needed to report motion
+MOTION_HOLD_FRAMES = 10  # Keep processing N frames after motion stops
+MOTION_REGION_MAX_FRACTION = 0.5  # Motion regions larger than this fraction use the full frame
+ENABLE_ROI_DETECTION = False  # Detect at native resolution around previous faces / motion instead of full frame
+ROI_FULL_SWEEP_INTERVAL = 10  # Full-frame detection every N processed frames in ROI mode
+ROI_PADDING = 0.75  # Search area around a previous face (fraction of face size per side)
+ROI_MAX_SIDE = 640  # Regions larger than this (px) fall back to the downscaled full frame
 
 # Face Recognition settings
 TOLERANCE = 0.5  # Lower = stricter (0.4-0.6 recommended)
 MODEL = "hog"  # "hog" (faster, CPU) or "cnn" (accurate, GPU needed)
+DLIB_LANDMARK_MODEL = "small"  # "small" (5-point, faster) or "large" (68-point) for dlib encodings
+DLIB_NUM_JITTERS = 1  # Re-sample faces N times when encoding (higher = slower, more stable)
+DLIB_BATCH_ENCODING = True  # Encode all faces of a frame with one dlib descriptor call
+ENABLE_EMBEDDING_CACHE = True  # Cache known face embeddings in known_faces/.embeddings-*
+ENROLL_WORKERS = 1  # Processes for encoding known faces (1 = serial, 0 = one per CPU core)
+ENROLL_DETECT_MAX_SIDE = 1024  # Known face photos are decoded at most this large for detection
+ENROLL_MIN_FACE_SIZE = 160  # Minimum face width (px) used when encoding known faces
+GALLERY_INDEX = "exact"  # "exact" (brute force), "ivf" (approximate, for very large enrollments) or "templates"
+IVF_NLIST = 0  # IVF cells (0 = sqrt of the gallery size)
+IVF_NPROBE = 8  # IVF cells searched per face (higher = better recall, slower)
+IVF_MIN_GALLERY_SIZE = 20000  # Smaller galleries keep exact search (faster there)
+TEMPLATE_METHOD = "mean"  # Per-person template: "mean", "medoid" or "weighted" (outlier photos count less)
+TEMPLATES_PER_IDENTITY = 1  # Templates per person (more = keeps distinct looks, e.g. with/without glasses)
+TEMPLATE_RERANK = 3  # Re-check the photos of the N closest people exactly (0 = match on templates only)
+GALLERY_STORAGE = "float32"  # Exact-search scan copy: "float32", "float16" (2x smaller, slower scan: memory only) or "int8" (4x smaller, fastest scan)
+GALLERY_RERANK_CANDIDATES = 32  # float16/int8: best rows per face re-checked at full precision
+GALLERY_EXACT_ON_DISK = True  # float16/int8: keep full-precision rows in a memory-mapped temp file, not RAM
+ENABLE_DATASET_WATCH = True  # Auto reload known faces in background when known_faces/ changes
+DATASET_WATCH_INTERVAL = 2.0  # Seconds between known_faces/ polls
 
 # Phase 4 - Advanced settings
 USE_INSIGHTFACE = False  # True to use InsightFace (more accurate), False for face_recognition
@@ -27,10 +73,31 @@ ENABLE_TRACKING = False  # Enable face tracking to reduce compute
 TRACK_DETECT_INTERVAL = 5  # Run full detection every N frames
 TRACK_MAX_DISAPPEARED = 10  # Remove track after N frames without update
 TRACK_IOU_THRESHOLD = 0.3  # IoU threshold for matching tracks
+TRACK_APPEARANCE_WEIGHT = 0.3  # Blend embedding distance into track assignment (0 = IoU only)
+TRACK_REVERIFY_INTERVAL = 30  # Re-encode a tracked face after N frames (0 = never)
+TRACK_CONFIDENCE_MARGIN = 0.05  # Re-encode while match distance is within this margin of TOLERANCE
 
 # Performance settings
 USE_THREADED_CAMERA = False  # Use threaded camera for better FPS
-CAMERA_BUFFER_SIZE = 2  # Frame buffer size for threaded camera
+CAMERA_BUFFER_SIZE = 3  # Preallocated frames in the threaded camera ring (min 3)
+USE_PIPELINE = True  # Run recognition stages on background threads (display keeps camera FPS)
+PIPELINE_QUEUE_SIZE = 2  # Frames queued between stages (oldest dropped when full)
+PIPELINE_DETECT_WORKERS = 1  # Detection threads (>1 only for thread-safe engines, e.g. InsightFace)
+PIPELINE_EMBED_WORKERS = 1  # Encoding + matching threads
+PIPELINE_BACKEND = "threads"  # "threads" or "processes" (one engine per process, frames in shared memory)
+PIPELINE_PROCESS_WORKERS = 0  # Worker processes for the "processes" backend (0 = one per CPU core)
+PIPELINE_STATS_INTERVAL = 10.0  # Seconds between per-stage latency reports
+
+# Multi-camera supervisor (run_supervisor.py)
+SUPERVISOR_CAMERA_SOURCES = []  # Camera indices, video files or RTSP URLs ("id=source" names a camera)
+SUPERVISOR_ENGINE_POOL_SIZE = 2  # Face engines shared by all cameras (one model stack each)
+SUPERVISOR_WORKERS = 0  # Recognition threads (0 = engine pool size)
+SUPERVISOR_FPS_BUDGET = 5.0  # Max recognitions per second per camera (0 = as often as possible)
+
+# Metrics (Prometheus text format)
+ENABLE_METRICS = False  # Record runtime metrics (stage latency, drops, DB/alert latency, MQTT reconnects)
+METRICS_HOST = "0.0.0.0"  # Interface of the /metrics endpoint in camera / headless runs
+METRICS_PORT = 9108  # Port of the /metrics endpoint (the FastAPI service serves its own /metrics)
 
 # Anti-spoofing settings
 ENABLE_ANTISPOOFING = False  # Enable basic anti-spoofing
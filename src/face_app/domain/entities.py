@@ -1,6 +1,6 @@
 """Domain entities - Core business objects."""
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -32,6 +32,7 @@ class RecognitionEvent:
     """Event to be persisted to database."""
     name: str
     time: str  # ISO format: YYYY-MM-DD HH:MM:SS
+    camera_id: Optional[str] = None  # Source camera (multi-camera supervisor)
 
 
 @dataclass
@@ -40,3 +41,4 @@ class DetectedFace:
     box: BoundingBox
     encoding: List[float]
     match: FaceMatch = None
+    det_score: float = 1.0  # Detection confidence (1.0 when engine has no score)
@@ -0,0 +1,305 @@
+"""Face gallery - Contiguous embedding matrix for batched matching."""
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+
+
+METRIC_EUCLIDEAN = "euclidean"  # dlib / face_recognition (128-d)
+METRIC_COSINE = "cosine"  # InsightFace (512-d)
+
+STORAGE_FLOAT32 = "float32"  # Full precision only
+STORAGE_FLOAT16 = "float16"  # Half-precision scan copy (2x smaller; memory only, numpy scans it slower than float32)
+STORAGE_INT8 = "int8"  # Symmetric int8 scan copy with one scale per row (4x smaller)
+STORAGES = (STORAGE_FLOAT32, STORAGE_FLOAT16, STORAGE_INT8)
+
+# Rows converted to float32 at a time while scanning a compact copy (stays in cache)
+SCAN_BLOCK_ROWS = 1024
+
+
+@dataclass
+class GallerySearchResult:
+    """Top-k candidates for a batch of probes."""
+    indices: np.ndarray  # (n_probes, k) row indices into the gallery
+    distances: np.ndarray  # (n_probes, k) ascending distances
+    labels: np.ndarray  # (n_probes, k) label ids
+    label_names: List[str]  # label id -> person name
+    
+    def __len__(self) -> int:
+        return self.indices.shape[0]
+
+
+class FaceGallery:
+    """Known faces stored as one float32 matrix plus an int label array."""
+    
+    def __init__(self, encodings: List[np.ndarray], names: List[str], metric: str = METRIC_EUCLIDEAN):
+        """
+        Build gallery from LoadKnownFacesUseCase output.
+        
+        Args:
+            encodings: Known face encodings (one per enrolled image)
+            names: Person name for each encoding
+            metric: "euclidean" (dlib) or "cosine" (InsightFace)
+        """
+        if metric not in (METRIC_EUCLIDEAN, METRIC_COSINE):
+            raise ValueError(f"Unknown metric: {metric}")
+        if len(encodings) != len(names):
+            raise ValueError("encodings and names must have the same length")
+        
+        self.metric = metric
+        
+        # Label ids in order of first appearance
+        self.label_names: List[str] = list(dict.fromkeys(names))
+        label_ids = {name: i for i, name in enumerate(self.label_names)}
+        self.labels = np.fromiter((label_ids[n] for n in names), dtype=np.int32, count=len(names))
+        
+        if encodings:
+            matrix = np.ascontiguousarray(np.vstack(encodings), dtype=np.float32)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        
+        if metric == METRIC_COSINE:
+            matrix = _l2_normalize(matrix)
+            self._sq_norms = None
+        else:
+            self._sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        
+        self.matrix = matrix
+        
+        # Optional search index (see gallery_index); None = exact brute force
+        self.index = None
+        
+        # Compact scan copy (see quantize); None = scan the float32 matrix
+        self.storage = STORAGE_FLOAT32
+        self.codes: Optional[np.ndarray] = None
+        self.code_scales: Optional[np.ndarray] = None
+        self.rerank = 0
+    
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+    
+    @property
+    def dim(self) -> int:
+        """Embedding dimension (0 for an empty gallery)."""
+        return self.matrix.shape[1]
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held in RAM by the gallery arrays (a memory-mapped matrix is not counted)."""
+        arrays = [self.labels, self._sq_norms, self.codes, self.code_scales]
+        if not isinstance(self.matrix, np.memmap):
+            arrays.append(self.matrix)
+        return sum(a.nbytes for a in arrays if a is not None)
+    
+    def quantize(self, storage: str, rerank: int = 32) -> None:
+        """
+        Scan a compact copy of the matrix, re-rank the best rows at full precision.
+        
+        The full-precision matrix stays the reference for returned distances;
+        once it is only read for candidates it can be moved out of RAM
+        (e.g. memory-mapped). STORAGE_FLOAT32 drops the compact copy.
+        
+        Only int8 scans faster than float32: numpy has no fast float16
+        conversion or BLAS, so STORAGE_FLOAT16 trades scan speed for memory.
+        
+        Args:
+            storage: STORAGE_FLOAT32, STORAGE_FLOAT16 or STORAGE_INT8
+            rerank: Candidates per probe re-ranked with exact distances
+        """
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown gallery storage '{storage}', use one of {STORAGES}")
+        
+        self.storage = storage
+        self.rerank = rerank
+        self.codes = None
+        self.code_scales = None
+        if storage == STORAGE_FLOAT32 or len(self) == 0:
+            return
+        
+        matrix = np.asarray(self.matrix)
+        if storage == STORAGE_FLOAT16:
+            self.codes = matrix.astype(np.float16)
+            return
+        
+        # Symmetric per-row int8: row ~= codes * scale
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        self.codes = np.round(matrix / scales[:, None]).astype(np.int8)
+        self.code_scales = scales.astype(np.float32)
+    
+    def distances(self, probes: np.ndarray) -> np.ndarray:
+        """
+        Full distance matrix between probes and every gallery row.
+        
+        Args:
+            probes: (n_probes, dim) array
+        
+        Returns:
+            (n_probes, gallery_size) float32 distances (lower = more similar)
+        """
+        probes = np.atleast_2d(np.asarray(probes, dtype=np.float32))
+        return pairwise_distances(probes, self.matrix, self.metric, self._sq_norms)
+    
+    def row_distances(self, probe: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Distances between one probe and a subset of gallery rows.
+        
+        Args:
+            probe: (dim,) encoding
+            rows: Row indices into the gallery
+        
+        Returns:
+            (len(rows),) float32 distances
+        """
+        probe = np.asarray(probe, dtype=np.float32).reshape(1, -1)
+        sq_norms = self._sq_norms[rows] if self._sq_norms is not None else None
+        return pairwise_distances(probe, self.matrix[rows], self.metric, sq_norms)[0]
+    
+    def search(self, probes: np.ndarray, k: int = 1) -> GallerySearchResult:
+        """
+        Match all probes of a frame in one batched computation.
+        
+        Uses the attached index when there is one, exact search otherwise.
+        
+        Args:
+            probes: (n_probes, dim) array of encodings
+            k: Number of nearest gallery rows to return per probe
+        
+        Returns:
+            GallerySearchResult with ascending top-k per probe
+        """
+        probes = np.atleast_2d(np.asarray(probes, dtype=np.float32))
+        
+        if len(self) == 0 or probes.shape[0] == 0:
+            return self.empty_result(probes.shape[0])
+        
+        if self.index is not None:
+            return self.index.search(self, probes, k)
+        return self.exact_search(probes, k)
+    
+    def exact_search(self, probes: np.ndarray, k: int = 1) -> GallerySearchResult:
+        """
+        Brute-force top-k over every gallery row (non-empty gallery).
+        
+        With a compact copy (quantize) the scan runs on the codes and only
+        the best ``rerank`` rows per probe get exact distances.
+        """
+        if self.codes is not None:
+            return self._quantized_search(probes, k)
+        
+        dists = self.distances(probes)
+        indices = top_k(dists, k)
+        return self.result(indices, np.take_along_axis(dists, indices, axis=1))
+    
+    def _quantized_search(self, probes: np.ndarray, k: int) -> GallerySearchResult:
+        """Approximate scan over the codes, exact re-rank of the candidates."""
+        n = len(self)
+        k = max(1, min(k, n))
+        candidates_n = min(n, max(k, self.rerank))
+        
+        if self.metric == METRIC_COSINE:
+            probes = _l2_normalize(probes)
+        
+        # Convert a cache-sized slice of codes at a time into one reused buffer
+        scores = np.empty((n, probes.shape[0]), dtype=np.float32)
+        buffer = np.empty((min(n, SCAN_BLOCK_ROWS), self.dim), dtype=np.float32)
+        probes_t = np.ascontiguousarray(probes.T)
+        for start in range(0, n, SCAN_BLOCK_ROWS):
+            codes = self.codes[start:start + SCAN_BLOCK_ROWS]
+            block = buffer[:codes.shape[0]]
+            np.copyto(block, codes, casting="unsafe")
+            np.matmul(block, probes_t, out=scores[start:start + codes.shape[0]])
+        
+        if self.code_scales is not None:
+            scores *= self.code_scales[:, None]
+        
+        if self.metric == METRIC_COSINE:
+            approx = 1.0 - scores.T
+        else:
+            # Squared distance: only used for ranking
+            probe_sq = np.einsum("ij,ij->i", probes, probes)
+            approx = probe_sq[:, None] - 2.0 * scores.T + self._sq_norms[None, :]
+        best_rows = top_k(approx, candidates_n)
+        
+        # Exact distances for the candidates only
+        indices = np.empty((probes.shape[0], k), dtype=np.int64)
+        distances = np.empty((probes.shape[0], k), dtype=np.float32)
+        for i, probe in enumerate(probes):
+            rows = np.sort(best_rows[i])  # Sequential reads from a memory-mapped matrix
+            dists = self.row_distances(probe, rows)
+            best = top_k(dists[None, :], k)[0]
+            indices[i] = rows[best]
+            distances[i] = dists[best]
+        
+        return self.result(indices, distances)
+    
+    def result(self, indices: np.ndarray, distances: np.ndarray) -> GallerySearchResult:
+        """Wrap (n_probes, k) row indices and distances with their labels."""
+        return GallerySearchResult(
+            indices=indices,
+            distances=distances,
+            labels=self.labels[indices],
+            label_names=self.label_names
+        )
+    
+    def empty_result(self, n_probes: int) -> GallerySearchResult:
+        """Result with no candidates (empty gallery)."""
+        empty_idx = np.zeros((n_probes, 0), dtype=np.int64)
+        return GallerySearchResult(
+            indices=empty_idx,
+            distances=np.zeros((n_probes, 0), dtype=np.float32),
+            labels=empty_idx.astype(np.int32),
+            label_names=self.label_names
+        )
+
+
+def pairwise_distances(
+    probes: np.ndarray,
+    matrix: np.ndarray,
+    metric: str,
+    sq_norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Distance matrix between probes and rows.
+    
+    Args:
+        probes: (n_probes, dim) float32
+        matrix: (n_rows, dim) float32, rows L2-normalized for cosine
+        metric: METRIC_EUCLIDEAN or METRIC_COSINE
+        sq_norms: Precomputed squared row norms (euclidean only)
+    
+    Returns:
+        (n_probes, n_rows) float32 distances (lower = more similar)
+    """
+    if metric == METRIC_COSINE:
+        # One matrix multiply against pre-normalized rows
+        return 1.0 - _l2_normalize(probes) @ matrix.T
+    
+    if sq_norms is None:
+        sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+    
+    # ||a - b||^2 = ||a||^2 - 2ab + ||b||^2, batched
+    probe_sq = np.einsum("ij,ij->i", probes, probes)
+    sq = probe_sq[:, None] - 2.0 * (probes @ matrix.T) + sq_norms[None, :]
+    np.maximum(sq, 0.0, out=sq)
+    return np.sqrt(sq)
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def top_k(dists: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k smallest values per row, sorted ascending."""
+    n_cols = dists.shape[1]
+    k = max(1, min(k, n_cols))
+    
+    if k < n_cols:
+        candidates = np.argpartition(dists, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n_cols), dists.shape).copy()
+    
+    order = np.argsort(np.take_along_axis(dists, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
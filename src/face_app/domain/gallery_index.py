@@ -0,0 +1,392 @@
+"""Gallery search indexes - exact brute force, inverted file (IVF) and per-identity templates."""
+from abc import ABC, abstractmethod
+import numpy as np
+from .gallery import FaceGallery, GallerySearchResult, METRIC_COSINE, pairwise_distances, top_k, _l2_normalize
+
+
+INDEX_EXACT = "exact"
+INDEX_IVF = "ivf"
+INDEX_TEMPLATES = "templates"
+INDEX_KINDS = (INDEX_EXACT, INDEX_IVF, INDEX_TEMPLATES)
+
+TEMPLATE_MEAN = "mean"  # Average of the photos
+TEMPLATE_MEDOID = "medoid"  # Most central real photo
+TEMPLATE_WEIGHTED = "weighted"  # Average with outlier photos down-weighted
+TEMPLATE_METHODS = (TEMPLATE_MEAN, TEMPLATE_MEDOID, TEMPLATE_WEIGHTED)
+
+
+class GalleryIndex(ABC):
+    """Search strategy attached to a FaceGallery (gallery.index)."""
+    
+    kind: str = ""
+    
+    @abstractmethod
+    def search(self, gallery: FaceGallery, probes: np.ndarray, k: int) -> GallerySearchResult:
+        """
+        Top-k gallery rows per probe.
+        
+        Args:
+            gallery: Non-empty gallery the index was built for
+            probes: (n_probes, dim) float32 encodings
+            k: Candidates per probe
+        
+        Returns:
+            GallerySearchResult with ascending distances
+        """
+        pass
+
+
+class ExactIndex(GalleryIndex):
+    """Brute force over every row (same as a gallery without index)."""
+    
+    kind = INDEX_EXACT
+    
+    def search(self, gallery: FaceGallery, probes: np.ndarray, k: int) -> GallerySearchResult:
+        return gallery.exact_search(probes, k)
+
+
+class IVFIndex(GalleryIndex):
+    """
+    Inverted-file index: k-means cells, search only the nearest cells.
+    
+    Rows are clustered into ``nlist`` cells at build time. A probe is
+    compared with the cell centroids, then exactly with the rows of its
+    ``nprobe`` nearest cells. Recall grows with nprobe (nprobe = nlist is
+    exact); cost is about nlist + nprobe * n / nlist distances instead of n.
+    Distances of returned rows are exact, so MatchPolicy thresholds hold.
+    """
+    
+    kind = INDEX_IVF
+    
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, metric: str, nprobe: int = 8):
+        """
+        Initialize from a trained clustering (see train()).
+        
+        Args:
+            centroids: (nlist, dim) float32 cell centers
+            assignments: (n_rows,) cell of every gallery row
+            metric: Gallery metric the index was trained for
+            nprobe: Cells searched per probe
+        """
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.assignments = np.asarray(assignments, dtype=np.int32)
+        self.metric = metric
+        self.nprobe = nprobe
+        
+        # Rows grouped by cell: rows of cell c are order[offsets[c]:offsets[c + 1]]
+        self._order = np.argsort(self.assignments, kind="stable")
+        counts = np.bincount(self.assignments, minlength=self.nlist)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+    
+    @property
+    def nlist(self) -> int:
+        """Number of cells."""
+        return self.centroids.shape[0]
+    
+    @classmethod
+    def train(
+        cls,
+        gallery: FaceGallery,
+        nlist: int = 0,
+        nprobe: int = 8,
+        iterations: int = 10,
+        max_points_per_cell: int = 64,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Cluster the gallery rows with k-means (spherical for cosine).
+        
+        Args:
+            gallery: Gallery to index
+            nlist: Number of cells (0 = sqrt of the gallery size)
+            nprobe: Cells searched per probe
+            iterations: Lloyd iterations
+            max_points_per_cell: Training sample size per cell (the rest is only assigned)
+            seed: Random seed (same gallery -> same index)
+        
+        Returns:
+            Trained IVFIndex
+        """
+        matrix = gallery.matrix
+        n = matrix.shape[0]
+        if nlist <= 0:
+            nlist = int(round(np.sqrt(n)))
+        nlist = max(1, min(nlist, n))
+        
+        rng = np.random.default_rng(seed)
+        sample_size = min(n, nlist * max_points_per_cell)
+        sample = matrix[np.sort(rng.choice(n, sample_size, replace=False))] if sample_size < n else matrix
+        
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = _assign(sample, centroids, gallery.metric)
+            counts = np.bincount(labels, minlength=nlist)
+            
+            # Per-cell sums over the points sorted by cell
+            order = np.argsort(labels, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            filled = counts > 0
+            sums = np.zeros_like(centroids)
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            
+            # Empty cells restart from a random training point
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+            counts[empty] = 1
+            centroids = sums / counts[:, None]
+            if gallery.metric == METRIC_COSINE:
+                centroids = _l2_normalize(centroids)
+        
+        centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        return cls(centroids, _assign(matrix, centroids, gallery.metric), gallery.metric, nprobe)
+    
+    def search(self, gallery: FaceGallery, probes: np.ndarray, k: int) -> GallerySearchResult:
+        """Exact distances over the rows of each probe's nprobe nearest cells."""
+        nprobe = max(1, min(self.nprobe, self.nlist))
+        cell_dists = pairwise_distances(probes, self.centroids, self.metric)
+        cells = top_k(cell_dists, nprobe)
+        
+        k = max(1, k)
+        indices = np.zeros((probes.shape[0], k), dtype=np.int64)
+        distances = np.full((probes.shape[0], k), np.inf, dtype=np.float32)
+        
+        for i, probe in enumerate(probes):
+            rows = np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in cells[i]])
+            _fill_candidates(gallery, probe, rows, indices[i], distances[i])
+        
+        return gallery.result(indices, distances)
+
+
+class TemplateIndex(GalleryIndex):
+    """
+    A few representative templates per person instead of every photo.
+    
+    Each identity's photos are split into ``per_identity`` groups (k-medoids)
+    and every group becomes one template: the mean of its rows (already
+    L2-normalized for cosine, renormalized after averaging), its medoid, or
+    a mean weighted by how consistent each photo is with the others (blurry
+    or mislabeled photos count less). Search compares probes with the
+    templates only, so the cost follows the number of people, not photos.
+    
+    With ``rerank`` > 0 the raw photos of the best ``rerank`` people are then
+    compared exactly and those distances are returned, so TOLERANCE keeps
+    its meaning. Without re-rank the template distance is returned; a mean
+    template usually sits closer to a genuine probe than single photos do.
+    """
+    
+    kind = INDEX_TEMPLATES
+    
+    def __init__(
+        self,
+        templates: np.ndarray,
+        template_labels: np.ndarray,
+        template_rows: np.ndarray,
+        gallery_labels: np.ndarray,
+        metric: str,
+        rerank: int = 0
+    ):
+        """
+        Initialize from built templates (see build()).
+        
+        Args:
+            templates: (n_templates, dim) float32, grouped by label
+            template_labels: (n_templates,) label id of every template
+            template_rows: (n_templates,) gallery row closest to every template
+            gallery_labels: (n_rows,) label id of every gallery row
+            metric: Gallery metric the templates were built for
+            rerank: People whose photos are re-ranked exactly (0 = templates only)
+        """
+        self.templates = np.ascontiguousarray(templates, dtype=np.float32)
+        self.template_labels = np.asarray(template_labels, dtype=np.int32)
+        self.template_rows = np.asarray(template_rows, dtype=np.int64)
+        self.metric = metric
+        self.rerank = rerank
+        
+        # Templates of the same label are contiguous: first template of each run
+        self._label_starts = np.flatnonzero(np.diff(self.template_labels, prepend=-1))
+        self._run_labels = self.template_labels[self._label_starts]
+        
+        # Gallery rows grouped by label (for re-ranking)
+        self._order = np.argsort(gallery_labels, kind="stable")
+        counts = np.bincount(gallery_labels, minlength=int(self._run_labels.max(initial=-1)) + 1)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._sq_norms = None if metric == METRIC_COSINE else np.einsum("ij,ij->i", self.templates, self.templates)
+    
+    def __len__(self) -> int:
+        return self.templates.shape[0]
+    
+    @classmethod
+    def build(
+        cls,
+        gallery: FaceGallery,
+        method: str = TEMPLATE_MEAN,
+        per_identity: int = 1,
+        rerank: int = 0,
+        max_photos: int = 512,
+        seed: int = 0
+    ) -> "TemplateIndex":
+        """
+        Compute the templates of every identity.
+        
+        Args:
+            gallery: Gallery to compact
+            method: "mean", "medoid" or "weighted"
+            per_identity: Templates per person (people with fewer photos keep one per photo)
+            rerank: People re-ranked on their raw photos (0 = templates only)
+            max_photos: Photos sampled per person when choosing medoids
+            seed: Random seed of that sample
+        
+        Returns:
+            TemplateIndex
+        """
+        if method not in TEMPLATE_METHODS:
+            raise ValueError(f"Unknown template method '{method}', use one of {TEMPLATE_METHODS}")
+        
+        metric = gallery.metric
+        rng = np.random.default_rng(seed)
+        order = np.argsort(gallery.labels, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(gallery.labels, minlength=len(gallery.label_names)))))
+        
+        templates, template_labels, template_rows = [], [], []
+        for label in range(len(offsets) - 1):
+            rows = order[offsets[label]:offsets[label + 1]]
+            if rows.size == 0:
+                continue
+            
+            vectors = gallery.matrix[rows]
+            k = max(1, min(per_identity, rows.size))
+            if k == 1 and method != TEMPLATE_MEDOID:
+                groups = np.zeros(rows.size, dtype=np.int32)
+                medoids = None
+            else:
+                medoids, groups = _k_medoids(vectors, k, metric, rng, max_photos)
+            
+            for group in range(k):
+                members = np.flatnonzero(groups == group)
+                if members.size == 0:
+                    continue
+                
+                if method == TEMPLATE_MEDOID:
+                    template = vectors[medoids[group]]
+                else:
+                    weights = None
+                    if method == TEMPLATE_WEIGHTED:
+                        weights = _consistency_weights(vectors[members], metric)
+                    template = np.average(vectors[members], axis=0, weights=weights)
+                    if metric == METRIC_COSINE:
+                        template = _l2_normalize(template[None, :])[0]
+                
+                # Real photo standing for the template in search results
+                template = template.astype(np.float32)
+                closest = np.argmin(pairwise_distances(template[None, :], vectors[members], metric)[0])
+                templates.append(template)
+                template_labels.append(label)
+                template_rows.append(rows[members[closest]])
+        
+        dim = gallery.matrix.shape[1]
+        matrix = np.vstack(templates) if templates else np.zeros((0, dim), dtype=np.float32)
+        return cls(matrix, template_labels, template_rows, gallery.labels, metric, rerank)
+    
+    def search(self, gallery: FaceGallery, probes: np.ndarray, k: int) -> GallerySearchResult:
+        """Nearest templates, optionally re-ranked on the raw photos of the best people."""
+        template_dists = pairwise_distances(probes, self.templates, self.metric, self._sq_norms)
+        
+        if self.rerank <= 0:
+            best = top_k(template_dists, k)
+            return gallery.result(self.template_rows[best], np.take_along_axis(template_dists, best, axis=1))
+        
+        # Best template per person, then the photos of the closest people
+        person_dists = np.minimum.reduceat(template_dists, self._label_starts, axis=1)
+        people = self._run_labels[top_k(person_dists, self.rerank)]
+        
+        k = max(1, k)
+        indices = np.zeros((probes.shape[0], k), dtype=np.int64)
+        distances = np.full((probes.shape[0], k), np.inf, dtype=np.float32)
+        for i, probe in enumerate(probes):
+            rows = np.concatenate([self._order[self._offsets[p]:self._offsets[p + 1]] for p in people[i]])
+            _fill_candidates(gallery, probe, rows, indices[i], distances[i])
+        
+        return gallery.result(indices, distances)
+
+
+def _k_medoids(
+    vectors: np.ndarray,
+    k: int,
+    metric: str,
+    rng: np.random.Generator,
+    max_points: int = 512,
+    iterations: int = 10
+) -> tuple:
+    """
+    Split one person's photos into k groups around real photos (Voronoi iteration).
+    
+    Returns:
+        (k medoid indices into vectors, group of every vector)
+    """
+    sample = np.arange(vectors.shape[0])
+    if sample.size > max_points:
+        sample = np.sort(rng.choice(sample.size, max_points, replace=False))
+    dists = pairwise_distances(vectors[sample], vectors[sample], metric)
+    
+    # Most central photo first, then repeatedly the photo farthest from the chosen ones
+    medoids = [int(np.argmin(dists.sum(axis=1)))]
+    while len(medoids) < k:
+        medoids.append(int(np.argmax(dists[:, medoids].min(axis=1))))
+    medoids = np.array(medoids)
+    
+    for _ in range(iterations):
+        groups = np.argmin(dists[:, medoids], axis=1)
+        updated = medoids.copy()
+        for group in range(k):
+            members = np.flatnonzero(groups == group)
+            if members.size:
+                updated[group] = members[np.argmin(dists[np.ix_(members, members)].sum(axis=0))]
+        if np.array_equal(updated, medoids):
+            break
+        medoids = updated
+    
+    medoids = sample[medoids]
+    groups = np.argmin(pairwise_distances(vectors, vectors[medoids], metric), axis=1)
+    return medoids, groups
+
+
+def _consistency_weights(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """Photo weights exp(-d / median d) from the distance d to the group mean (outliers tend to 0)."""
+    mean = vectors.mean(axis=0, keepdims=True)
+    if metric == METRIC_COSINE:
+        mean = _l2_normalize(mean)
+    dists = pairwise_distances(vectors, mean.astype(np.float32), metric)[:, 0]
+    scale = max(float(np.median(dists)), 1e-6)
+    return np.exp(-dists / scale)
+
+
+def _fill_candidates(
+    gallery: FaceGallery,
+    probe: np.ndarray,
+    rows: np.ndarray,
+    indices: np.ndarray,
+    distances: np.ndarray
+) -> None:
+    """Write the top-k of ``rows`` by exact distance into one probe's (k,) result slots."""
+    if rows.size == 0:
+        return
+    
+    k = indices.shape[0]
+    dists = gallery.row_distances(probe, rows)
+    best = top_k(dists[None, :], k)[0]
+    indices[:best.size] = rows[best]
+    distances[:best.size] = dists[best]
+    if best.size < k:
+        # Fewer rows than k searched: repeat the last candidate
+        indices[best.size:] = indices[best.size - 1]
+        distances[best.size:] = distances[best.size - 1]
+
+
+def _assign(points: np.ndarray, centroids: np.ndarray, metric: str, chunk: int = 8192) -> np.ndarray:
+    """Nearest centroid of every point (chunked to bound memory)."""
+    labels = np.empty(points.shape[0], dtype=np.int32)
+    for start in range(0, points.shape[0], chunk):
+        block = points[start:start + chunk]
+        labels[start:start + chunk] = np.argmin(pairwise_distances(block, centroids, metric), axis=1)
+    return labels
+
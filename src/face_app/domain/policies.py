@@ -2,6 +2,7 @@
 from typing import List
 import numpy as np
 from .entities import FaceMatch
+from .gallery import GallerySearchResult
 
 
 class MatchPolicy:
@@ -56,3 +57,38 @@ class MatchPolicy:
                 is_known=False,
                 distance=min_distance
             )
+    
+    def match_batch(self, search_result: GallerySearchResult) -> List[FaceMatch]:
+        """
+        Match every probe of a frame from a batched gallery search.
+        
+        Args:
+            search_result: Top-k candidates per probe (ascending distance)
+            
+        Returns:
+            One FaceMatch per probe, in probe order
+        """
+        matches = []
+        
+        for i in range(len(search_result)):
+            if search_result.indices.shape[1] == 0:
+                matches.append(FaceMatch(name="Unknown", is_known=False, distance=1.0))
+                continue
+            
+            # Candidates are sorted, the first one is the best match
+            min_distance = float(search_result.distances[i, 0])
+            
+            if min_distance < self.tolerance:
+                matches.append(FaceMatch(
+                    name=search_result.label_names[search_result.labels[i, 0]],
+                    is_known=True,
+                    distance=min_distance
+                ))
+            else:
+                matches.append(FaceMatch(
+                    name="Stranger",
+                    is_known=False,
+                    distance=min_distance
+                ))
+        
+        return matches
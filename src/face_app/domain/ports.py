@@ -1,27 +1,95 @@
 """Domain ports - Interfaces for external dependencies."""
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
-from .entities import BoundingBox
+from .entities import BoundingBox, DetectedFace
+from .regions import box_iou, merge_boxes
 
 
 class FaceEnginePort(ABC):
     """Interface for face detection and encoding engine."""
     
+    # Distance metric used by the gallery for this engine's embeddings
+    distance_metric: str = "euclidean"
+    
+    # True when detection already yields embeddings (encode_faces would re-detect)
+    embeds_on_detect: bool = False
+    
     @abstractmethod
     def detect_faces(self, rgb_frame: np.ndarray) -> List[BoundingBox]:
         """Detect faces in an RGB frame and return bounding boxes."""
         pass
     
     @abstractmethod
-    def encode_faces(self, rgb_frame: np.ndarray, boxes: List[BoundingBox]) -> List[np.ndarray]:
-        """Generate face encodings for detected faces."""
+    def encode_faces(self, rgb_frame: np.ndarray, boxes: List[BoundingBox]) -> List[Optional[np.ndarray]]:
+        """Generate face encodings aligned with ``boxes`` (None where an engine finds no face in a box)."""
         pass
     
     @abstractmethod
     def compute_distances(self, known_encodings: List[np.ndarray], probe_encoding: np.ndarray) -> List[float]:
         """Compute distances between known encodings and a probe encoding."""
         pass
+    
+    def analyze_faces(self, rgb_frame: np.ndarray) -> List[DetectedFace]:
+        """
+        Detect and encode faces in a single pass.
+        
+        Default implementation falls back to detect_faces + encode_faces.
+        Engines that produce boxes and embeddings together should override it.
+        
+        Returns:
+            List of DetectedFace, each encoding aligned with its own box
+        """
+        boxes = self.detect_faces(rgb_frame)
+        if not boxes:
+            return []
+        
+        encodings = self.encode_faces(rgb_frame, boxes)
+        return [
+            DetectedFace(box=box, encoding=encoding)
+            for box, encoding in zip(boxes, encodings)
+            if encoding is not None
+        ]
+    
+    def analyze_regions(self, rgb_frame: np.ndarray, regions: List[BoundingBox]) -> List[DetectedFace]:
+        """
+        Detect and encode faces only inside the given regions.
+        
+        Each region is cropped from the frame at its own resolution (no
+        downscaling), so small distant faces keep their pixels. Overlapping
+        regions are merged first and duplicate detections are dropped.
+        
+        Args:
+            rgb_frame: Full-resolution RGB image
+            regions: Candidate regions in frame pixels
+        
+        Returns:
+            List of DetectedFace with boxes in frame pixels
+        """
+        faces: List[DetectedFace] = []
+        
+        for region in merge_boxes(regions):
+            crop = rgb_frame[region.top:region.bottom, region.left:region.right]
+            if crop.shape[0] < 2 or crop.shape[1] < 2:
+                continue
+            
+            for detected in self.analyze_faces(np.ascontiguousarray(crop)):
+                box = detected.box
+                detected.box = BoundingBox(
+                    top=box.top + region.top,
+                    right=box.right + region.left,
+                    bottom=box.bottom + region.top,
+                    left=box.left + region.left
+                )
+                
+                # A face cut by a region border can show up in two crops
+                duplicate = next((f for f in faces if box_iou(f.box, detected.box) > 0.5), None)
+                if duplicate is None:
+                    faces.append(detected)
+                elif detected.det_score > duplicate.det_score:
+                    faces[faces.index(duplicate)] = detected
+        
+        return faces
 
 
 class KnownFaceRepoPort(ABC):
@@ -40,14 +108,25 @@ class RecognitionRepoPort(ABC):
     """Interface for persisting recognition events."""
     
     @abstractmethod
-    def insert_event(self, name: str, time: str) -> None:
-        """Insert a recognition event (name + time)."""
+    def insert_event(
+        self,
+        name: str,
+        time: str,
+        camera_id: Optional[str] = None,
+        distance: Optional[float] = None,
+        track_id: Optional[int] = None
+    ) -> None:
+        """Insert a recognition event (name + time; camera, match distance and track when known)."""
         pass
     
     @abstractmethod
     def get_last_event_time(self, name: str) -> str | None:
         """Get the last time this person was recognized (for cooldown)."""
         pass
+    
+    def close(self) -> None:
+        """Write pending events and release resources (no-op by default)."""
+        pass
 
 
 class CameraPort(ABC):
@@ -67,3 +146,50 @@ class CameraPort(ABC):
     def is_opened(self) -> bool:
         """Check if camera is opened."""
         pass
+
+
+class MetricsPort(ABC):
+    """
+    Interface for runtime metrics (counters, gauges, histograms).
+    
+    Names are short ("stage_seconds"); the implementation adds its namespace.
+    Label values are strings. Callers guard expensive work (timing,
+    label formatting) with ``enabled`` so a disabled registry costs nothing.
+    """
+    
+    # False for the no-op implementation
+    enabled: bool = True
+    
+    @abstractmethod
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Add to a counter."""
+        pass
+    
+    @abstractmethod
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to a value."""
+        pass
+    
+    @abstractmethod
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one sample in a histogram."""
+        pass
+
+
+class NullMetrics(MetricsPort):
+    """Metrics disabled: every call is a no-op."""
+    
+    enabled = False
+    
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        pass
+    
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        pass
+    
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+
+# Shared default for components built without a metrics registry
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,70 @@
+"""Domain geometry helpers for region-of-interest detection."""
+from typing import List
+from .entities import BoundingBox
+
+
+def box_iou(a: BoundingBox, b: BoundingBox) -> float:
+    """Intersection over Union of two boxes."""
+    inter_w = min(a.right, b.right) - max(a.left, b.left)
+    inter_h = min(a.bottom, b.bottom) - max(a.top, b.top)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    
+    intersection = inter_w * inter_h
+    area_a = (a.right - a.left) * (a.bottom - a.top)
+    area_b = (b.right - b.left) * (b.bottom - b.top)
+    union = area_a + area_b - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def pad_box(box: BoundingBox, padding: float, width: int, height: int) -> BoundingBox:
+    """
+    Expand a box by ``padding`` of its size on every side, clipped to the frame.
+    
+    Args:
+        box: Box in frame pixels
+        padding: Fraction of the box width/height added on each side
+        width: Frame width
+        height: Frame height
+    """
+    pad_x = int((box.right - box.left) * padding)
+    pad_y = int((box.bottom - box.top) * padding)
+    return BoundingBox(
+        top=max(0, box.top - pad_y),
+        right=min(width, box.right + pad_x),
+        bottom=min(height, box.bottom + pad_y),
+        left=max(0, box.left - pad_x)
+    )
+
+
+def merge_boxes(boxes: List[BoundingBox]) -> List[BoundingBox]:
+    """
+    Merge overlapping boxes into their bounding union until none overlap.
+    
+    Overlapping regions would otherwise be searched (and detected) twice.
+    """
+    merged = list(boxes)
+    changed = True
+    
+    while changed:
+        changed = False
+        result: List[BoundingBox] = []
+        
+        for box in merged:
+            for i, other in enumerate(result):
+                if (box.left < other.right and other.left < box.right
+                        and box.top < other.bottom and other.top < box.bottom):
+                    result[i] = BoundingBox(
+                        top=min(box.top, other.top),
+                        right=max(box.right, other.right),
+                        bottom=max(box.bottom, other.bottom),
+                        left=min(box.left, other.left)
+                    )
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        
+        merged = result
+    
+    return merged
@@ -1,22 +1,32 @@
 """OpenCV camera adapter."""
-from typing import Tuple
+from typing import Optional, Tuple, Union
 import numpy as np
 import cv2
-from face_app.domain.ports import CameraPort
+from face_app.domain.ports import CameraPort, MetricsPort, NULL_METRICS
 from face_app.config.settings import CAMERA_INDEX
 
 
 class OpenCVCamera(CameraPort):
     """Adapter for OpenCV VideoCapture."""
     
-    def __init__(self, camera_index: int = CAMERA_INDEX):
+    def __init__(
+        self,
+        camera_index: Union[int, str] = CAMERA_INDEX,
+        metrics: Optional[MetricsPort] = None,
+        camera_id: Optional[str] = None
+    ):
         """
         Initialize camera.
         
         Args:
-            camera_index: Camera device index (0 = default)
+            camera_index: Camera device index (0 = default), video file or RTSP URL
+            metrics: Optional metrics registry (frames read / failed reads)
+            camera_id: Camera label in metrics (default: the index; set it for
+                URLs, which may carry credentials)
         """
         self.camera_index = camera_index
+        self.metrics = metrics or NULL_METRICS
+        self._metrics_camera = camera_id or str(camera_index)
         self.cap = cv2.VideoCapture(camera_index)
         
         if not self.cap.isOpened():
@@ -29,7 +39,11 @@ class OpenCVCamera(CameraPort):
         Returns:
             (success, frame_bgr)
         """
-        return self.cap.read()
+        ret, frame = self.cap.read()
+        if self.metrics.enabled:
+            name = "camera_frames_total" if ret else "camera_read_failures_total"
+            self.metrics.inc(name, camera=self._metrics_camera)
+        return ret, frame
     
     def release(self) -> None:
         """Release camera resources."""
@@ -0,0 +1,241 @@
+"""Replay camera adapters - recorded video or image folders as a camera."""
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import numpy as np
+import cv2
+from face_app.domain.ports import CameraPort, MetricsPort, NULL_METRICS
+
+
+REPLAY_FAST = "fast"  # Every frame, as fast as the consumer reads
+REPLAY_REALTIME = "realtime"  # Paced at the recorded FPS; late frames are skipped like a live camera
+REPLAY_MODES = (REPLAY_FAST, REPLAY_REALTIME)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class _ReplayCamera(CameraPort):
+    """Pacing and looping shared by the replay adapters."""
+    
+    def __init__(self, fps: float, mode: str, loop: bool, metrics: Optional[MetricsPort] = None, label: str = "replay"):
+        """
+        Args:
+            fps: Playback rate used by the realtime mode
+            mode: REPLAY_FAST or REPLAY_REALTIME
+            loop: Start over at the end instead of reporting end of stream
+            metrics: Optional metrics registry (frames read / skipped)
+            label: Camera label of the metrics
+        """
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode '{mode}', use one of {REPLAY_MODES}")
+        
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.mode = mode
+        self.loop = loop
+        self.metrics = metrics or NULL_METRICS
+        self._metrics_camera = label
+        
+        self.frame_index = 0  # Next frame of the recording
+        self.frames_read = 0
+        self.frames_skipped = 0  # Realtime mode: frames a slow consumer missed
+        self._started_at: Optional[float] = None
+        self._played = 0  # Frames the realtime clock has moved past
+        self._ended = False
+    
+    def read(self) -> Tuple[bool, np.ndarray]:
+        """
+        Read the next frame (realtime mode sleeps until it is due).
+        
+        Returns:
+            (success, frame_bgr) - (False, None) at the end of a non-looping recording
+        """
+        if self._ended:
+            return False, None
+        
+        if self.mode == REPLAY_REALTIME:
+            self._pace()
+        
+        frame = self._read_next()
+        if frame is None and self.loop and self.frame_index > 0:
+            self._rewind()
+            self.frame_index = 0
+            frame = self._read_next()
+        
+        if frame is None:
+            self._ended = True
+            return False, None
+        
+        self.frame_index += 1
+        self.frames_read += 1
+        self.metrics.inc("camera_frames_total", camera=self._metrics_camera)
+        return True, frame
+    
+    def is_opened(self) -> bool:
+        """Check if frames remain."""
+        return not self._ended
+    
+    def _pace(self) -> None:
+        """Sleep until the next frame is due, or skip frames the consumer was too slow for."""
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now
+            self._played = 1
+            return
+        
+        due = self._started_at + self._played / self.fps
+        if due > now:
+            time.sleep(due - now)
+        else:
+            # A live camera would have moved on: drop the frames that are already stale
+            behind = int((now - due) * self.fps)
+            for _ in range(behind):
+                if not self._skip_next():
+                    break
+                self.frame_index += 1
+                self.frames_skipped += 1
+                self.metrics.inc("camera_frames_dropped_total", camera=self._metrics_camera)
+            self._played += behind
+        self._played += 1
+    
+    @abstractmethod
+    def _read_next(self) -> Optional[np.ndarray]:
+        """Decode the next frame (None at the end)."""
+        pass
+    
+    @abstractmethod
+    def _skip_next(self) -> bool:
+        """Move past the next frame without decoding it (False at the end)."""
+        pass
+    
+    @abstractmethod
+    def _rewind(self) -> None:
+        """Go back to the first frame."""
+        pass
+
+
+class VideoFileCamera(_ReplayCamera):
+    """Replay a video file (MP4, AVI, ...) through the CameraPort interface."""
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = REPLAY_FAST,
+        loop: bool = False,
+        fps: Optional[float] = None,
+        metrics: Optional[MetricsPort] = None
+    ):
+        """
+        Initialize replay.
+        
+        Args:
+            path: Video file
+            mode: REPLAY_FAST or REPLAY_REALTIME
+            loop: Restart at the end of the file
+            fps: Override the recorded FPS for realtime pacing
+            metrics: Optional metrics registry
+        """
+        self.path = Path(path)
+        self.cap = cv2.VideoCapture(str(self.path))
+        
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Cannot open video {self.path}")
+        
+        super().__init__(fps or self.cap.get(cv2.CAP_PROP_FPS), mode, loop, metrics, f"replay:{self.path.name}")
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        print(f"✅ Replaying {self.path.name} ({self.frame_count} frames @ {self.fps:.1f} FPS, {mode})")
+    
+    def _read_next(self) -> Optional[np.ndarray]:
+        ret, frame = self.cap.read()
+        return frame if ret else None
+    
+    def _skip_next(self) -> bool:
+        # grab() demuxes without decoding
+        return self.cap.grab()
+    
+    def _rewind(self) -> None:
+        if not self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            self.cap.release()
+            self.cap = cv2.VideoCapture(str(self.path))
+    
+    def release(self) -> None:
+        """Release the video file."""
+        self._ended = True
+        if self.cap:
+            self.cap.release()
+    
+    def __del__(self):
+        """Ensure the file is released on deletion."""
+        if hasattr(self, "cap"):
+            self.release()
+
+
+class ImageDirectoryCamera(_ReplayCamera):
+    """Replay a folder of frames (sorted by file name) through the CameraPort interface."""
+    
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        mode: str = REPLAY_FAST,
+        loop: bool = False,
+        fps: float = 30.0,
+        metrics: Optional[MetricsPort] = None
+    ):
+        """
+        Initialize replay.
+        
+        Args:
+            directory: Folder of .jpg/.png/.bmp frames (e.g. frame_00001.jpg)
+            mode: REPLAY_FAST or REPLAY_REALTIME
+            loop: Restart after the last image
+            fps: Playback rate for realtime pacing
+            metrics: Optional metrics registry
+        """
+        self.directory = Path(directory)
+        self.paths: List[Path] = sorted(
+            p for p in self.directory.iterdir()
+            if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+        ) if self.directory.is_dir() else []
+        
+        if not self.paths:
+            raise RuntimeError(f"No frames found in {self.directory}")
+        
+        super().__init__(fps, mode, loop, metrics, f"replay:{self.directory.name}")
+        self._position = 0
+        print(f"✅ Replaying {self.directory} ({len(self.paths)} frames @ {self.fps:.1f} FPS, {mode})")
+    
+    def _read_next(self) -> Optional[np.ndarray]:
+        while self._position < len(self.paths):
+            path = self.paths[self._position]
+            self._position += 1
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                return frame
+            print(f"⚠️  Unreadable frame skipped: {path.name}")
+        return None
+    
+    def _skip_next(self) -> bool:
+        if self._position >= len(self.paths):
+            return False
+        self._position += 1
+        return True
+    
+    def _rewind(self) -> None:
+        self._position = 0
+    
+    def release(self) -> None:
+        """Nothing to release (files are read one at a time)."""
+        self._ended = True
+
+
+def open_replay_camera(source: Union[str, Path], **kwargs) -> _ReplayCamera:
+    """
+    Open a video file or an image folder as a camera.
+    
+    Args:
+        source: Video path or directory of frames
+        **kwargs: mode, loop, fps, metrics
+    """
+    if Path(source).is_dir():
+        return ImageDirectoryCamera(source, **kwargs)
+    return VideoFileCamera(source, **kwargs)
@@ -1,79 +1,169 @@
-"""Multi-threaded camera capture and recognition for better performance."""
+"""Multi-threaded camera capture for better performance."""
+import time
 import cv2
 import numpy as np
-from threading import Thread, Lock
-from queue import Queue
-from typing import Optional
-from face_app.domain.ports import CameraPort
+from dataclasses import dataclass
+from threading import Thread, Condition
+from typing import List, Optional, Union
+from face_app.domain.ports import CameraPort, MetricsPort, NULL_METRICS
+
+
+@dataclass
+class CapturedFrame:
+    """A frame from the capture ring plus its capture metadata."""
+    frame: np.ndarray
+    frame_id: int  # Monotonic, starts at 1 (gaps = frames replaced before being read)
+    timestamp: float  # time.monotonic() when the capture finished
 
 
 class ThreadedCamera(CameraPort):
-    """Camera with threaded capture for better FPS."""
+    """
+    Camera with threaded capture for better FPS.
+    
+    The capture thread decodes straight into a ring of preallocated frames
+    (``cap.read(image=buf)``), so no array is allocated per frame. ``read``
+    always returns the newest frame and waits on a condition variable when
+    the consumer is ahead of the camera. A frame returned by ``read`` stays
+    valid until the next ``read`` call: the capture thread never writes into
+    the slot the reader holds, nor into the newest one.
+    """
+    
+    # Frames are recycled: copy a frame to keep it past the next read()
+    reuses_buffers = True
     
-    def __init__(self, camera_index: int = 0, buffer_size: int = 2):
+    def __init__(
+        self,
+        camera_index: Union[int, str] = 0,
+        buffer_size: int = 3,
+        read_timeout: float = 1.0,
+        max_backoff: float = 0.5,
+        metrics: Optional[MetricsPort] = None,
+        camera_id: Optional[str] = None
+    ):
         """
         Initialize threaded camera.
         
         Args:
-            camera_index: Camera device index
-            buffer_size: Max frames in buffer (lower = less latency)
+            camera_index: Camera device index, video file or RTSP URL
+            buffer_size: Preallocated frames in the ring (min 3: writing, newest, held by reader)
+            read_timeout: Seconds read() waits for a new frame before failing
+            max_backoff: Longest pause between retries after failed captures
+            metrics: Optional metrics registry (frames captured, dropped, failed reads)
+            camera_id: Camera label in metrics (default: the index)
         """
         self.camera_index = camera_index
+        self.metrics = metrics or NULL_METRICS
+        self._metrics_camera = camera_id or str(camera_index)
         self.cap = cv2.VideoCapture(camera_index)
         
         if not self.cap.isOpened():
             raise RuntimeError(f"Cannot open camera {camera_index}")
         
-        # Thread-safe frame storage
-        self.frame_queue = Queue(maxsize=buffer_size)
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        
+        # Ring state (guarded by the condition)
+        self._slots: List[Optional[np.ndarray]] = [None] * max(3, buffer_size)
+        self._write_slot = -1
+        self._latest_slot = -1
+        self._held_slot = -1
+        self._frame_id = 0
+        self._timestamp = 0.0
+        self._returned_id = 0
+        self._cond = Condition()
+        self.dropped = 0  # Frames replaced before anyone read them
         self.stopped = False
-        self.lock = Lock()
         
         # Start capture thread
         self.thread = Thread(target=self._capture_loop, daemon=True)
         self.thread.start()
         
-        print(f"✅ Threaded camera initialized (index: {camera_index})")
+        print(f"✅ Threaded camera initialized (index: {camera_index}, {len(self._slots)} frame buffers)")
     
     def _capture_loop(self):
         """Capture frames in background thread."""
+        backoff = 0.0
+        
         while not self.stopped:
-            ret, frame = self.cap.read()
+            with self._cond:
+                slot = self._next_free_slot()
+            
+            # Decode into the preallocated slot (OpenCV reallocates only if the size changed)
+            ret, frame = self.cap.read(self._slots[slot])
             
-            if not ret:
+            if not ret or frame is None:
+                if not self.cap.isOpened():
+                    break
+                self.metrics.inc("camera_read_failures_total", camera=self._metrics_camera)
+                # Camera hiccup or end of stream: back off instead of spinning
+                backoff = min(max(backoff * 2, 0.01), self.max_backoff)
+                time.sleep(backoff)
                 continue
             
-            # Add to queue (drop old if full)
-            if self.frame_queue.full():
-                try:
-                    self.frame_queue.get_nowait()
-                except:
-                    pass
+            backoff = 0.0
+            with self._cond:
+                self._slots[slot] = frame
+                self._latest_slot = slot
+                self._frame_id += 1
+                self._timestamp = time.monotonic()
+                self._cond.notify_all()
+            self.metrics.inc("camera_frames_total", camera=self._metrics_camera)
+        
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+    
+    def _next_free_slot(self) -> int:
+        """Next ring slot that is neither the newest frame nor held by the reader."""
+        slot = self._write_slot
+        while True:
+            slot = (slot + 1) % len(self._slots)
+            if slot != self._latest_slot and slot != self._held_slot:
+                self._write_slot = slot
+                return slot
+    
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        """
+        Wait for a frame newer than the last one returned.
+        
+        Args:
+            timeout: Seconds to wait (default: read_timeout)
+        
+        Returns:
+            CapturedFrame, or None if no new frame arrived in time or the camera stopped
+        """
+        timeout = self.read_timeout if timeout is None else timeout
+        
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame_id > self._returned_id or self.stopped, timeout)
+            if self._frame_id <= self._returned_id:
+                return None
             
-            try:
-                self.frame_queue.put(frame, block=False)
-            except:
-                pass
+            missed = self._frame_id - self._returned_id - 1
+            if missed:
+                self.dropped += missed
+                self.metrics.inc("camera_frames_dropped_total", missed, camera=self._metrics_camera)
+            self._returned_id = self._frame_id
+            self._held_slot = self._latest_slot
+            return CapturedFrame(self._slots[self._latest_slot], self._frame_id, self._timestamp)
     
     def read(self) -> tuple:
         """
-        Read latest frame from queue.
+        Read the newest frame (waits for the capture thread if needed).
         
         Returns:
-            (success, frame)
+            (success, frame) - frame is valid until the next read()
         """
-        if self.frame_queue.empty():
-            return False, None
-        
-        try:
-            frame = self.frame_queue.get(timeout=1.0)
-            return True, frame
-        except:
+        captured = self.read_frame()
+        if captured is None:
             return False, None
+        return True, captured.frame
     
     def release(self):
         """Stop capture thread and release camera."""
-        self.stopped = True
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
         if self.thread.is_alive():
             self.thread.join(timeout=2.0)
         if self.cap:
@@ -86,101 +176,3 @@ class ThreadedCamera(CameraPort):
     def __del__(self):
         """Cleanup on deletion."""
         self.release()
-
-
-class AsyncRecognitionPipeline:
-    """Asynchronous recognition pipeline with separate threads for capture and processing."""
-    
-    def __init__(self, recognize_usecase, queue_size: int = 5):
-        """
-        Initialize async pipeline.
-        
-        Args:
-            recognize_usecase: Recognition use case
-            queue_size: Size of processing queue
-        """
-        self.recognize_usecase = recognize_usecase
-        self.frame_queue = Queue(maxsize=queue_size)
-        self.result_queue = Queue(maxsize=queue_size)
-        
-        self.processing = False
-        self.lock = Lock()
-        
-        # Processing thread
-        self.process_thread = None
-    
-    def start(self):
-        """Start processing thread."""
-        if not self.processing:
-            self.processing = True
-            self.process_thread = Thread(target=self._process_loop, daemon=True)
-            self.process_thread.start()
-            print("✅ Async recognition pipeline started")
-    
-    def stop(self):
-        """Stop processing thread."""
-        self.processing = False
-        if self.process_thread and self.process_thread.is_alive():
-            self.process_thread.join(timeout=2.0)
-        print("👋 Async recognition pipeline stopped")
-    
-    def submit_frame(self, frame: np.ndarray) -> bool:
-        """
-        Submit frame for processing.
-        
-        Args:
-            frame: BGR frame
-            
-        Returns:
-            True if submitted successfully
-        """
-        if self.frame_queue.full():
-            # Drop oldest frame
-            try:
-                self.frame_queue.get_nowait()
-            except:
-                pass
-        
-        try:
-            self.frame_queue.put(frame, block=False)
-            return True
-        except:
-            return False
-    
-    def get_result(self, timeout: float = 0.01):
-        """
-        Get latest recognition result.
-        
-        Args:
-            timeout: Timeout in seconds
-            
-        Returns:
-            Recognition result or None
-        """
-        try:
-            return self.result_queue.get(timeout=timeout)
-        except:
-            return None
-    
-    def _process_loop(self):
-        """Process frames in background thread."""
-        while self.processing:
-            try:
-                frame = self.frame_queue.get(timeout=0.1)
-            except:
-                continue
-            
-            # Run recognition
-            result = self.recognize_usecase.execute(frame)
-            
-            # Store result
-            if self.result_queue.full():
-                try:
-                    self.result_queue.get_nowait()
-                except:
-                    pass
-            
-            try:
-                self.result_queue.put(result, block=False)
-            except:
-                pass
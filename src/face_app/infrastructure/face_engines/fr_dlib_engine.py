@@ -1,23 +1,48 @@
 """Face Recognition Engine adapter using face_recognition (dlib)."""
 from typing import List
 import numpy as np
+import dlib
 import face_recognition
+import face_recognition_models
 from face_app.domain.ports import FaceEnginePort
 from face_app.domain.entities import BoundingBox
-from face_app.config.settings import MODEL
+from face_app.config.settings import MODEL, DLIB_LANDMARK_MODEL, DLIB_NUM_JITTERS, DLIB_BATCH_ENCODING
 
 
 class FRDlibEngine(FaceEnginePort):
     """Adapter for face_recognition library (dlib-based)."""
     
-    def __init__(self, model: str = MODEL):
+    def __init__(
+        self,
+        model: str = MODEL,
+        landmark_model: str = DLIB_LANDMARK_MODEL,
+        num_jitters: int = DLIB_NUM_JITTERS,
+        batched: bool = DLIB_BATCH_ENCODING
+    ):
         """
         Initialize face recognition engine.
         
         Args:
             model: "hog" (faster, CPU) or "cnn" (accurate, GPU needed)
+            landmark_model: "small" (5-point, faster) or "large" (68-point)
+            num_jitters: Re-sample each face N times when encoding (higher = slower, more stable)
+            batched: Drive dlib directly and encode all faces of a frame in one call
         """
         self.model = model
+        self.landmark_model = landmark_model
+        self.num_jitters = num_jitters
+        self.batched = batched
+        
+        if batched:
+            if landmark_model == "small":
+                predictor_path = face_recognition_models.pose_predictor_five_point_model_location()
+            else:
+                predictor_path = face_recognition_models.pose_predictor_model_location()
+            
+            self.shape_predictor = dlib.shape_predictor(predictor_path)
+            self.face_encoder = dlib.face_recognition_model_v1(
+                face_recognition_models.face_recognition_model_location()
+            )
     
     def detect_faces(self, rgb_frame: np.ndarray) -> List[BoundingBox]:
         """
@@ -48,13 +73,30 @@ class FRDlibEngine(FaceEnginePort):
         Returns:
             List of 128-dimensional face encodings
         """
-        # Convert BoundingBox to face_recognition format: [(top, right, bottom, left), ...]
-        locations = [(box.top, box.right, box.bottom, box.left) for box in boxes]
+        if not boxes:
+            return []
+        
+        if not self.batched:
+            # Convert BoundingBox to face_recognition format: [(top, right, bottom, left), ...]
+            locations = [(box.top, box.right, box.bottom, box.left) for box in boxes]
+            return face_recognition.face_encodings(
+                rgb_frame,
+                known_face_locations=locations,
+                num_jitters=self.num_jitters,
+                model=self.landmark_model
+            )
+        
+        # Landmarks for every face, then one descriptor call for the whole frame
+        shapes = dlib.full_object_detections()
+        for box in boxes:
+            shapes.append(self.shape_predictor(
+                rgb_frame,
+                dlib.rectangle(box.left, box.top, box.right, box.bottom)
+            ))
         
-        # Generate encodings
-        encodings = face_recognition.face_encodings(rgb_frame, known_face_locations=locations)
+        descriptors = self.face_encoder.compute_face_descriptor(rgb_frame, shapes, self.num_jitters)
         
-        return encodings
+        return list(np.array(descriptors, dtype=np.float64))
     
     def compute_distances(self, known_encodings: List[np.ndarray], probe_encoding: np.ndarray) -> List[float]:
         """
@@ -1,15 +1,23 @@
 """InsightFace engine adapter - More accurate and faster than dlib."""
-from typing import List
+from typing import List, Optional
 import numpy as np
 import cv2
 from insightface.app import FaceAnalysis
 from face_app.domain.ports import FaceEnginePort
-from face_app.domain.entities import BoundingBox
+from face_app.domain.entities import BoundingBox, DetectedFace
+from face_app.domain.regions import box_iou
+
+
+# Least IoU between a requested box and an InsightFace detection to use its embedding
+ENCODE_MIN_IOU = 0.3
 
 
 class InsightFaceEngine(FaceEnginePort):
     """Adapter for InsightFace library - high accuracy face recognition."""
     
+    distance_metric = "cosine"
+    embeds_on_detect = True
+    
     def __init__(self, model_name: str = 'buffalo_l', ctx_id: int = -1):
         """
         Initialize InsightFace engine.
@@ -33,47 +41,76 @@ class InsightFaceEngine(FaceEnginePort):
         Returns:
             List of BoundingBox objects
         """
-        # InsightFace expects BGR
-        bgr_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+        return [face.box for face in self.analyze_faces(rgb_frame)]
+    
+    def encode_faces(self, rgb_frame: np.ndarray, boxes: List[BoundingBox]) -> List[Optional[np.ndarray]]:
+        """
+        Generate face encodings for detected faces.
         
-        # Get faces
-        faces = self.app.get(bgr_frame)
+        InsightFace re-detects the frame; requested boxes and detections are
+        paired one-to-one, best overlap first, and only when they overlap by at
+        least ENCODE_MIN_IOU. A box without such a detection (e.g. a drifted
+        track) gets None rather than a neighbouring face's embedding.
         
-        # Convert to BoundingBox
-        boxes = []
-        for face in faces:
-            bbox = face.bbox.astype(int)
-            # bbox format: [x1, y1, x2, y2]
-            boxes.append(BoundingBox(
-                top=bbox[1],
-                right=bbox[2],
-                bottom=bbox[3],
-                left=bbox[0]
-            ))
+        Args:
+            rgb_frame: RGB image as numpy array
+            boxes: List of BoundingBox for detected faces
+            
+        Returns:
+            512-dimensional embedding (InsightFace standard) or None, aligned with ``boxes``
+        """
+        encodings: List[Optional[np.ndarray]] = [None] * len(boxes)
+        if not boxes:
+            return encodings
+        
+        detected = self.analyze_faces(rgb_frame)
+        pairs = sorted(
+            ((box_iou(box, face.box), box_index, face_index)
+             for box_index, box in enumerate(boxes)
+             for face_index, face in enumerate(detected)),
+            reverse=True
+        )
+        
+        used_faces = set()
+        for iou, box_index, face_index in pairs:
+            if iou < ENCODE_MIN_IOU:
+                break
+            if encodings[box_index] is not None or face_index in used_faces:
+                continue
+            encodings[box_index] = detected[face_index].encoding
+            used_faces.add(face_index)
         
-        return boxes
+        return encodings
     
-    def encode_faces(self, rgb_frame: np.ndarray, boxes: List[BoundingBox]) -> List[np.ndarray]:
+    def analyze_faces(self, rgb_frame: np.ndarray) -> List[DetectedFace]:
         """
-        Generate face encodings for detected faces.
+        Detect and embed faces with a single FaceAnalysis.get() call.
         
         Args:
             rgb_frame: RGB image as numpy array
-            boxes: List of BoundingBox for detected faces
             
         Returns:
-            List of 512-dimensional face embeddings (InsightFace standard)
+            List of DetectedFace (box, embedding and det_score come from the same face)
         """
         # InsightFace expects BGR
         bgr_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
         
-        # Get all faces with embeddings
-        faces = self.app.get(bgr_frame)
-        
-        # Extract embeddings (already computed by InsightFace)
-        encodings = [face.embedding for face in faces[:len(boxes)]]
+        detected = []
+        for face in self.app.get(bgr_frame):
+            # bbox format: [x1, y1, x2, y2]
+            bbox = face.bbox.astype(int)
+            detected.append(DetectedFace(
+                box=BoundingBox(
+                    top=int(bbox[1]),
+                    right=int(bbox[2]),
+                    bottom=int(bbox[3]),
+                    left=int(bbox[0])
+                ),
+                encoding=face.embedding,
+                det_score=float(face.det_score)
+            ))
         
-        return encodings
+        return detected
     
     def compute_distances(self, known_encodings: List[np.ndarray], probe_encoding: np.ndarray) -> List[float]:
         """
@@ -90,19 +127,13 @@ class InsightFaceEngine(FaceEnginePort):
         if not known_encodings:
             return []
         
-        # Compute cosine similarity
-        similarities = []
-        for known_enc in known_encodings:
-            # Cosine similarity = dot(A, B) / (norm(A) * norm(B))
-            similarity = np.dot(known_enc, probe_encoding) / (
-                np.linalg.norm(known_enc) * np.linalg.norm(probe_encoding)
-            )
-            similarities.append(similarity)
+        # Cosine distance for all known encodings in one matrix-vector product
+        known = np.asarray(known_encodings, dtype=np.float32)
+        probe = np.asarray(probe_encoding, dtype=np.float32)
+        similarities = known @ probe / (np.linalg.norm(known, axis=1) * np.linalg.norm(probe))
         
         # Convert to distance (lower is better)
-        distances = [1 - sim for sim in similarities]
-        
-        return distances
+        return (1 - similarities).tolist()
     
     def get_face_quality(self, rgb_frame: np.ndarray) -> List[dict]:
         """
@@ -0,0 +1,116 @@
+"""Pool of face engines shared by many recognition threads."""
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+import numpy as np
+from face_app.domain.ports import FaceEnginePort
+from face_app.domain.entities import BoundingBox, DetectedFace
+
+
+class _Waiter:
+    """A thread queued for an engine."""
+    __slots__ = ("event", "engine")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.engine = None
+
+
+class PooledFaceEngine(FaceEnginePort):
+    """
+    Share a fixed number of engine instances between any number of threads.
+    
+    Each call checks out one engine for its duration. When every engine is
+    busy, callers wait in strict FIFO order and a released engine is handed
+    directly to the longest waiter, so no camera can starve the others.
+    Memory is bounded by the pool size, not by the number of callers.
+    """
+    
+    def __init__(self, engines: List[FaceEnginePort]):
+        """
+        Initialize pool.
+        
+        Args:
+            engines: Engine instances of the same type (one model stack each)
+        """
+        if not engines:
+            raise ValueError("PooledFaceEngine needs at least one engine")
+        
+        self.engines = list(engines)
+        self.distance_metric = self.engines[0].distance_metric
+        self.embeds_on_detect = self.engines[0].embeds_on_detect
+        
+        self._lock = threading.Lock()
+        self._idle = deque(self.engines)
+        self._waiters = deque()
+    
+    @classmethod
+    def create(cls, engine_factory: Callable[[], FaceEnginePort], size: int) -> "PooledFaceEngine":
+        """
+        Build a pool of ``size`` engines.
+        
+        Args:
+            engine_factory: Callable creating one engine
+            size: Number of engines (model stacks kept in memory)
+        """
+        return cls([engine_factory() for _ in range(max(1, size))])
+    
+    @property
+    def size(self) -> int:
+        """Number of engines in the pool."""
+        return len(self.engines)
+    
+    @contextmanager
+    def checkout(self) -> Iterator[FaceEnginePort]:
+        """Borrow an engine for the duration of a ``with`` block."""
+        engine = self._acquire()
+        try:
+            yield engine
+        finally:
+            self._release(engine)
+    
+    def detect_faces(self, rgb_frame: np.ndarray) -> List[BoundingBox]:
+        """Detect faces on a borrowed engine."""
+        with self.checkout() as engine:
+            return engine.detect_faces(rgb_frame)
+    
+    def encode_faces(self, rgb_frame: np.ndarray, boxes: List[BoundingBox]) -> List[Optional[np.ndarray]]:
+        """Encode faces on a borrowed engine."""
+        with self.checkout() as engine:
+            return engine.encode_faces(rgb_frame, boxes)
+    
+    def compute_distances(self, known_encodings: List[np.ndarray], probe_encoding: np.ndarray) -> List[float]:
+        """Compute distances (pure math, no engine is borrowed)."""
+        return self.engines[0].compute_distances(known_encodings, probe_encoding)
+    
+    def analyze_faces(self, rgb_frame: np.ndarray) -> List[DetectedFace]:
+        """Detect + encode on a borrowed engine."""
+        with self.checkout() as engine:
+            return engine.analyze_faces(rgb_frame)
+    
+    def analyze_regions(self, rgb_frame: np.ndarray, regions: List[BoundingBox]) -> List[DetectedFace]:
+        """Detect + encode inside regions, one checkout for the whole frame."""
+        with self.checkout() as engine:
+            return engine.analyze_regions(rgb_frame, regions)
+    
+    def _acquire(self) -> FaceEnginePort:
+        """Take an idle engine, or queue behind earlier callers."""
+        with self._lock:
+            if self._idle and not self._waiters:
+                return self._idle.popleft()
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        
+        waiter.event.wait()
+        return waiter.engine
+    
+    def _release(self, engine: FaceEnginePort) -> None:
+        """Hand the engine to the longest waiter, or put it back."""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.engine = engine
+                waiter.event.set()
+            else:
+                self._idle.append(engine)
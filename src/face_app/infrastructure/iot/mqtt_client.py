@@ -1,6 +1,7 @@
 """MQTT client for IoT communication."""
 import paho.mqtt.client as mqtt
 from typing import Callable, Optional
+from face_app.domain.ports import MetricsPort, NULL_METRICS
 
 
 class MQTTClient:
@@ -11,7 +12,8 @@ class MQTTClient:
         broker: str = "broker.hivemq.com",
         port: int = 1883,
         client_id: str = "face_recognition_app",
-        keepalive: int = 60
+        keepalive: int = 60,
+        metrics: Optional[MetricsPort] = None
     ):
         """
         Initialize MQTT client.
@@ -21,10 +23,12 @@ class MQTTClient:
             port: MQTT broker port
             client_id: Client identifier
             keepalive: Keepalive interval in seconds
+            metrics: Optional metrics registry (connection state, reconnects, messages)
         """
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
+        self.metrics = metrics or NULL_METRICS
         
         # Create MQTT client
         self.client = mqtt.Client(client_id=client_id)
@@ -34,6 +38,7 @@ class MQTTClient:
         
         # Connection status
         self._connected = False
+        self._connections = 0  # Successful connects (paho reconnects on its own)
         
         # Setup callbacks
         self.client.on_connect = self._on_connect
@@ -44,7 +49,12 @@ class MQTTClient:
         """Callback when connected to broker."""
         if rc == 0:
             self._connected = True
+            self._connections += 1
             print(f"   ✅ MQTT connected successfully (rc={rc})")
+            self.metrics.inc("mqtt_connects_total")
+            if self._connections > 1:
+                self.metrics.inc("mqtt_reconnects_total")
+            self.metrics.set_gauge("mqtt_connected", 1)
             
             # Resubscribe to all topics
             for topic in self._topic_callbacks.keys():
@@ -57,13 +67,16 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc):
         """Callback when disconnected from broker."""
         self._connected = False
+        self.metrics.set_gauge("mqtt_connected", 0)
         if rc != 0:
             print(f"   ⚠️  Unexpected MQTT disconnect (rc={rc})")
+            self.metrics.inc("mqtt_disconnects_total")
     
     def _on_message(self, client, userdata, msg):
         """Callback when message received."""
         topic = msg.topic
         payload = msg.payload.decode('utf-8')
+        self.metrics.inc("mqtt_messages_total", topic=topic)
         
         # Call registered callback for this topic
         if topic in self._topic_callbacks:
@@ -0,0 +1,5 @@
+"""Runtime metrics - Prometheus-style registry and a /metrics HTTP endpoint."""
+from face_app.infrastructure.metrics.prometheus_registry import PrometheusMetrics, METRIC_DEFINITIONS
+from face_app.infrastructure.metrics.http_exporter import MetricsHTTPServer
+
+__all__ = ["PrometheusMetrics", "METRIC_DEFINITIONS", "MetricsHTTPServer"]
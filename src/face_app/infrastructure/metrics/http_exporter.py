@@ -0,0 +1,67 @@
+"""Minimal HTTP endpoint serving /metrics for runs without the FastAPI service."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from face_app.infrastructure.metrics.prometheus_registry import PrometheusMetrics
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsHTTPServer:
+    """Serve a PrometheusMetrics registry on a background thread (GET /metrics)."""
+    
+    def __init__(self, metrics: PrometheusMetrics, host: str = "0.0.0.0", port: int = 9108):
+        """
+        Initialize exporter.
+        
+        Args:
+            metrics: Registry to render on every scrape
+            host: Interface to bind
+            port: TCP port (0 = any free port, see ``port`` after start())
+        """
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Bind the port and serve in a daemon thread."""
+        if self._server is not None:
+            return
+        
+        metrics = self.metrics
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the console
+                pass
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        print(f"📈 Metrics at http://{self.host}:{self.port}/metrics")
+    
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2.0)
+        self._server = None
+        self._thread = None
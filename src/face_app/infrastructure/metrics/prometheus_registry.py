@@ -0,0 +1,196 @@
+"""In-process metrics registry rendered in the Prometheus text exposition format."""
+import bisect
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+from face_app.domain.ports import MetricsPort
+
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+# Seconds: 1 ms .. 10 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Faces in one frame
+FACE_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 20)
+# Gallery distance of the best match (dlib euclidean ~0.3-0.8, cosine 0-2)
+DISTANCE_BUCKETS = (0.1, 0.2, 0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.7, 0.8, 1.0, 1.5, 2.0)
+# Events committed in one transaction
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# name: (type, help, histogram buckets)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str, Optional[tuple]]] = {
+    "camera_frames_total": (COUNTER, "Frames read from the camera", None),
+    "camera_read_failures_total": (COUNTER, "Failed camera reads", None),
+    "camera_frames_dropped_total": (COUNTER, "Captured frames overwritten before anyone read them", None),
+    "frames_total": (COUNTER, "Frames through recognition by outcome (processed/skipped)", None),
+    "frames_dropped_total": (COUNTER, "Frames discarded by a full recognition queue", None),
+    "stage_seconds": (HISTOGRAM, "Service time of one recognition stage", LATENCY_BUCKETS),
+    "faces_per_frame": (HISTOGRAM, "Faces found in a processed frame", FACE_COUNT_BUCKETS),
+    "match_distance": (HISTOGRAM, "Gallery distance of each face's best match", DISTANCE_BUCKETS),
+    "recognitions_total": (COUNTER, "Recognized faces by result (known/stranger)", None),
+    "monitor_alerts_total": (COUNTER, "Detection monitors that reached their threshold", None),
+    "db_write_seconds": (HISTOGRAM, "Time to commit one batch of recognition events", LATENCY_BUCKETS),
+    "db_write_batch_size": (HISTOGRAM, "Recognition events committed in one transaction", BATCH_SIZE_BUCKETS),
+    "db_write_queue_depth": (GAUGE, "Recognition events waiting for the database writer", None),
+    "db_write_errors_total": (COUNTER, "Recognition events that could not be written", None),
+    "db_writes_dropped_total": (COUNTER, "Recognition events dropped by a full write queue", None),
+    "alert_send_seconds": (HISTOGRAM, "Time to deliver one alert", LATENCY_BUCKETS),
+    "alerts_sent_total": (COUNTER, "Alerts delivered by channel and outcome", None),
+    "mqtt_connected": (GAUGE, "1 while connected to the MQTT broker", None),
+    "mqtt_connects_total": (COUNTER, "Successful MQTT connections", None),
+    "mqtt_reconnects_total": (COUNTER, "MQTT connections after the first one", None),
+    "mqtt_disconnects_total": (COUNTER, "Unexpected MQTT disconnects", None),
+    "mqtt_messages_total": (COUNTER, "MQTT messages received by topic", None),
+    "http_requests_total": (COUNTER, "API requests by path and status", None),
+    "http_request_seconds": (HISTOGRAM, "API request latency", LATENCY_BUCKETS),
+}
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Bucket counts, sum and count of one label set."""
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class PrometheusMetrics(MetricsPort):
+    """
+    Thread-safe counters, gauges and histograms.
+    
+    Pure Python (no prometheus_client): a dict update under one lock per
+    call. Metrics listed in METRIC_DEFINITIONS get their help text and
+    buckets; any other name is registered on first use with the type
+    implied by the call.
+    """
+    
+    def __init__(self, namespace: str = "face_app"):
+        """
+        Initialize registry.
+        
+        Args:
+            namespace: Prefix of every exported metric name
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._types: Dict[str, str] = {}
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+    
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Add to a counter."""
+        key = self._key(labels)
+        with self._lock:
+            values = self._series(name, COUNTER)
+            values[key] = values.get(key, 0.0) + amount
+    
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to a value."""
+        key = self._key(labels)
+        with self._lock:
+            self._series(name, GAUGE)[key] = value
+    
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one sample in a histogram."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.get(name)
+            if series is None:
+                self._types.setdefault(name, HISTOGRAM)
+                series = self._histograms[name] = {}
+            histogram = series.get(key)
+            if histogram is None:
+                definition = METRIC_DEFINITIONS.get(name)
+                histogram = series[key] = _Histogram((definition and definition[2]) or LATENCY_BUCKETS)
+            histogram.observe(value)
+    
+    def get_value(self, name: str, **labels: str) -> float:
+        """Current value of a counter or gauge (0 if never set)."""
+        with self._lock:
+            return self._values.get(name, {}).get(self._key(labels), 0.0)
+    
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text format (version 0.0.4).
+        
+        Returns:
+            Exposition text, one HELP/TYPE block per metric
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._types):
+                kind = self._types[name]
+                full_name = f"{self.namespace}_{name}" if self.namespace else name
+                definition = METRIC_DEFINITIONS.get(name)
+                if definition:
+                    lines.append(f"# HELP {full_name} {definition[1]}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                
+                if kind == HISTOGRAM:
+                    for key, histogram in sorted(self._histograms.get(name, {}).items()):
+                        cumulative = 0
+                        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                            cumulative += count
+                            le = "+Inf" if bound == float("inf") else _format_value(bound)
+                            lines.append(f"{full_name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                        lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                        lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+                else:
+                    for key, value in sorted(self._values.get(name, {}).items()):
+                        lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def _series(self, name: str, kind: str) -> Dict[LabelKey, float]:
+        """Values of a counter/gauge, registering it on first use (lock held)."""
+        series = self._values.get(name)
+        if series is None:
+            definition = METRIC_DEFINITIONS.get(name)
+            self._types.setdefault(name, definition[0] if definition else kind)
+            series = self._values[name] = {}
+        return series
+    
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        """Order-independent identity of a label set."""
+        if not labels:
+            return ()
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    """{a="1",b="2"} (empty string without labels)."""
+    if not key:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in key)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value (backslash, quote, newline)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Integers without a trailing .0, non-finite values as +Inf/-Inf/NaN, everything else as repr."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Callable
 from dataclasses import dataclass
+from face_app.domain.ports import MetricsPort, NULL_METRICS
 
 
 @dataclass
@@ -20,7 +21,8 @@ class PersonDetectionMonitor:
         time_window_seconds: int = 60,
         threshold: int = 10,
         alert_callback: Optional[Callable[[str, int, datetime], None]] = None,
-        alert_cooldown_seconds: int = 300
+        alert_cooldown_seconds: int = 300,
+        metrics: Optional[MetricsPort] = None
     ):
         """
         Initialize person detection monitor.
@@ -31,12 +33,14 @@ class PersonDetectionMonitor:
             threshold: Number of detections to trigger alert
             alert_callback: Function to call when threshold exceeded (name, count, timestamp)
             alert_cooldown_seconds: Minimum seconds between alerts
+            metrics: Optional metrics registry (alerts triggered)
         """
         self.person_name = person_name
         self.time_window_seconds = time_window_seconds
         self.threshold = threshold
         self.alert_callback = alert_callback
         self.alert_cooldown_seconds = alert_cooldown_seconds
+        self.metrics = metrics or NULL_METRICS
         
         self.detections: List[PersonDetection] = []
         self.last_alert_time: Optional[datetime] = None
@@ -92,6 +96,7 @@ class PersonDetectionMonitor:
         
         # Trigger alert
         self.last_alert_time = now
+        self.metrics.inc("monitor_alerts_total", monitor="known_person")
         if self.alert_callback:
             self.alert_callback(self.person_name, count, now)
         
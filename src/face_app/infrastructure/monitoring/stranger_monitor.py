@@ -1,7 +1,8 @@
 """Stranger detection monitor - Track and alert on suspicious activity."""
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from dataclasses import dataclass
+from face_app.domain.ports import MetricsPort, NULL_METRICS
 
 
 @dataclass
@@ -19,7 +20,8 @@ class StrangerMonitor:
         time_window_seconds: int = 60,  # 1 minute
         threshold: int = 10,  # 10 detections
         alert_callback=None,
-        alert_cooldown_seconds: int = 300  # 5 minutes between alerts
+        alert_cooldown_seconds: int = 300,  # 5 minutes between alerts
+        metrics: Optional[MetricsPort] = None
     ):
         """
         Initialize stranger monitor.
@@ -29,11 +31,13 @@ class StrangerMonitor:
             threshold: Number of stranger detections to trigger alert
             alert_callback: Function to call when threshold exceeded
             alert_cooldown_seconds: Minimum seconds between alerts (default 300s = 5 minutes)
+            metrics: Optional metrics registry (alerts triggered)
         """
         self.time_window_seconds = time_window_seconds
         self.threshold = threshold
         self.alert_callback = alert_callback
         self.alert_cooldown_seconds = alert_cooldown_seconds
+        self.metrics = metrics or NULL_METRICS
         
         self.detections: List[StrangerDetection] = []
         self.last_alert_time = None
@@ -96,6 +100,7 @@ class StrangerMonitor:
         
         # Trigger alert
         print(f"\n🚨 CẢNH BÁO: Phát hiện {count} người lạ trong {self.time_window_seconds}s!")
+        self.metrics.inc("monitor_alerts_total", monitor="stranger")
         
         if self.alert_callback:
             try:
@@ -0,0 +1,4 @@
+"""Motion detection infrastructure - cheap pixel-level frame gating."""
+from face_app.infrastructure.motion.motion_gate import MotionGate, MotionResult
+
+__all__ = ["MotionGate", "MotionResult"]
@@ -0,0 +1,120 @@
+"""Motion gate - skip face detection on static frames."""
+from dataclasses import dataclass
+from typing import Optional
+import cv2
+import numpy as np
+from face_app.domain.entities import BoundingBox
+
+
+@dataclass
+class MotionResult:
+    """Outcome of the motion gate for one frame."""
+    has_motion: bool
+    region: Optional[BoundingBox] = None  # Padded motion area in frame pixels (None = whole frame)
+    changed_fraction: float = 0.0  # Fraction of thumbnail pixels that changed
+
+
+class MotionGate:
+    """
+    Detect motion on a tiny grayscale thumbnail.
+    
+    Each frame is shrunk to ``thumb_width`` pixels wide, blurred and compared
+    with a running-average background. Costs a fraction of a millisecond, so
+    face detection can be skipped entirely when nothing moves.
+    """
+    
+    def __init__(
+        self,
+        thumb_width: int = 160,
+        pixel_threshold: int = 25,
+        min_area: float = 0.002,
+        background_alpha: float = 0.1,
+        hold_frames: int = 10,
+        region_padding: float = 0.25,
+        max_region_fraction: float = 0.5
+    ):
+        """
+        Initialize motion gate.
+        
+        Args:
+            thumb_width: Width of the thumbnail used for differencing
+            pixel_threshold: Gray-level difference (0-255) for a pixel to count as changed
+            min_area: Minimum fraction of changed pixels to report motion
+            background_alpha: Background update rate (higher = adapts faster)
+            hold_frames: Keep reporting motion N frames after it stops (whole frame)
+            region_padding: Expand the motion region by this fraction of its size
+            max_region_fraction: Larger motion regions are reported as whole-frame motion
+        """
+        self.thumb_width = thumb_width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.background_alpha = background_alpha
+        self.hold_frames = hold_frames
+        self.region_padding = region_padding
+        self.max_region_fraction = max_region_fraction
+        
+        self._background: Optional[np.ndarray] = None
+        self._hold = 0
+        self._kernel = np.ones((3, 3), np.uint8)
+    
+    def update(self, frame_bgr: np.ndarray) -> MotionResult:
+        """
+        Feed a frame and check for motion.
+        
+        Args:
+            frame_bgr: Full-size BGR frame
+        
+        Returns:
+            MotionResult (region in full-frame pixel coordinates)
+        """
+        height, width = frame_bgr.shape[:2]
+        scale = self.thumb_width / width
+        thumb = cv2.resize(frame_bgr, (self.thumb_width, max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        
+        if self._background is None or self._background.shape != gray.shape:
+            # First frame: everything is "new"
+            self._background = gray.astype(np.float32)
+            self._hold = self.hold_frames
+            return MotionResult(has_motion=True, changed_fraction=1.0)
+        
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(gray, self._background, self.background_alpha)
+        
+        _, mask = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        mask = cv2.dilate(mask, self._kernel, iterations=2)
+        
+        changed = cv2.countNonZero(mask)
+        changed_fraction = changed / mask.size
+        
+        if changed_fraction < self.min_area:
+            if self._hold > 0:
+                # Motion just stopped: look at the whole frame a little longer
+                self._hold -= 1
+                return MotionResult(has_motion=True, changed_fraction=changed_fraction)
+            return MotionResult(has_motion=False, changed_fraction=changed_fraction)
+        
+        self._hold = self.hold_frames
+        
+        x, y, w, h = cv2.boundingRect(mask)
+        pad_x = int(w * self.region_padding)
+        pad_y = int(h * self.region_padding)
+        region = BoundingBox(
+            top=max(0, int((y - pad_y) / scale)),
+            right=min(width, int((x + w + pad_x) / scale)),
+            bottom=min(height, int((y + h + pad_y) / scale)),
+            left=max(0, int((x - pad_x) / scale))
+        )
+        
+        region_area = (region.right - region.left) * (region.bottom - region.top)
+        if region_area > self.max_region_fraction * width * height:
+            # Cropping would barely save anything
+            region = None
+        
+        return MotionResult(has_motion=True, region=region, changed_fraction=changed_fraction)
+    
+    def reset(self) -> None:
+        """Forget the background (e.g. after the camera moved)."""
+        self._background = None
+        self._hold = 0
@@ -1,9 +1,11 @@
 """Email notification service for alerts."""
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+from face_app.domain.ports import MetricsPort, NULL_METRICS
 
 
 class EmailNotificationService:
@@ -16,7 +18,8 @@ class EmailNotificationService:
         sender_email: str,
         sender_password: str,
         recipient_emails: List[str],
-        enabled: bool = True
+        enabled: bool = True,
+        metrics: Optional[MetricsPort] = None
     ):
         """
         Initialize email service.
@@ -28,6 +31,7 @@ class EmailNotificationService:
             sender_password: Password or App Password
             recipient_emails: List of recipient email addresses
             enabled: Enable/disable email notifications
+            metrics: Optional metrics registry (send latency and outcome)
         """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
@@ -35,6 +39,7 @@ class EmailNotificationService:
         self.sender_password = sender_password
         self.recipient_emails = recipient_emails
         self.enabled = enabled
+        self.metrics = metrics or NULL_METRICS
     
     def send_stranger_alert(self, stranger_count: int, detection_time: datetime) -> bool:
         """
@@ -76,6 +81,7 @@ Hệ thống Face Recognition Camera App
 Được gửi tự động - Không reply email này
         """
         
+        started = time.perf_counter()
         try:
             # Create message
             message = MIMEMultipart()
@@ -94,12 +100,20 @@ Hệ thống Face Recognition Camera App
                 server.send_message(message)
             
             print(f"✅ Đã gửi email cảnh báo thành công!")
+            self._record_send(started, "ok")
             return True
             
         except Exception as e:
             print(f"❌ Lỗi gửi email: {e}")
+            self._record_send(started, "failed")
             return False
     
+    def _record_send(self, started: float, outcome: str) -> None:
+        """Report how long delivering an alert took and whether it worked."""
+        if self.metrics.enabled:
+            self.metrics.observe("alert_send_seconds", time.perf_counter() - started, channel="email")
+            self.metrics.inc("alerts_sent_total", channel="email", outcome=outcome)
+    
     def send_test_email(self) -> bool:
         """Send a test email to verify configuration."""
         try:
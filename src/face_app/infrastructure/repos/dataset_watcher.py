@@ -0,0 +1,108 @@
+"""Watch the known faces folder and trigger gallery reloads on change."""
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from face_app.infrastructure.repos.image_folder_repo import IMAGE_PATTERNS
+
+
+def scan_signature(dataset_path: Path) -> Dict[str, Tuple[int, int]]:
+    """
+    Cheap fingerprint of the dataset: {relative path: (mtime_ns, size)}.
+    
+    Only stat() calls, no image decoding.
+    """
+    signature = {}
+    if not dataset_path.exists():
+        return signature
+    
+    for person_folder in dataset_path.iterdir():
+        if not person_folder.is_dir() or person_folder.name.startswith("."):
+            continue
+        for pattern in IMAGE_PATTERNS:
+            for image_path in person_folder.glob(pattern):
+                try:
+                    stat = image_path.stat()
+                except OSError:
+                    continue
+                key = image_path.relative_to(dataset_path).as_posix()
+                signature[key] = (stat.st_mtime_ns, stat.st_size)
+    
+    return signature
+
+
+class DatasetWatcher:
+    """Poll the dataset folder and call back when images are added, changed or removed."""
+    
+    def __init__(
+        self,
+        dataset_path: Path,
+        on_change: Callable[[], None],
+        interval_seconds: float = 2.0,
+        settle_seconds: float = 1.0
+    ):
+        """
+        Initialize watcher.
+        
+        Args:
+            dataset_path: Path to known_faces directory
+            on_change: Called (from the watcher thread) after the folder changed
+            interval_seconds: Polling interval
+            settle_seconds: Wait for the folder to stop changing (e.g. a copy in progress)
+        """
+        self.dataset_path = Path(dataset_path)
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self.settle_seconds = settle_seconds
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature: Dict[str, Tuple[int, int]] = {}
+    
+    def start(self) -> None:
+        """Take the initial snapshot and start polling."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        self._signature = scan_signature(self.dataset_path)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._thread.start()
+        print(f"👀 Watching {self.dataset_path} for changes (every {self.interval_seconds}s)")
+    
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def _watch_loop(self) -> None:
+        """Polling loop."""
+        while not self._stop_event.wait(self.interval_seconds):
+            signature = scan_signature(self.dataset_path)
+            if signature == self._signature:
+                continue
+            
+            # Let copies finish before reloading
+            while not self._stop_event.wait(self.settle_seconds):
+                settled = scan_signature(self.dataset_path)
+                if settled == signature:
+                    break
+                signature = settled
+            
+            if self._stop_event.is_set():
+                return
+            
+            added = len(signature.keys() - self._signature.keys())
+            removed = len(self._signature.keys() - signature.keys())
+            changed = sum(
+                1 for key in signature.keys() & self._signature.keys()
+                if signature[key] != self._signature[key]
+            )
+            self._signature = signature
+            
+            print(f"\n🔄 Known faces changed (+{added} / ~{changed} / -{removed}), reloading in background...")
+            try:
+                self.on_change()
+            except Exception as e:
+                print(f"❌ Dataset watcher callback error: {e}")
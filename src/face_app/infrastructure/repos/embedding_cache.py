@@ -0,0 +1,196 @@
+"""Persistent on-disk cache of known face embeddings."""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class CacheEntry:
+    """Index record for one enrolled image."""
+    path: str  # Relative to dataset root (posix style)
+    name: str  # Person name
+    mtime_ns: int
+    size: int
+    sha1: str
+    row: int  # Row in the embedding matrix, -1 when no face was found
+
+
+def file_sha1(path: Path) -> str:
+    """Content hash of an image file."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embedding cache stored next to the dataset.
+    
+    Files:
+        .embeddings-<engine>-<model>.npy   float32 matrix (memory-mappable)
+        .embeddings-<engine>-<model>.json  index of (path, mtime, size, sha1, row)
+    """
+    
+    def __init__(self, dataset_path: Path, engine: str, model: str):
+        """
+        Initialize cache.
+        
+        Args:
+            dataset_path: Path to known_faces directory
+            engine: Engine name ("dlib", "insightface")
+            model: Model identifier (detection model / model pack)
+        """
+        self.dataset_path = Path(dataset_path)
+        self.engine = engine
+        self.model = model
+        
+        stem = f".embeddings-{engine}-{model}"
+        self.matrix_path = self.dataset_path / f"{stem}.npy"
+        self.index_path = self.dataset_path / f"{stem}.json"
+        
+        self._entries: Dict[str, CacheEntry] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self.dim: Optional[int] = None
+        self.dirty = False  # Index records refreshed since load/save
+    
+    def load(self) -> int:
+        """
+        Load index and memory-map the embedding matrix.
+        
+        Returns:
+            Number of cached images (0 if cache missing or invalid)
+        """
+        self._entries = {}
+        self._matrix = None
+        self.dim = None
+        self.dirty = False
+        
+        if not self.index_path.exists() or not self.matrix_path.exists():
+            return 0
+        
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            
+            if (index.get("version") != CACHE_VERSION
+                    or index.get("engine") != self.engine
+                    or index.get("model") != self.model):
+                return 0
+            
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            if matrix.ndim != 2 or matrix.shape[1] != index.get("dim"):
+                return 0
+            
+            self._matrix = matrix
+            self.dim = int(index["dim"])
+            self._entries = {e["path"]: CacheEntry(**e) for e in index["entries"]}
+        
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Ignoring invalid embedding cache {self.index_path.name}: {e}")
+            self._entries = {}
+            self._matrix = None
+            self.dim = None
+        
+        return len(self._entries)
+    
+    def keys(self) -> Set[str]:
+        """Cache keys of the images currently in the index."""
+        return set(self._entries)
+    
+    def relative_key(self, image_path: Path) -> str:
+        """Cache key for an image path."""
+        return Path(image_path).relative_to(self.dataset_path).as_posix()
+    
+    def lookup(self, image_path: Path, stat: os.stat_result) -> Tuple[bool, Optional[np.ndarray], Optional[CacheEntry]]:
+        """
+        Look up an image in the cache.
+        
+        A (mtime, size) match is trusted without reading the file. If only the
+        mtime changed, the content hash decides (e.g. a copied/touched file).
+        
+        Args:
+            image_path: Absolute image path
+            stat: os.stat() result for the image
+        
+        Returns:
+            (hit, embedding or None if no face, refreshed entry or None)
+        """
+        entry = self._entries.get(self.relative_key(image_path))
+        if entry is None or entry.size != stat.st_size:
+            return False, None, None
+        
+        if entry.mtime_ns != stat.st_mtime_ns:
+            if file_sha1(image_path) != entry.sha1:
+                return False, None, None
+            entry = CacheEntry(**{**asdict(entry), "mtime_ns": stat.st_mtime_ns})
+            self.dirty = True
+        
+        if entry.row < 0:
+            return True, None, entry
+        
+        # Copy the row out of the memory map so the file can be replaced later
+        return True, np.array(self._matrix[entry.row], dtype=np.float32), entry
+    
+    def save(self, records: List[Tuple[CacheEntry, Optional[np.ndarray]]]) -> None:
+        """
+        Rewrite the cache for the current dataset.
+        
+        Images not in ``records`` (deleted from disk) are dropped.
+        
+        Args:
+            records: (entry, embedding or None) for every image in the dataset
+        """
+        vectors = [v for _, v in records if v is not None]
+        dim = int(vectors[0].shape[0]) if vectors else (self.dim or 0)
+        matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+        
+        entries = []
+        row = 0
+        for entry, vector in records:
+            if vector is None:
+                entries.append(asdict(CacheEntry(**{**asdict(entry), "row": -1})))
+            else:
+                matrix[row] = vector
+                entries.append(asdict(CacheEntry(**{**asdict(entry), "row": row})))
+                row += 1
+        
+        index = {
+            "version": CACHE_VERSION,
+            "engine": self.engine,
+            "model": self.model,
+            "dim": dim,
+            "entries": entries
+        }
+        
+        # Release the memory map before replacing the file (required on Windows)
+        self._matrix = None
+        
+        try:
+            tmp_matrix = self.matrix_path.with_name(self.matrix_path.name + ".tmp")
+            tmp_index = self.index_path.with_name(self.index_path.name + ".tmp")
+            
+            with open(tmp_matrix, "wb") as f:
+                np.save(f, matrix)
+            with open(tmp_index, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            
+            os.replace(tmp_matrix, self.matrix_path)
+            os.replace(tmp_index, self.index_path)
+        
+        except OSError as e:
+            print(f"⚠️  Cannot write embedding cache: {e}")
+            return
+        
+        self._entries = {e["path"]: CacheEntry(**e) for e in entries}
+        self._matrix = matrix
+        self.dim = dim
+        self.dirty = False
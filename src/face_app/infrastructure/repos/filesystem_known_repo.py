@@ -1,97 +1,105 @@
 """Filesystem repository for loading known faces dataset."""
-from typing import List, Tuple
+from functools import partial
+from typing import Optional
 from pathlib import Path
 import numpy as np
 import face_recognition
-from PIL import Image
-from face_app.domain.ports import KnownFaceRepoPort
-from face_app.config.settings import KNOWN_FACES_DIR, MODEL
+from face_app.infrastructure.repos.image_folder_repo import ImageFolderKnownRepo
+from face_app.infrastructure.repos.image_loading import (
+    load_rgb_bounded, load_rgb_scaled, padded_crop_box
+)
+from face_app.config.settings import (
+    KNOWN_FACES_DIR, MODEL, ENABLE_EMBEDDING_CACHE, ENROLL_WORKERS,
+    ENROLL_DETECT_MAX_SIDE, ENROLL_MIN_FACE_SIZE
+)
 
 
-class FilesystemKnownRepo(KnownFaceRepoPort):
+def encode_image_file(
+    image_path: Path,
+    model: str = MODEL,
+    detect_max_side: int = ENROLL_DETECT_MAX_SIDE,
+    min_face_size: int = ENROLL_MIN_FACE_SIZE
+) -> Optional[np.ndarray]:
+    """
+    Encode the first face found in an image (module-level so pool workers can run it).
+    
+    Detection runs on a reduced-size decode (long side <= detect_max_side).
+    If the face is too small there, only a padded crop around it is
+    re-decoded at a finer scale for encoding.
+    
+    Args:
+        image_path: Path to image file
+        model: Face detection model
+        detect_max_side: Long side of the image used for detection
+        min_face_size: Minimum face width (pixels) used for encoding
+        
+    Returns:
+        128-dimensional encoding or None if no face detected
+    """
+    # Detect on a bounded-size image
+    small, scale = load_rgb_bounded(image_path, detect_max_side)
+    locations = face_recognition.face_locations(small, model=model)
+    
+    if not locations:
+        return None
+    
+    # Use the first detected face
+    top, right, bottom, left = locations[0]
+    
+    if scale >= 1.0 or right - left >= min_face_size:
+        image, location = small, locations[0]
+    else:
+        # Face too small at detection scale: re-decode finer and crop around it
+        face_width = (right - left) / scale
+        image, fine_scale = load_rgb_scaled(image_path, min_face_size / face_width)
+        ratio = fine_scale / scale
+        top, right, bottom, left = (int(v * ratio) for v in (top, right, bottom, left))
+        
+        crop_top, crop_right, crop_bottom, crop_left = padded_crop_box(
+            top, right, bottom, left, image.shape[1], image.shape[0]
+        )
+        image = np.ascontiguousarray(image[crop_top:crop_bottom, crop_left:crop_right])
+        location = (top - crop_top, right - crop_left, bottom - crop_top, left - crop_left)
+    
+    # 68-point landmarks, as face_encodings(image, model="hog") used before
+    encodings = face_recognition.face_encodings(image, known_face_locations=[location], model="large")
+    
+    return encodings[0] if encodings else None
+
+
+class FilesystemKnownRepo(ImageFolderKnownRepo):
     """Load known faces from filesystem (known_faces/<name>/*.jpg)."""
     
-    def __init__(self, dataset_path: Path = KNOWN_FACES_DIR, model: str = MODEL):
+    engine_name = "dlib"
+    
+    def __init__(
+        self,
+        dataset_path: Path = KNOWN_FACES_DIR,
+        model: str = MODEL,
+        use_cache: bool = ENABLE_EMBEDDING_CACHE,
+        workers: int = ENROLL_WORKERS
+    ):
         """
         Initialize repository.
         
         Args:
             dataset_path: Path to known_faces directory
             model: Face detection model for encoding
+            use_cache: Reuse embeddings from the on-disk cache
+            workers: Enrollment processes (1 = serial, 0 = one per CPU core)
         """
-        self.dataset_path = dataset_path
+        super().__init__(dataset_path, use_cache=use_cache, workers=workers)
         self.model = model
     
-    def load_known_faces(self) -> Tuple[List[np.ndarray], List[str]]:
-        """
-        Load all known faces from dataset.
-        
-        Directory structure:
-            known_faces/
-                Person1/
-                    01.jpg
-                    02.jpg
-                Person2/
-                    01.jpg
-        
-        Returns:
-            (encodings, names) - lists of same length
-        """
-        known_encodings = []
-        known_names = []
-        
-        if not self.dataset_path.exists():
-            print(f"⚠️  Dataset path not found: {self.dataset_path}")
-            return [], []
-        
-        # Iterate through each person's folder
-        person_folders = [f for f in self.dataset_path.iterdir() if f.is_dir()]
-        
-        if not person_folders:
-            print(f"⚠️  No person folders found in {self.dataset_path}")
-            print(f"💡 Create folders like: known_faces/YourName/")
-            return [], []
-        
-        print(f"📂 Loading known faces from {self.dataset_path}...")
-        
-        for person_folder in person_folders:
-            person_name = person_folder.name
-            
-            # Get all image files
-            image_files = list(person_folder.glob("*.jpg")) + \
-                         list(person_folder.glob("*.jpeg")) + \
-                         list(person_folder.glob("*.png"))
-            
-            if not image_files:
-                print(f"⚠️  No images found for {person_name}")
-                continue
-            
-            print(f"   Loading {person_name} ({len(image_files)} images)...", end=" ")
-            
-            person_encodings_count = 0
-            
-            # Process each image
-            for image_path in image_files:
-                try:
-                    # Load image
-                    image = face_recognition.load_image_file(str(image_path))
-                    
-                    # Get face encodings
-                    encodings = face_recognition.face_encodings(image, model=self.model)
-                    
-                    if encodings:
-                        # Use the first detected face
-                        known_encodings.append(encodings[0])
-                        known_names.append(person_name)
-                        person_encodings_count += 1
-                    else:
-                        print(f"\n      ⚠️  No face detected in {image_path.name}")
-                
-                except Exception as e:
-                    print(f"\n      ❌ Error loading {image_path.name}: {e}")
-            
-            print(f"✅ {person_encodings_count} faces loaded")
-        
-        print(f"\n✅ Total: {len(known_encodings)} face encodings from {len(set(known_names))} people\n")
-        
-        return known_encodings, known_names
+    @property
+    def model_key(self) -> str:
+        """Cache key: detection model, detection image size and minimum face size."""
+        return f"{self.model}-d{ENROLL_DETECT_MAX_SIDE}-f{ENROLL_MIN_FACE_SIZE}"
+    
+    def _encode_image(self, image_path: Path) -> Optional[np.ndarray]:
+        """Encode the first face found in an image."""
+        return encode_image_file(image_path, model=self.model)
+    
+    def _worker_spec(self):
+        """Workers only need the detection model; dlib models load on import."""
+        return partial(encode_image_file, model=self.model), None, ()
@@ -0,0 +1,226 @@
+"""Prepare loaded galleries for search - index (persisted next to the embedding cache) and compact storage."""
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from face_app.domain.gallery import FaceGallery, STORAGE_FLOAT32, STORAGES
+from face_app.domain.gallery_index import (
+    GalleryIndex, IVFIndex, TemplateIndex, INDEX_EXACT, INDEX_IVF, INDEX_TEMPLATES, INDEX_KINDS, TEMPLATE_METHODS
+)
+from face_app.config.settings import (
+    GALLERY_INDEX, IVF_NLIST, IVF_NPROBE, IVF_MIN_GALLERY_SIZE,
+    TEMPLATE_METHOD, TEMPLATES_PER_IDENTITY, TEMPLATE_RERANK,
+    GALLERY_STORAGE, GALLERY_RERANK_CANDIDATES, GALLERY_EXACT_ON_DISK
+)
+
+
+def gallery_fingerprint(gallery: FaceGallery) -> str:
+    """Content hash of the gallery matrix (an index is only valid for the rows it was trained on)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{gallery.metric}:{gallery.matrix.shape}".encode())
+    digest.update(np.ascontiguousarray(gallery.matrix).data)
+    return digest.hexdigest()
+
+
+def memory_map_rows(gallery: FaceGallery) -> None:
+    """
+    Move the full-precision matrix of a quantized gallery to an anonymous temporary file.
+    
+    Only the re-ranked candidate rows are read back, so the OS keeps just
+    those pages in memory. The file is deleted when the gallery is released.
+    """
+    rows = np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode="w+", shape=gallery.matrix.shape)
+    rows[:] = gallery.matrix
+    rows.flush()
+    gallery.matrix = rows
+
+
+class GalleryIndexStore:
+    """
+    IVF index stored as known_faces/.index-<engine>-<model>-ivf.npz.
+    
+    Holds the centroids, the cell of every row and a fingerprint of the
+    gallery matrix; a gallery that changed in any way retrains.
+    """
+    
+    def __init__(self, dataset_path: Path, engine: str, model: str):
+        """
+        Initialize store.
+        
+        Args:
+            dataset_path: Path to known_faces directory (same place as the embedding cache)
+            engine: Engine name ("dlib", "insightface")
+            model: Model identifier
+        """
+        self.path = Path(dataset_path) / f".index-{engine}-{model}-{INDEX_IVF}.npz"
+    
+    @classmethod
+    def for_repo(cls, known_repo) -> Optional["GalleryIndexStore"]:
+        """Store beside the repo's embedding cache (None for repos without a dataset folder)."""
+        if not all(hasattr(known_repo, attr) for attr in ("dataset_path", "engine_name", "model_key")):
+            return None
+        return cls(known_repo.dataset_path, known_repo.engine_name, known_repo.model_key)
+    
+    def load(self, gallery: FaceGallery, nlist: int = 0) -> Optional[IVFIndex]:
+        """
+        Load the saved index if it was trained on this exact gallery.
+        
+        Args:
+            gallery: Current gallery
+            nlist: Requested cells (0 = any)
+        
+        Returns:
+            IVFIndex or None (missing, stale or unreadable)
+        """
+        if not self.path.exists():
+            return None
+        
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["fingerprint"]) != gallery_fingerprint(gallery):
+                    return None
+                index = IVFIndex(data["centroids"], data["assignments"], str(data["metric"]))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Ignoring invalid gallery index {self.path.name}: {e}")
+            return None
+        
+        if index.metric != gallery.metric or (nlist and index.nlist != nlist):
+            return None
+        return index
+    
+    def save(self, index: IVFIndex, gallery: FaceGallery) -> None:
+        """Write the index atomically (temporary file + rename)."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    fingerprint=np.array(gallery_fingerprint(gallery)),
+                    metric=np.array(index.metric),
+                    centroids=index.centroids,
+                    assignments=index.assignments
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Cannot write gallery index: {e}")
+
+
+class GalleryIndexBuilder:
+    """
+    Build the configured index for every (re)loaded gallery.
+    
+    Passed to LoadKnownFacesUseCase as ``index_builder``. The IVF index is
+    read back from the store when the gallery did not change, otherwise
+    trained (k-means) and saved. Templates are cheap to compute and are
+    rebuilt on every load. With a float16/int8 storage the gallery also
+    gets a compact scan copy, and its float32 rows can move to disk.
+    """
+    
+    def __init__(
+        self,
+        kind: str = GALLERY_INDEX,
+        store: Optional[GalleryIndexStore] = None,
+        nlist: int = IVF_NLIST,
+        nprobe: int = IVF_NPROBE,
+        min_size: int = IVF_MIN_GALLERY_SIZE,
+        template_method: str = TEMPLATE_METHOD,
+        templates_per_identity: int = TEMPLATES_PER_IDENTITY,
+        template_rerank: int = TEMPLATE_RERANK,
+        storage: str = GALLERY_STORAGE,
+        rerank_candidates: int = GALLERY_RERANK_CANDIDATES,
+        exact_on_disk: bool = GALLERY_EXACT_ON_DISK
+    ):
+        """
+        Initialize builder.
+        
+        Args:
+            kind: "exact", "ivf" or "templates"
+            store: Where to persist the IVF index (None = train on every load)
+            nlist: IVF cells (0 = sqrt of the gallery size)
+            nprobe: IVF cells searched per probe (recall / speed trade-off, no retraining needed)
+            min_size: Galleries smaller than this use exact search (IVF only)
+            template_method: "mean", "medoid" or "weighted"
+            templates_per_identity: Templates per person
+            template_rerank: People re-ranked on their raw photos (0 = templates only)
+            storage: "float32", "float16" or "int8" scan copy for exact search
+            rerank_candidates: Rows per face re-ranked at full precision after a compact scan
+            exact_on_disk: Memory-map the float32 rows of a compact gallery instead of keeping them in RAM
+        """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown gallery index '{kind}', use one of {INDEX_KINDS}")
+        if template_method not in TEMPLATE_METHODS:
+            raise ValueError(f"Unknown template method '{template_method}', use one of {TEMPLATE_METHODS}")
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown gallery storage '{storage}', use one of {STORAGES}")
+        
+        self.kind = kind
+        self.store = store
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_size = min_size
+        self.template_method = template_method
+        self.templates_per_identity = templates_per_identity
+        self.template_rerank = template_rerank
+        self.storage = storage
+        self.rerank_candidates = rerank_candidates
+        self.exact_on_disk = exact_on_disk
+    
+    def __call__(self, gallery: FaceGallery) -> Optional[GalleryIndex]:
+        """
+        Index for a gallery (compacting its storage on the way).
+        
+        Returns:
+            IVFIndex / TemplateIndex, or None for exact search
+        """
+        index = self._build_index(gallery)
+        if self.storage != STORAGE_FLOAT32 and len(gallery) > 0:
+            self._compact(gallery)
+        return index
+    
+    def _build_index(self, gallery: FaceGallery) -> Optional[GalleryIndex]:
+        """Configured index, trained on the float32 matrix."""
+        if self.kind == INDEX_EXACT or len(gallery) == 0:
+            return None
+        
+        if self.kind == INDEX_TEMPLATES:
+            return self._build_templates(gallery)
+        
+        if len(gallery) < self.min_size:
+            return None
+        
+        index = self.store.load(gallery, self.nlist) if self.store else None
+        if index is None:
+            started = time.perf_counter()
+            index = IVFIndex.train(gallery, nlist=self.nlist, nprobe=self.nprobe)
+            print(f"   🗂️  Gallery index trained: {index.nlist} cells over {len(gallery)} rows "
+                  f"({time.perf_counter() - started:.1f}s)")
+            if self.store:
+                self.store.save(index, gallery)
+        
+        index.nprobe = self.nprobe
+        return index
+    
+    def _build_templates(self, gallery: FaceGallery) -> TemplateIndex:
+        """Per-identity templates of the gallery."""
+        started = time.perf_counter()
+        index = TemplateIndex.build(
+            gallery,
+            method=self.template_method,
+            per_identity=self.templates_per_identity,
+            rerank=self.template_rerank
+        )
+        print(f"   🗂️  Gallery compacted: {len(gallery)} photos -> {len(index)} {self.template_method} templates "
+              f"({time.perf_counter() - started:.1f}s)")
+        return index
+    
+    def _compact(self, gallery: FaceGallery) -> None:
+        """Quantized scan copy, float32 rows optionally moved out of RAM."""
+        before = gallery.memory_bytes
+        gallery.quantize(self.storage, self.rerank_candidates)
+        if self.exact_on_disk:
+            memory_map_rows(gallery)
+        print(f"   🗜️  Gallery storage {self.storage}: {before / 1e6:.1f} MB -> "
+              f"{gallery.memory_bytes / 1e6:.1f} MB in memory")
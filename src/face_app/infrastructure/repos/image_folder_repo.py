@@ -0,0 +1,282 @@
+"""Base repository for known faces stored as known_faces/<name>/*.jpg."""
+import multiprocessing
+import os
+import time
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from face_app.domain.ports import KnownFaceRepoPort
+from face_app.infrastructure.repos.embedding_cache import EmbeddingCache, CacheEntry, file_sha1
+
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+
+@dataclass
+class EnrollmentFailure:
+    """An image that could not be enrolled."""
+    path: str
+    reason: str
+
+
+@dataclass
+class EnrollmentReport:
+    """Summary of one load_known_faces() run."""
+    images: int = 0
+    encoded: int = 0
+    cached: int = 0
+    faces: int = 0
+    people: int = 0
+    seconds: float = 0.0
+    failures: List[EnrollmentFailure] = field(default_factory=list)
+
+
+class ImageFolderKnownRepo(KnownFaceRepoPort):
+    """Scan the dataset folder, reuse cached embeddings and encode the rest."""
+    
+    engine_name = ""
+    
+    def __init__(self, dataset_path: Path, use_cache: bool = True, workers: int = 1):
+        """
+        Initialize repository.
+        
+        Args:
+            dataset_path: Path to known_faces directory
+            use_cache: Reuse embeddings from the on-disk cache
+            workers: Enrollment processes (1 = serial, 0 = one per CPU core)
+        """
+        self.dataset_path = dataset_path
+        self.use_cache = use_cache
+        self.workers = workers
+        self.last_report: Optional[EnrollmentReport] = None
+        self._cache: Optional[EmbeddingCache] = None
+    
+    @property
+    @abstractmethod
+    def model_key(self) -> str:
+        """Identifier of the model producing the embeddings (part of the cache key)."""
+        pass
+    
+    @abstractmethod
+    def _encode_image(self, image_path: Path) -> Optional[np.ndarray]:
+        """Encode the first face of an image, or None if no face is found."""
+        pass
+    
+    @property
+    def cache(self) -> EmbeddingCache:
+        """Embedding cache for this engine/model."""
+        if self._cache is None:
+            self._cache = EmbeddingCache(self.dataset_path, self.engine_name, self.model_key)
+        return self._cache
+    
+    def _scan_dataset(self) -> List[Tuple[str, List[Path]]]:
+        """List (person_name, image_files) in a deterministic order."""
+        person_folders = sorted(
+            f for f in self.dataset_path.iterdir()
+            if f.is_dir() and not f.name.startswith(".")
+        )
+        
+        dataset = []
+        for person_folder in person_folders:
+            image_files = sorted({
+                path for pattern in IMAGE_PATTERNS
+                for path in person_folder.glob(pattern)
+            })
+            dataset.append((person_folder.name, image_files))
+        
+        return dataset
+    
+    def _worker_spec(self) -> Optional[Tuple[Callable[[str], Optional[np.ndarray]], Optional[Callable], tuple]]:
+        """
+        Picklable encoder for process pool workers.
+        
+        Returns:
+            (encode_fn(path) -> encoding or None, worker initializer, initializer args),
+            or None when the repository only encodes serially
+        """
+        return None
+    
+    def _encode_pending(
+        self, image_paths: List[Path]
+    ) -> List[Tuple[Optional[np.ndarray], Optional[str], Optional[str]]]:
+        """
+        Encode images serially or across a process pool.
+        
+        Returns:
+            (encoding or None, content hash, error message or None) per image, in input order
+        """
+        workers = self.workers or os.cpu_count() or 1
+        spec = self._worker_spec() if workers > 1 and len(image_paths) > 1 else None
+        
+        if spec is None:
+            return [_safe_encode(self._encode_image, path) for path in image_paths]
+        
+        encode_fn, initializer, initargs = spec
+        workers = min(workers, len(image_paths))
+        chunksize = max(1, len(image_paths) // (workers * 4))
+        
+        print(f"   ⚙️  Encoding {len(image_paths)} images with {workers} worker processes...")
+        # Spawn, not fork: the parent may already hold dlib/onnxruntime state and threads
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer, initargs=initargs
+        ) as pool:
+            # map() keeps input order, so results stay in person/file order
+            return list(pool.map(
+                partial(_safe_encode, encode_fn),
+                [str(path) for path in image_paths],
+                chunksize=chunksize
+            ))
+    
+    def load_known_faces(self) -> Tuple[List[np.ndarray], List[str]]:
+        """
+        Load all known faces from dataset.
+        
+        Directory structure:
+            known_faces/
+                Person1/
+                    01.jpg
+                    02.jpg
+                Person2/
+                    01.jpg
+        
+        Unchanged images are served from the embedding cache; only new or
+        modified images are encoded (in parallel when workers > 1).
+        A summary of the run is kept in ``last_report``.
+        
+        Returns:
+            (encodings, names) - lists of same length
+        """
+        started = time.perf_counter()
+        known_encodings = []
+        known_names = []
+        
+        if not self.dataset_path.exists():
+            print(f"⚠️  Dataset path not found: {self.dataset_path}")
+            return [], []
+        
+        dataset = self._scan_dataset()
+        
+        if not dataset:
+            print(f"⚠️  No person folders found in {self.dataset_path}")
+            print(f"💡 Create folders like: known_faces/YourName/")
+            return [], []
+        
+        print(f"📂 Loading known faces from {self.dataset_path}...")
+        
+        report = EnrollmentReport()
+        if self.use_cache:
+            self.cache.load()
+        
+        # 1. Resolve cache hits; everything else is queued for encoding
+        items = []
+        pending: List[Path] = []
+        for person_name, image_files in dataset:
+            for image_path in image_files:
+                try:
+                    stat = image_path.stat()
+                except OSError as e:
+                    report.failures.append(EnrollmentFailure(str(image_path), str(e)))
+                    continue
+                
+                hit, encoding, entry = False, None, None
+                if self.use_cache:
+                    try:
+                        hit, encoding, entry = self.cache.lookup(image_path, stat)
+                    except OSError as e:
+                        # Hashing a touched file can fail like any other read
+                        report.failures.append(EnrollmentFailure(str(image_path), str(e)))
+                        continue
+                if not hit:
+                    pending.append(image_path)
+                items.append((person_name, image_path, stat, hit, encoding, entry))
+        
+        # 2. Encode new/changed images
+        outcomes = iter(self._encode_pending(pending))
+        
+        # 3. Assemble results in dataset order
+        records: List[Tuple[CacheEntry, Optional[np.ndarray]]] = []
+        person_counts: Dict[str, List[int]] = {name: [0, 0] for name, _ in dataset}
+        
+        for person_name, image_path, stat, hit, encoding, entry in items:
+            report.images += 1
+            
+            if hit:
+                report.cached += 1
+                person_counts[person_name][1] += 1
+                if encoding is None:
+                    report.failures.append(EnrollmentFailure(str(image_path), "no face detected (cached)"))
+            else:
+                encoding, sha1, error = next(outcomes)
+                if error is not None:
+                    # Not cached: retried on the next load
+                    report.failures.append(EnrollmentFailure(str(image_path), error))
+                    continue
+                report.encoded += 1
+                if encoding is None:
+                    report.failures.append(EnrollmentFailure(str(image_path), "no face detected"))
+            
+            if self.use_cache:
+                if entry is None:
+                    entry = CacheEntry(
+                        path=self.cache.relative_key(image_path),
+                        name=person_name,
+                        mtime_ns=stat.st_mtime_ns,
+                        size=stat.st_size,
+                        sha1=sha1,
+                        row=-1
+                    )
+                records.append((entry, encoding))
+            
+            if encoding is not None:
+                known_encodings.append(encoding)
+                known_names.append(person_name)
+                person_counts[person_name][0] += 1
+        
+        for person_name, image_files in dataset:
+            if not image_files:
+                print(f"⚠️  No images found for {person_name}")
+                continue
+            
+            loaded, cached = person_counts[person_name]
+            cache_note = f" ({cached} cached)" if cached else ""
+            print(f"   Loading {person_name} ({len(image_files)} images)... ✅ {loaded} faces loaded{cache_note}")
+        
+        # Persist new/changed embeddings and drop deleted images (images that
+        # failed to encode are not written, so compare keys rather than counts)
+        if self.use_cache and (report.encoded or self.cache.dirty
+                               or self.cache.keys() != {entry.path for entry, _ in records}):
+            self.cache.save(records)
+        
+        report.people = len(set(known_names))
+        report.faces = len(known_encodings)
+        report.seconds = time.perf_counter() - started
+        self.last_report = report
+        
+        if report.failures:
+            print(f"\n⚠️  {len(report.failures)} images skipped:")
+            for failure in report.failures:
+                print(f"      - {failure.path}: {failure.reason}")
+        
+        print(f"\n✅ Total: {report.faces} face encodings from {report.people} people "
+              f"({report.encoded} encoded, {report.cached} cached, {report.seconds:.1f}s)\n")
+        
+        return known_encodings, known_names
+
+
+def _safe_encode(encode_fn, image_path) -> Tuple[Optional[np.ndarray], Optional[str], Optional[str]]:
+    """
+    Run an encoder and hash the file, turning exceptions into an error message.
+    
+    The hash is taken here (in the worker, right after decoding, while the
+    file is still in the page cache) so the cache entry never reads it again.
+    """
+    try:
+        image_path = Path(image_path)
+        return encode_fn(image_path), file_sha1(image_path), None
+    except Exception as e:
+        return None, None, str(e) or type(e).__name__
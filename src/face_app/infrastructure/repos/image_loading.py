@@ -0,0 +1,113 @@
+"""Reduced-size image decoding for enrollment photos."""
+import math
+from pathlib import Path
+from typing import Tuple
+import numpy as np
+import cv2
+from PIL import Image
+
+
+# cv2.imread flags for JPEG DCT-domain downscaling (1/2, 1/4, 1/8)
+_CV2_REDUCED_COLOR = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+def image_size(image_path: Path) -> Tuple[int, int]:
+    """Read (width, height) from the image header without decoding pixels."""
+    with Image.open(image_path) as img:
+        return img.size
+
+
+def load_rgb_scaled(image_path: Path, scale: float) -> Tuple[np.ndarray, float]:
+    """
+    Decode an image at roughly ``scale`` of its original size.
+    
+    JPEGs use PIL draft mode, so the decoder itself produces the smaller
+    image (1/2, 1/4 or 1/8) instead of decoding at full size and resizing.
+    
+    Args:
+        image_path: Path to image file
+        scale: Requested scale (<= 1.0)
+    
+    Returns:
+        (RGB image, actual scale relative to the original)
+    """
+    with Image.open(image_path) as img:
+        orig_w, orig_h = img.size
+        scale = min(1.0, scale)
+        
+        if scale < 1.0:
+            # Picks the smallest DCT scale that is still >= requested size
+            img.draft("RGB", (math.ceil(orig_w * scale), math.ceil(orig_h * scale)))
+        
+        rgb = img.convert("RGB")
+    
+    return np.asarray(rgb), rgb.width / orig_w
+
+
+def load_rgb_bounded(image_path: Path, max_side: int) -> Tuple[np.ndarray, float]:
+    """
+    Decode an image with its long side bounded by ``max_side``.
+    
+    Returns:
+        (RGB image, scale relative to the original)
+    """
+    orig_w, orig_h = image_size(image_path)
+    scale = min(1.0, max_side / max(orig_w, orig_h))
+    
+    rgb, decoded_scale = load_rgb_scaled(image_path, scale)
+    
+    if max(rgb.shape[:2]) > max_side:
+        # Draft mode only lands on 1/2^n steps; finish with a cheap resize
+        rgb = cv2.resize(rgb, (0, 0), fx=scale / decoded_scale, fy=scale / decoded_scale,
+                         interpolation=cv2.INTER_AREA)
+        decoded_scale = rgb.shape[1] / orig_w
+    
+    return rgb, decoded_scale
+
+
+def load_bgr_reduced(image_path: Path, scale: float) -> Tuple[np.ndarray, float]:
+    """
+    Decode an image with OpenCV's reduced JPEG decoding (IMREAD_REDUCED_COLOR_*).
+    
+    Args:
+        image_path: Path to image file
+        scale: Requested minimum scale (<= 1.0)
+    
+    Returns:
+        (BGR image, actual scale relative to the original)
+    """
+    orig_w, _ = image_size(image_path)
+    
+    # Largest reduction that still keeps at least the requested scale
+    factor = max(f for f in _CV2_REDUCED_COLOR if 1 / f >= min(1.0, scale))
+    
+    image = cv2.imread(str(image_path), _CV2_REDUCED_COLOR[factor])
+    if image is None:
+        raise ValueError(f"Cannot read {Path(image_path).name}")
+    
+    return image, image.shape[1] / orig_w
+
+
+def padded_crop_box(
+    top: int, right: int, bottom: int, left: int,
+    width: int, height: int, padding: float = 0.5
+) -> Tuple[int, int, int, int]:
+    """
+    Expand a (top, right, bottom, left) box by ``padding`` of its size, clipped to the image.
+    
+    Returns:
+        (top, right, bottom, left) of the crop region
+    """
+    pad_x = int((right - left) * padding)
+    pad_y = int((bottom - top) * padding)
+    return (
+        max(0, top - pad_y),
+        min(width, right + pad_x),
+        min(height, bottom + pad_y),
+        max(0, left - pad_x)
+    )
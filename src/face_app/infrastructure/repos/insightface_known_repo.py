@@ -1,98 +1,143 @@
 """Filesystem repository for loading known faces using InsightFace."""
-from typing import List, Tuple
+from typing import Optional
 from pathlib import Path
 import numpy as np
-import cv2
 from insightface.app import FaceAnalysis
-from face_app.domain.ports import KnownFaceRepoPort
-from face_app.config.settings import KNOWN_FACES_DIR, INSIGHTFACE_MODEL, INSIGHTFACE_CTX_ID
+from face_app.infrastructure.repos.image_folder_repo import ImageFolderKnownRepo
+from face_app.infrastructure.repos.image_loading import image_size, load_bgr_reduced, padded_crop_box
+from face_app.config.settings import (
+    KNOWN_FACES_DIR, INSIGHTFACE_MODEL, INSIGHTFACE_CTX_ID, ENABLE_EMBEDDING_CACHE, ENROLL_WORKERS,
+    ENROLL_DETECT_MAX_SIDE, ENROLL_MIN_FACE_SIZE
+)
 
 
-class InsightFaceKnownRepo(KnownFaceRepoPort):
+def create_face_analysis(model_name: str, ctx_id: int) -> FaceAnalysis:
+    """Create and prepare an InsightFace FaceAnalysis (one ONNX session set)."""
+    app = FaceAnalysis(
+        name=model_name,
+        providers=['CPUExecutionProvider'] if ctx_id == -1 else ['CUDAExecutionProvider']
+    )
+    app.prepare(ctx_id=ctx_id, det_size=(640, 640))
+    return app
+
+
+def encode_image_with(
+    app: FaceAnalysis,
+    image_path: Path,
+    detect_max_side: int = ENROLL_DETECT_MAX_SIDE,
+    min_face_size: int = ENROLL_MIN_FACE_SIZE
+) -> Optional[np.ndarray]:
+    """
+    Encode the first face found in an image.
+    
+    The photo is decoded with IMREAD_REDUCED_COLOR_* so large JPEGs never
+    materialize at full resolution. A face that ends up smaller than
+    min_face_size is re-embedded from a finer-scale padded crop.
+    
+    Args:
+        app: Prepared FaceAnalysis
+        image_path: Path to image file
+        detect_max_side: Target long side of the image used for detection
+        min_face_size: Minimum face width (pixels) used for embedding
+        
+    Returns:
+        512-dimensional embedding or None if no face detected
+    """
+    # Load reduced-size image with OpenCV (BGR)
+    orig_w, orig_h = image_size(image_path)
+    image, scale = load_bgr_reduced(image_path, detect_max_side / max(orig_w, orig_h))
+    
+    # Get faces with InsightFace
+    faces = app.get(image)
+    
+    if not faces:
+        return None
+    
+    # Use the first detected face
+    face = faces[0]
+    left, top, right, bottom = face.bbox
+    
+    if scale >= 1.0 or right - left >= min_face_size:
+        return face.embedding
+    
+    # Face too small at this scale: re-decode finer and embed from a crop around it
+    fine, fine_scale = load_bgr_reduced(image_path, min_face_size * scale / (right - left))
+    ratio = fine_scale / scale
+    crop_top, crop_right, crop_bottom, crop_left = padded_crop_box(
+        int(top * ratio), int(right * ratio), int(bottom * ratio), int(left * ratio),
+        fine.shape[1], fine.shape[0]
+    )
+    crop_faces = app.get(np.ascontiguousarray(fine[crop_top:crop_bottom, crop_left:crop_right]))
+    
+    if not crop_faces:
+        return face.embedding
+    
+    # The padded crop is centered on our face, so keep the largest detection
+    largest = max(crop_faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
+    return largest.embedding
+
+
+# Per-process FaceAnalysis used by enrollment pool workers
+_worker_app: Optional[FaceAnalysis] = None
+
+
+def _init_enroll_worker(model_name: str, ctx_id: int) -> None:
+    """Process pool initializer: one ONNX session set per worker."""
+    global _worker_app
+    _worker_app = create_face_analysis(model_name, ctx_id)
+
+
+def _encode_in_worker(image_path: Path) -> Optional[np.ndarray]:
+    """Encode an image with this worker's FaceAnalysis."""
+    return encode_image_with(_worker_app, image_path)
+
+
+class InsightFaceKnownRepo(ImageFolderKnownRepo):
     """Load known faces from filesystem using InsightFace."""
     
+    engine_name = "insightface"
+    
     def __init__(
         self, 
         dataset_path: Path = KNOWN_FACES_DIR,
         model_name: str = INSIGHTFACE_MODEL,
-        ctx_id: int = INSIGHTFACE_CTX_ID
+        ctx_id: int = INSIGHTFACE_CTX_ID,
+        use_cache: bool = ENABLE_EMBEDDING_CACHE,
+        workers: int = ENROLL_WORKERS
     ):
         """
         Initialize repository with InsightFace.
         
+        The model is loaded lazily, so a fully cached dataset never loads it.
+        
         Args:
             dataset_path: Path to known_faces directory
             model_name: InsightFace model name
             ctx_id: Device ID (-1 for CPU)
+            use_cache: Reuse embeddings from the on-disk cache
+            workers: Enrollment processes (1 = serial, 0 = one per CPU core)
         """
-        self.dataset_path = dataset_path
-        self.app = FaceAnalysis(
-            name=model_name,
-            providers=['CPUExecutionProvider'] if ctx_id == -1 else ['CUDAExecutionProvider']
-        )
-        self.app.prepare(ctx_id=ctx_id, det_size=(640, 640))
+        super().__init__(dataset_path, use_cache=use_cache, workers=workers)
+        self.model_name = model_name
+        self.ctx_id = ctx_id
+        self._app = None
     
-    def load_known_faces(self) -> Tuple[List[np.ndarray], List[str]]:
-        """
-        Load all known faces from dataset using InsightFace.
-        
-        Returns:
-            (encodings, names) - lists of same length
-        """
-        known_encodings = []
-        known_names = []
-        
-        if not self.dataset_path.exists():
-            print(f"⚠️  Dataset path not found: {self.dataset_path}")
-            return [], []
-        
-        person_folders = [f for f in self.dataset_path.iterdir() if f.is_dir()]
-        
-        if not person_folders:
-            print(f"⚠️  No person folders found in {self.dataset_path}")
-            return [], []
-        
-        print(f"📂 Loading known faces from {self.dataset_path}...")
-        
-        for person_folder in person_folders:
-            person_name = person_folder.name
-            
-            image_files = list(person_folder.glob("*.jpg")) + \
-                         list(person_folder.glob("*.jpeg")) + \
-                         list(person_folder.glob("*.png"))
-            
-            if not image_files:
-                print(f"⚠️  No images found for {person_name}")
-                continue
-            
-            print(f"   Loading {person_name} ({len(image_files)} images)...", end=" ")
-            
-            person_encodings_count = 0
-            
-            for image_path in image_files:
-                try:
-                    # Load image with OpenCV (BGR)
-                    image = cv2.imread(str(image_path))
-                    if image is None:
-                        print(f"\n      ⚠️  Cannot read {image_path.name}")
-                        continue
-                    
-                    # Get faces with InsightFace
-                    faces = self.app.get(image)
-                    
-                    if faces:
-                        # Use the first detected face
-                        known_encodings.append(faces[0].embedding)
-                        known_names.append(person_name)
-                        person_encodings_count += 1
-                    else:
-                        print(f"\n      ⚠️  No face detected in {image_path.name}")
-                
-                except Exception as e:
-                    print(f"\n      ❌ Error loading {image_path.name}: {e}")
-            
-            print(f"✅ {person_encodings_count} faces loaded")
-        
-        print(f"\n✅ Total: {len(known_encodings)} face encodings from {len(set(known_names))} people\n")
-        
-        return known_encodings, known_names
+    @property
+    def app(self) -> FaceAnalysis:
+        """InsightFace FaceAnalysis instance (created on first use)."""
+        if self._app is None:
+            self._app = create_face_analysis(self.model_name, self.ctx_id)
+        return self._app
+    
+    @property
+    def model_key(self) -> str:
+        """Cache key: InsightFace model pack, detection image size and minimum face size."""
+        return f"{self.model_name}-d{ENROLL_DETECT_MAX_SIDE}-f{ENROLL_MIN_FACE_SIZE}"
+    
+    def _encode_image(self, image_path: Path) -> Optional[np.ndarray]:
+        """Encode the first face found in an image."""
+        return encode_image_with(self.app, image_path)
+    
+    def _worker_spec(self):
+        """Each worker process builds its own FaceAnalysis in the initializer."""
+        return _encode_in_worker, _init_enroll_worker, (self.model_name, self.ctx_id)
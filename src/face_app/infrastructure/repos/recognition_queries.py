@@ -0,0 +1,155 @@
+"""Read queries on the recognitions table shared by the repo, the API and the dashboard."""
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+EVENT_COLUMNS = ("id", "name", "time", "camera_id", "distance", "track_id")
+
+
+def to_epoch_ms(value) -> Optional[int]:
+    """
+    Epoch milliseconds of a local datetime or a TIME_FORMAT / ISO string.
+
+    Returns:
+        Milliseconds, or None when the text is not a timestamp
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.strptime(value, TIME_FORMAT)
+        except ValueError:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    return int(value.timestamp() * 1000)
+
+
+def day_range_ms(day: date) -> Tuple[int, int]:
+    """[start, end) epoch milliseconds of a local calendar day."""
+    start = datetime.combine(day, datetime.min.time())
+    return to_epoch_ms(start), to_epoch_ms(start + timedelta(days=1))
+
+
+def recent_events(
+    conn: sqlite3.Connection,
+    limit: int = 100,
+    names: Optional[Sequence[str]] = None,
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None,
+    columns: Sequence[str] = EVENT_COLUMNS
+) -> List[tuple]:
+    """
+    Newest events first, optionally for some people and a time range.
+
+    Filters are index range scans: (name, ts) for names, (ts) for a range.
+
+    Args:
+        conn: Database connection
+        limit: Maximum number of rows
+        names: Only these people (None = everyone)
+        since_ms: Inclusive lower bound on ts
+        until_ms: Exclusive upper bound on ts
+        columns: Columns to return (subset of EVENT_COLUMNS)
+
+    Returns:
+        Rows as tuples in ``columns`` order
+    """
+    unknown = set(columns) - set(EVENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown event columns: {sorted(unknown)}")
+
+    where, params = [], []
+    if names:
+        where.append(f"name IN ({', '.join('?' * len(names))})")
+        params.extend(names)
+    if since_ms is not None:
+        where.append("ts >= ?")
+        params.append(since_ms)
+    if until_ms is not None:
+        where.append("ts < ?")
+        params.append(until_ms)
+
+    query = f"SELECT {', '.join(columns)} FROM recognitions"
+    if where:
+        query += " WHERE " + " AND ".join(where) + " ORDER BY ts DESC, id DESC"
+    else:
+        # Newest rows are the highest ids: read backwards from the end of the table
+        query += " ORDER BY id DESC"
+    query += " LIMIT ?"
+    params.append(limit)
+
+    return conn.execute(query, params).fetchall()
+
+
+def last_event_time(conn: sqlite3.Connection, name: str) -> Optional[str]:
+    """Time text of a person's newest event (None if never seen)."""
+    row = conn.execute(
+        "SELECT time FROM recognitions WHERE name = ? ORDER BY ts DESC, id DESC LIMIT 1",
+        (name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def distinct_names(conn: sqlite3.Connection) -> List[str]:
+    """
+    Every name in the table, sorted.
+
+    Hops through the (name, ts) index one name at a time (loose index scan),
+    so the cost follows the number of people, not the number of events.
+    """
+    rows = conn.execute("""
+        WITH RECURSIVE names(name) AS (
+            SELECT MIN(name) FROM recognitions
+            UNION ALL
+            SELECT (SELECT MIN(name) FROM recognitions WHERE name > names.name)
+            FROM names WHERE names.name IS NOT NULL
+        )
+        SELECT name FROM names WHERE name IS NOT NULL
+    """).fetchall()
+    return [row[0] for row in rows]
+
+
+def count_events(conn: sqlite3.Connection, since_ms: Optional[int] = None, until_ms: Optional[int] = None) -> int:
+    """Events in [since_ms, until_ms) (everything when both are None)."""
+    if since_ms is None and until_ms is None:
+        return conn.execute("SELECT COUNT(*) FROM recognitions").fetchone()[0]
+    return conn.execute(
+        "SELECT COUNT(*) FROM recognitions WHERE ts >= ? AND ts < ?",
+        (since_ms if since_ms is not None else 0, until_ms if until_ms is not None else 2 ** 62)
+    ).fetchone()[0]
+
+
+def event_stats(conn: sqlite3.Connection, today: Optional[date] = None) -> dict:
+    """
+    Totals shown by the API (/stats) and the dashboard.
+
+    Read from the trigger-maintained rollup tables: a handful of primary-key
+    lookups whatever the size of the history. Counts include events that
+    retention has since removed from ``recognitions``.
+
+    Args:
+        conn: Database connection
+        today: Day counted as "today" (default: local date)
+
+    Returns:
+        {"total", "unique_people", "today", "most_frequent": (name, count) or None}
+    """
+    totals = conn.execute("SELECT events, people FROM recognition_totals WHERE id = 1").fetchone()
+    today_count = conn.execute(
+        "SELECT COALESCE(SUM(count), 0) FROM recognition_daily WHERE day = ?",
+        ((today or date.today()).isoformat(),)
+    ).fetchone()[0]
+    most_frequent = conn.execute(
+        "SELECT name, count FROM recognition_people ORDER BY count DESC LIMIT 1"
+    ).fetchone()
+
+    return {
+        "total": totals[0] if totals else 0,
+        "unique_people": totals[1] if totals else 0,
+        "today": today_count,
+        "most_frequent": tuple(most_frequent) if most_frequent else None,
+    }
@@ -0,0 +1,307 @@
+"""Retention for recognition events: archive expired rows, delete them in chunks, return the space."""
+import csv
+import gzip
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+from face_app.config.settings import (
+    DB_PATH, RETENTION_RAW_DAYS, RETENTION_HOURLY_DAYS, RETENTION_ARCHIVE_DIR, RETENTION_ARCHIVE_FORMAT,
+    RETENTION_CHUNK_SIZE, RETENTION_CHUNK_PAUSE, RETENTION_VACUUM_PAGES
+)
+from .recognition_schema import connect, migrate
+from .recognition_queries import EVENT_COLUMNS, to_epoch_ms
+
+
+ARCHIVE_CSV = "csv"
+ARCHIVE_PARQUET = "parquet"
+ARCHIVE_FORMATS = (ARCHIVE_CSV, ARCHIVE_PARQUET)
+
+# Archived columns (ts last, so archives can be re-imported as-is)
+ARCHIVE_COLUMNS = EVENT_COLUMNS + ("ts",)
+
+# PRAGMA auto_vacuum value of INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class RetentionReport:
+    """What one retention run did."""
+    cutoff: Optional[str] = None  # Raw events before this local time expired (None = kept forever)
+    expired: int = 0
+    archived: int = 0
+    deleted: int = 0
+    hourly_deleted: int = 0
+    archive_path: Optional[Path] = None
+    pages_freed: int = 0
+    seconds: float = 0.0
+
+
+class _CsvArchive:
+    """Gzip CSV archive, written to a temporary name and renamed when complete."""
+    
+    suffix = ".csv.gz"
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._partial = path.with_name(path.name + ".partial")
+        self._file = gzip.open(self._partial, "wt", compresslevel=6, newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(ARCHIVE_COLUMNS)
+    
+    def write(self, rows: List[tuple]) -> None:
+        """Append a chunk of rows."""
+        self._writer.writerows(rows)
+    
+    def close(self) -> None:
+        """Finish the file and give it its final name."""
+        self._file.close()
+        os.replace(self._partial, self.path)
+    
+    def abort(self) -> None:
+        """Discard the unfinished file."""
+        self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+
+class _ParquetArchive:
+    """Parquet archive (one row group per chunk), written to a temporary name and renamed when complete."""
+    
+    suffix = ".parquet"
+    
+    def __init__(self, path: Path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        self._pa = pa
+        self.path = path
+        self._partial = path.with_name(path.name + ".partial")
+        self._schema = pa.schema([
+            ("id", pa.int64()), ("name", pa.string()), ("time", pa.string()), ("camera_id", pa.string()),
+            ("distance", pa.float64()), ("track_id", pa.int64()), ("ts", pa.int64()),
+        ])
+        self._writer = pq.ParquetWriter(str(self._partial), self._schema, compression="zstd")
+    
+    def write(self, rows: List[tuple]) -> None:
+        """Append a chunk of rows."""
+        columns = list(zip(*rows))
+        self._writer.write_table(self._pa.table(
+            {name: list(values) for name, values in zip(ARCHIVE_COLUMNS, columns)},
+            schema=self._schema
+        ))
+    
+    def close(self) -> None:
+        """Finish the file and give it its final name."""
+        self._writer.close()
+        os.replace(self._partial, self.path)
+    
+    def abort(self) -> None:
+        """Discard the unfinished file."""
+        self._writer.close()
+        self._partial.unlink(missing_ok=True)
+
+
+def _archive_class(archive_format: str):
+    """Writer class for a format; parquet falls back to CSV without pyarrow."""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format: {archive_format} (expected one of {ARCHIVE_FORMATS})")
+    if archive_format == ARCHIVE_PARQUET:
+        try:
+            import pyarrow.parquet  # noqa: F401
+            return _ParquetArchive
+        except ImportError:
+            print("⚠️  pyarrow not installed, archiving as gzip CSV")
+    return _CsvArchive
+
+
+class RetentionJob:
+    """
+    Keeps the recognitions table to a bounded window.
+    
+    Raw events older than ``raw_days`` are first exported to one archive
+    file (complete before anything is deleted), then deleted in chunks of
+    ``chunk_size`` rows, each in its own short transaction, so the app's
+    writer only ever waits for one chunk. Freed pages are returned to the
+    file system with incremental vacuum and the WAL is truncated, which keeps
+    the database and its indexes small enough to stay in the page cache.
+    
+    Rollups are maintained by insert triggers only, so deleting raw events
+    does not change them; hourly rollups can be expired separately.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path = DB_PATH,
+        raw_days: int = RETENTION_RAW_DAYS,
+        hourly_days: int = RETENTION_HOURLY_DAYS,
+        archive_dir: Optional[Path] = RETENTION_ARCHIVE_DIR,
+        archive_format: str = RETENTION_ARCHIVE_FORMAT,
+        chunk_size: int = RETENTION_CHUNK_SIZE,
+        chunk_pause: float = RETENTION_CHUNK_PAUSE,
+        vacuum_pages: int = RETENTION_VACUUM_PAGES
+    ):
+        """
+        Args:
+            db_path: SQLite database file
+            raw_days: Keep raw events this many days (0 = forever)
+            hourly_days: Keep hourly rollups this many days (0 = forever)
+            archive_dir: Export expired events here (None = delete without archiving)
+            archive_format: "csv" (gzip) or "parquet"
+            chunk_size: Rows read or deleted per statement
+            chunk_pause: Seconds between delete chunks (lets the app's writer in)
+            vacuum_pages: Pages freed per incremental_vacuum step
+        """
+        self.db_path = db_path
+        self.raw_days = raw_days
+        self.hourly_days = hourly_days
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.archive_class = _archive_class(archive_format)
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_pause = chunk_pause
+        self.vacuum_pages = max(1, vacuum_pages)
+    
+    def run(self, now: Optional[datetime] = None, dry_run: bool = False) -> RetentionReport:
+        """
+        Archive and delete expired events, expire hourly rollups, vacuum.
+        
+        Args:
+            now: Reference time (default: local now)
+            dry_run: Only count what would expire
+        
+        Returns:
+            RetentionReport
+        """
+        started = time.perf_counter()
+        now = now or datetime.now()
+        report = RetentionReport()
+        
+        conn = connect(self.db_path)
+        try:
+            migrate(conn)
+            
+            if self.raw_days > 0:
+                cutoff = now - timedelta(days=self.raw_days)
+                report.cutoff = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+                cutoff_ms = to_epoch_ms(cutoff)
+                report.expired = conn.execute(
+                    "SELECT COUNT(*) FROM recognitions WHERE ts < ?", (cutoff_ms,)
+                ).fetchone()[0]
+                
+                if report.expired and not dry_run:
+                    max_id = conn.execute("SELECT MAX(id) FROM recognitions").fetchone()[0]
+                    if self.archive_dir:
+                        report.archive_path, report.archived, max_id = self._archive(conn, cutoff_ms)
+                    report.deleted = self._delete(conn, cutoff_ms, max_id)
+            
+            if self.hourly_days > 0 and not dry_run:
+                hourly_cutoff_ms = to_epoch_ms(now - timedelta(days=self.hourly_days))
+                with conn:
+                    report.hourly_deleted = conn.execute(
+                        "DELETE FROM recognition_hourly WHERE hour_ts < ?", (hourly_cutoff_ms,)
+                    ).rowcount
+            
+            if not dry_run:
+                report.pages_freed = self._vacuum(conn)
+        finally:
+            conn.close()
+        
+        report.seconds = time.perf_counter() - started
+        return report
+    
+    def enable_incremental_vacuum(self) -> None:
+        """
+        Convert a database created before auto_vacuum=INCREMENTAL.
+        
+        Runs a full VACUUM once, which rewrites the file and holds the write
+        lock until it finishes: do it while the app is stopped.
+        """
+        conn = connect(self.db_path)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+                return
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            print("🗜️  Database converted to incremental vacuum")
+        finally:
+            conn.close()
+    
+    def _archive(self, conn: sqlite3.Connection, cutoff_ms: int) -> tuple:
+        """
+        Export every event with ts < cutoff_ms, oldest first.
+        
+        Returns:
+            (archive path, rows written, highest archived id)
+        """
+        first_ts, last_ts = conn.execute(
+            "SELECT MIN(ts), MAX(ts) FROM recognitions WHERE ts < ?", (cutoff_ms,)
+        ).fetchone()
+        stamp = "%Y%m%d-%H%M%S"
+        name = (f"recognitions_{datetime.fromtimestamp(first_ts / 1000).strftime(stamp)}"
+                f"_{datetime.fromtimestamp(last_ts / 1000).strftime(stamp)}{self.archive_class.suffix}")
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        archive = self.archive_class(self.archive_dir / name)
+        
+        # Keyset pagination on the (ts) index: every chunk is a fresh, short read
+        query = (f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM recognitions "
+                 "WHERE ts < ? AND (ts, id) > (?, ?) ORDER BY ts, id LIMIT ?")
+        written, max_id, last = 0, 0, (-1, -1)
+        try:
+            while True:
+                rows = conn.execute(query, (cutoff_ms, *last, self.chunk_size)).fetchall()
+                if not rows:
+                    break
+                archive.write(rows)
+                written += len(rows)
+                max_id = max(max_id, max(row[0] for row in rows))
+                last = (rows[-1][-1], rows[-1][0])
+            archive.close()
+        except BaseException:
+            archive.abort()
+            raise
+        
+        return archive.path, written, max_id
+    
+    def _delete(self, conn: sqlite3.Connection, cutoff_ms: int, max_id: int) -> int:
+        """
+        Delete events with ts < cutoff_ms and id <= max_id in chunks.
+        
+        ``max_id`` bounds the delete to rows that existed (and were archived)
+        when the run started.
+        """
+        deleted = 0
+        while True:
+            with conn:
+                count = conn.execute(
+                    "DELETE FROM recognitions WHERE id IN "
+                    "(SELECT id FROM recognitions WHERE ts < ? AND id <= ? ORDER BY ts LIMIT ?)",
+                    (cutoff_ms, max_id, self.chunk_size)
+                ).rowcount
+            deleted += count
+            if count < self.chunk_size:
+                return deleted
+            time.sleep(self.chunk_pause)
+    
+    def _vacuum(self, conn: sqlite3.Connection) -> int:
+        """Return free pages to the file system a step at a time, then truncate the WAL."""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != _AUTO_VACUUM_INCREMENTAL:
+            print("💡 Database does not use incremental vacuum, the file will not shrink "
+                  "(run_retention.py --enable-incremental-vacuum converts it once)")
+            return 0
+        
+        freed = 0
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        while free:
+            conn.execute(f"PRAGMA incremental_vacuum({min(free, self.vacuum_pages)})").fetchall()
+            conn.commit()
+            remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if remaining >= free:
+                break
+            freed += free - remaining
+            free = remaining
+            time.sleep(self.chunk_pause)
+        
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return freed
@@ -0,0 +1,254 @@
+"""Recognition database connection and versioned schema migrations (PRAGMA user_version)."""
+import sqlite3
+from pathlib import Path
+from typing import Callable, List
+from face_app.config.settings import DB_SYNCHRONOUS, DB_BUSY_TIMEOUT_MS
+
+
+def connect(
+    db_path: Path,
+    synchronous: str = DB_SYNCHRONOUS,
+    busy_timeout_ms: int = DB_BUSY_TIMEOUT_MS
+) -> sqlite3.Connection:
+    """
+    Open a connection in WAL mode.
+
+    WAL lets the API and the dashboard read while the app writes; readers
+    never block the writer and the writer never blocks readers. With
+    synchronous=NORMAL a commit does not fsync (the WAL is synced at
+    checkpoints), so an OS crash can lose the last commits but never
+    corrupts the database.
+
+    Args:
+        db_path: SQLite database file
+        synchronous: PRAGMA synchronous (OFF, NORMAL, FULL)
+        busy_timeout_ms: How long a statement waits for a lock before failing
+
+    Returns:
+        Connection usable from any thread (callers serialize access)
+    """
+    conn = sqlite3.connect(str(db_path), timeout=busy_timeout_ms / 1000, check_same_thread=False)
+    # Only takes effect on a new database; retention converts older ones
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    return conn
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: dict) -> None:
+    """ALTER TABLE ADD COLUMN for every column the table does not have yet."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for column, definition in columns.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    """
+    Integer timestamps, event details and indexes.
+
+    ``ts`` is epoch milliseconds (UTC) of the local ``time`` text, which is
+    kept for compatibility. Databases from before multi-camera support also
+    get ``camera_id`` here.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS recognitions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            time TEXT NOT NULL,
+            camera_id TEXT
+        )
+    """)
+    _add_missing_columns(conn, "recognitions", {
+        "camera_id": "TEXT",
+        "ts": "INTEGER",
+        "distance": "REAL",
+        "track_id": "INTEGER",
+    })
+
+    # 'utc' converts the local wall-clock text to UTC before taking the epoch
+    conn.execute("""
+        UPDATE recognitions
+        SET ts = CAST(strftime('%s', time, 'utc') AS INTEGER) * 1000
+        WHERE ts IS NULL
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recognitions_name_ts ON recognitions(name, ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recognitions_ts ON recognitions(ts)")
+
+
+_ROLLUP_SCHEMA = (
+    """
+        CREATE TABLE IF NOT EXISTS recognition_hourly (
+            hour_ts INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (hour_ts, name)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS recognition_daily (
+            day TEXT NOT NULL,
+            name TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (day, name)
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS recognition_people (
+            name TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            first_ts INTEGER,
+            last_ts INTEGER
+        ) WITHOUT ROWID
+    """,
+    """
+        CREATE INDEX IF NOT EXISTS idx_recognition_people_count ON recognition_people(count)
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS recognition_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            events INTEGER NOT NULL,
+            people INTEGER NOT NULL
+        )
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS trg_recognitions_rollup
+        AFTER INSERT ON recognitions
+        BEGIN
+            INSERT INTO recognition_hourly (hour_ts, name, count)
+            SELECT NEW.ts / 3600000 * 3600000, NEW.name, 1 WHERE NEW.ts IS NOT NULL
+            ON CONFLICT (hour_ts, name) DO UPDATE SET count = count + 1;
+
+            INSERT INTO recognition_daily (day, name, count)
+            VALUES (substr(NEW.time, 1, 10), NEW.name, 1)
+            ON CONFLICT (day, name) DO UPDATE SET count = count + 1;
+
+            INSERT INTO recognition_people (name, count, first_ts, last_ts)
+            VALUES (NEW.name, 1, NEW.ts, NEW.ts)
+            ON CONFLICT (name) DO UPDATE SET
+                count = count + 1,
+                first_ts = coalesce(min(first_ts, excluded.first_ts), first_ts, excluded.first_ts),
+                last_ts = coalesce(max(last_ts, excluded.last_ts), last_ts, excluded.last_ts);
+
+            UPDATE recognition_totals SET events = events + 1 WHERE id = 1;
+        END
+    """,
+    """
+        CREATE TRIGGER IF NOT EXISTS trg_recognition_people_count
+        AFTER INSERT ON recognition_people
+        BEGIN
+            UPDATE recognition_totals SET people = people + 1 WHERE id = 1;
+        END
+    """,
+)
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """
+    Recompute every rollup table from the raw events.
+
+    The triggers keep the rollups current; this is only needed to seed them
+    or after editing ``recognitions`` by hand. Events already removed by
+    retention are no longer counted afterwards.
+    """
+    conn.execute("DELETE FROM recognition_hourly")
+    conn.execute("DELETE FROM recognition_daily")
+    conn.execute("DELETE FROM recognition_people")
+    conn.execute("""
+        INSERT INTO recognition_hourly (hour_ts, name, count)
+        SELECT ts / 3600000 * 3600000, name, COUNT(*)
+        FROM recognitions WHERE ts IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    conn.execute("""
+        INSERT INTO recognition_daily (day, name, count)
+        SELECT substr(time, 1, 10), name, COUNT(*)
+        FROM recognitions
+        GROUP BY 1, 2
+    """)
+    conn.execute("""
+        INSERT INTO recognition_people (name, count, first_ts, last_ts)
+        SELECT name, COUNT(*), MIN(ts), MAX(ts)
+        FROM recognitions
+        GROUP BY name
+    """)
+    # The people trigger counted the rows above: overwrite with the real totals
+    conn.execute("""
+        INSERT OR REPLACE INTO recognition_totals (id, events, people)
+        VALUES (
+            1,
+            (SELECT COUNT(*) FROM recognitions),
+            (SELECT COUNT(*) FROM recognition_people)
+        )
+    """)
+
+
+def _migrate_v2(conn: sqlite3.Connection) -> None:
+    """
+    Rollup tables maintained by triggers, so statistics do not scan events.
+
+    Every insert into ``recognitions`` also bumps, in the same transaction:
+    the person's hourly (epoch-ms hour of ``ts``) and daily (local date of
+    ``time``) counters, the per-person totals and the global totals. Rows
+    removed from ``recognitions`` stay counted: the rollups are the
+    long-term history, raw events can expire.
+    """
+    # One statement per execute(): executescript() would commit the migration transaction
+    for statement in _ROLLUP_SCHEMA:
+        conn.execute(statement)
+    rebuild_rollups(conn)
+
+
+# MIGRATIONS[i] upgrades a database from user_version i to i + 1
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _migrate_v1,
+    _migrate_v2,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Current PRAGMA user_version of the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply pending migrations, one transaction each.
+
+    Safe with several processes starting at once: each migration takes the
+    write lock first and re-reads the version.
+
+    Returns:
+        Schema version after migrating
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return schema_version(conn)
+
+    for target, migration in enumerate(MIGRATIONS, start=1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= target:
+                conn.rollback()
+                continue
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"🗃️  Database schema migrated to v{target}")
+
+    return schema_version(conn)
+
+
+def open_database(db_path: Path) -> sqlite3.Connection:
+    """WAL connection to an up-to-date database (created if missing)."""
+    conn = connect(db_path)
+    try:
+        migrate(conn)
+    except Exception:
+        conn.close()
+        raise
+    return conn
@@ -1,58 +1,122 @@
-"""SQLite repository for recognition events (name + time only)."""
+"""SQLite repository for recognition events (name + time, optional camera id)."""
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+from time import monotonic, perf_counter
 from pathlib import Path
-from face_app.domain.ports import RecognitionRepoPort
-from face_app.config.settings import DB_PATH
+from typing import Dict, List, Optional, Tuple
+from face_app.domain.ports import RecognitionRepoPort, MetricsPort, NULL_METRICS
+from face_app.config.settings import (
+    DB_PATH, DB_ASYNC_WRITES, DB_WRITE_QUEUE_SIZE, DB_WRITE_BATCH_SIZE, DB_WRITE_FLUSH_INTERVAL
+)
+from .recognition_schema import connect, migrate
+from .recognition_queries import to_epoch_ms, last_event_time, recent_events
+
+
+# (name, time, ts, camera_id, distance, track_id)
+Event = Tuple[str, str, Optional[int], Optional[str], Optional[float], Optional[int]]
+
+# Queue item that tells the writer thread to finish
+_STOP = object()
+
+# Seconds between two "queue full" warnings
+DROP_WARNING_INTERVAL = 5.0
 
 
 class SQLiteRecognitionRepo(RecognitionRepoPort):
-    """SQLite adapter for persisting recognition events."""
+    """
+    SQLite adapter for persisting recognition events.
     
-    def __init__(self, db_path: Path = DB_PATH):
+    Keeps one connection open for the lifetime of the repo. With async
+    writes, insert_event only puts the event on a bounded queue; a writer
+    thread commits it together with whatever else arrived within
+    ``flush_interval`` (at most ``batch_size`` events per transaction), so
+    the recognition thread never waits for the disk. A full queue drops the
+    event with a warning. close() writes everything still queued.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path = DB_PATH,
+        metrics: Optional[MetricsPort] = None,
+        async_writes: bool = DB_ASYNC_WRITES,
+        queue_size: int = DB_WRITE_QUEUE_SIZE,
+        batch_size: int = DB_WRITE_BATCH_SIZE,
+        flush_interval: float = DB_WRITE_FLUSH_INTERVAL
+    ):
         """
         Initialize SQLite repository.
         
         Args:
             db_path: Path to SQLite database file
+            metrics: Optional metrics registry (write latency, failed and dropped writes)
+            async_writes: Write from a background thread in batches (False = commit in insert_event)
+            queue_size: Events waiting for the writer before new ones are dropped
+            batch_size: Most events committed in one transaction
+            flush_interval: Seconds the writer waits for more events before committing
         """
         self.db_path = db_path
-        self._init_database()
-    
-    def _init_database(self) -> None:
-        """Create table if not exists."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        self.metrics = metrics or NULL_METRICS
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        
+        self._conn = connect(db_path)
+        self._conn_lock = threading.Lock()
+        with self._conn_lock:
+            migrate(self._conn)
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS recognitions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                time TEXT NOT NULL
-            )
-        """)
+        # Latest time per name written by this process, queued or not (read-your-writes)
+        self._last_times: Dict[str, str] = {}
+        self._last_drop_warning = 0.0
+        self._closed = False
         
-        conn.commit()
-        conn.close()
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if async_writes:
+            self._queue = queue.Queue(maxsize=max(1, queue_size))
+            self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+            self._writer.start()
     
-    def insert_event(self, name: str, time: str) -> None:
+    def insert_event(
+        self,
+        name: str,
+        time: str,
+        camera_id: Optional[str] = None,
+        distance: Optional[float] = None,
+        track_id: Optional[int] = None
+    ) -> None:
         """
         Insert a recognition event.
         
         Args:
             name: Person name or "Stranger"
             time: Timestamp in ISO format (YYYY-MM-DD HH:MM:SS)
+            camera_id: Camera that produced the event (None = single-camera app)
+            distance: Gallery distance of the match
+            track_id: Tracker id of the face
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "INSERT INTO recognitions (name, time) VALUES (?, ?)",
-            (name, time)
+        # NumPy scalars (float32 distances) cannot be bound by sqlite3
+        event = (
+            name, time, to_epoch_ms(time), camera_id,
+            None if distance is None else float(distance),
+            None if track_id is None else int(track_id)
         )
+        if self._queue is None:
+            self._write_batch([event], raise_errors=True)
+            self._remember(name, time)
+            return
+        
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.metrics.inc("db_writes_dropped_total")
+            now = monotonic()
+            if now - self._last_drop_warning >= DROP_WARNING_INTERVAL:
+                self._last_drop_warning = now
+                print(f"⚠️  DB write queue full ({self._queue.maxsize}), dropping events")
+            return
         
-        conn.commit()
-        conn.close()
+        self._remember(name, time)
     
     def get_last_event_time(self, name: str) -> str | None:
         """
@@ -60,22 +124,16 @@ class SQLiteRecognitionRepo(RecognitionRepoPort):
         
         Args:
             name: Person name to check
-            
+        
         Returns:
             ISO timestamp string or None if never recognized
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT time FROM recognitions WHERE name = ? ORDER BY id DESC LIMIT 1",
-            (name,)
-        )
+        with self._conn_lock:
+            stored = last_event_time(self._conn, name)
         
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result[0] if result else None
+        # Queued events are not in the table yet
+        times = [t for t in (stored, self._last_times.get(name)) if t]
+        return max(times) if times else None
     
     def get_all_events(self, limit: int = 100) -> list:
         """
@@ -83,19 +141,89 @@ class SQLiteRecognitionRepo(RecognitionRepoPort):
         
         Args:
             limit: Maximum number of records to return
-            
+        
         Returns:
             List of (id, name, time) tuples
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        with self._conn_lock:
+            return recent_events(self._conn, limit, columns=("id", "name", "time"))
+    
+    def flush(self) -> None:
+        """Block until every queued event is committed."""
+        if self._queue is not None and self._writer.is_alive():
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Commit queued events, stop the writer and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
         
-        cursor.execute(
-            "SELECT id, name, time FROM recognitions ORDER BY id DESC LIMIT ?",
-            (limit,)
-        )
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
         
-        results = cursor.fetchall()
-        conn.close()
+        with self._conn_lock:
+            self._conn.close()
+    
+    def _remember(self, name: str, time: str) -> None:
+        """Track the newest event per name."""
+        if time > self._last_times.get(name, ""):
+            self._last_times[name] = time
+    
+    def _write_loop(self) -> None:
+        """Writer thread: commit queued events in batches until _STOP."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            
+            # Gather what arrives within flush_interval, up to batch_size
+            batch = [item]
+            deadline = monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            
+            if self.metrics.enabled:
+                self.metrics.set_gauge("db_write_queue_depth", self._queue.qsize())
+    
+    def _write_batch(self, batch: List[Event], raise_errors: bool = False) -> None:
+        """Insert events in one transaction."""
+        started = perf_counter()
+        try:
+            with self._conn_lock:
+                try:
+                    self._conn.executemany(
+                        "INSERT INTO recognitions (name, time, ts, camera_id, distance, track_id) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        batch
+                    )
+                    self._conn.commit()
+                except sqlite3.Error:
+                    self._conn.rollback()
+                    raise
+        except sqlite3.Error as e:
+            self.metrics.inc("db_write_errors_total", len(batch))
+            if raise_errors:
+                raise
+            print(f"⚠️  DB write failed, {len(batch)} events lost: {e}")
+            return
         
-        return results
+        self.metrics.observe("db_write_seconds", perf_counter() - started)
+        if self.metrics.enabled:
+            self.metrics.observe("db_write_batch_size", len(batch))
@@ -0,0 +1,6 @@
+"""Recognition runtimes - run the recognition stages off the display thread."""
+from face_app.infrastructure.runtime.staged_pipeline import StagedRecognitionPipeline
+from face_app.infrastructure.runtime.process_pipeline import ProcessRecognitionPipeline
+from face_app.infrastructure.runtime.camera_supervisor import CameraStream, CameraSupervisor
+
+__all__ = ["StagedRecognitionPipeline", "ProcessRecognitionPipeline", "CameraStream", "CameraSupervisor"]
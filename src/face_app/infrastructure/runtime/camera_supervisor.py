@@ -0,0 +1,259 @@
+"""Headless multi-camera supervisor - many cameras, one engine pool, one gallery."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from face_app.domain.ports import CameraPort
+from face_app.infrastructure.runtime.staged_pipeline import StageStats
+
+
+@dataclass
+class CameraStream:
+    """One camera and the recognition state that belongs to it."""
+    camera_id: str
+    camera: CameraPort
+    recognize_usecase: object  # Own RecognizeFrameUseCase (motion/ROI state, monitors)
+    fps_budget: float = 5.0  # Max recognitions per second (0 = as often as possible)
+    active: bool = True  # Database logging and alerts for this camera
+    
+    # Scheduler state
+    frame: Optional[np.ndarray] = field(default=None, repr=False)
+    frame_seq: int = 0
+    captured_at: float = 0.0
+    processed_seq: int = 0
+    next_due: float = 0.0
+    busy: bool = False
+    closed: bool = False
+    
+    # Stats
+    captured: int = 0
+    processed: int = 0
+    latency: StageStats = field(default_factory=StageStats, repr=False)
+    last_result: object = field(default=None, repr=False)
+
+
+class CameraSupervisor:
+    """
+    Run recognition for N cameras on a fixed set of worker threads.
+    
+    Every camera has a capture thread that only keeps its newest frame
+    (memory per camera = one frame). Workers pick the camera whose next
+    recognition is due earliest (earliest-deadline-first), honouring each
+    camera's FPS budget; ties go to the camera served least recently, so a
+    busy stream cannot starve the others. A camera is never processed by two
+    workers at once, which keeps its use case state (motion gate, ROI,
+    monitors) sequential.
+    """
+    
+    def __init__(
+        self,
+        streams: List[CameraStream],
+        workers: int = 2,
+        on_result: Optional[Callable[[str, object], None]] = None,
+        read_retry_seconds: float = 0.5
+    ):
+        """
+        Initialize supervisor.
+        
+        Args:
+            streams: Cameras to supervise (camera ids must be unique)
+            workers: Recognition threads (usually the engine pool size)
+            on_result: Optional callback (camera_id, RecognitionResult) after every frame
+            read_retry_seconds: Pause after a failed read before trying again
+        """
+        ids = [stream.camera_id for stream in streams]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate camera ids: {ids}")
+        
+        self.streams: Dict[str, CameraStream] = {stream.camera_id: stream for stream in streams}
+        self.workers = max(1, workers)
+        self.on_result = on_result
+        self.read_retry_seconds = read_retry_seconds
+        
+        self._cond = threading.Condition()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._started_at = 0.0
+    
+    def start(self) -> None:
+        """Start capture threads and recognition workers."""
+        if self._running:
+            return
+        
+        self._running = True
+        self._started_at = time.perf_counter()
+        
+        for stream in self.streams.values():
+            thread = threading.Thread(
+                target=self._capture_loop, args=(stream,),
+                name=f"capture-{stream.camera_id}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"recognition-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        print(f"✅ Supervisor started ({len(self.streams)} cameras, {self.workers} workers)")
+    
+    def stop(self) -> None:
+        """Stop all threads and release the cameras."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+        self._threads = []
+        
+        for stream in self.streams.values():
+            stream.camera.release()
+        print("👋 Supervisor stopped")
+    
+    def run(self, stats_interval: float = 10.0) -> None:
+        """
+        Start, then block printing per-camera stats until interrupted.
+        
+        Args:
+            stats_interval: Seconds between stats reports (0 = never)
+        """
+        self.start()
+        try:
+            next_report = time.monotonic() + stats_interval
+            while self._running:
+                time.sleep(0.5)
+                if all(stream.closed for stream in self.streams.values()):
+                    print("⚠️  All cameras closed")
+                    break
+                if stats_interval > 0 and time.monotonic() >= next_report:
+                    print(self.format_stats())
+                    next_report = time.monotonic() + stats_interval
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrupted by user")
+        finally:
+            self.stop()
+    
+    def set_active(self, camera_id: str, active: bool) -> None:
+        """Enable/disable logging and alerts for one camera (e.g. from a PIR sensor)."""
+        self.streams[camera_id].active = active
+    
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Per-camera counters and latency (capture -> result).
+        
+        Returns:
+            {camera_id: {"captured", "processed", "fps", "p50_ms", "p95_ms", "closed"}}
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        stats = {}
+        for camera_id, stream in self.streams.items():
+            summary = stream.latency.summary()
+            stats[camera_id] = {
+                "captured": stream.captured,
+                "processed": stream.processed,
+                "fps": stream.processed / elapsed if elapsed > 0 else 0.0,
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+                "closed": stream.closed,
+            }
+        return stats
+    
+    def format_stats(self) -> str:
+        """Multi-line report, one camera per line."""
+        lines = ["⏱️  Cameras (recognition FPS, latency p50/p95 ms):"]
+        for camera_id, s in self.get_stats().items():
+            state = " (closed)" if s["closed"] else ""
+            lines.append(
+                f"   {camera_id}: {s['fps']:.1f} FPS, {s['p50_ms']:.1f}/{s['p95_ms']:.1f} ms, "
+                f"{s['processed']}/{s['captured']} frames{state}"
+            )
+        return "\n".join(lines)
+    
+    def _capture_loop(self, stream: CameraStream) -> None:
+        """Keep the newest frame of one camera (older frames are simply replaced)."""
+        # A ThreadedCamera overwrites its ring slots while recognition still reads them
+        reuses_buffers = getattr(stream.camera, "reuses_buffers", False)
+        
+        while self._running:
+            ok, frame = stream.camera.read()
+            
+            if not ok or frame is None:
+                if not stream.camera.is_opened():
+                    print(f"❌ Camera {stream.camera_id} closed")
+                    break
+                time.sleep(self.read_retry_seconds)
+                continue
+            
+            if reuses_buffers:
+                frame = frame.copy()
+            
+            with self._cond:
+                stream.frame = frame
+                stream.frame_seq += 1
+                stream.captured_at = time.perf_counter()
+                stream.captured += 1
+                self._cond.notify()
+        
+        with self._cond:
+            stream.closed = True
+    
+    def _next_stream(self) -> Optional[CameraStream]:
+        """Block until a camera is due, then claim it (None when stopping)."""
+        with self._cond:
+            while self._running:
+                now = time.perf_counter()
+                ready = [
+                    stream for stream in self.streams.values()
+                    if not stream.busy and stream.frame_seq > stream.processed_seq
+                ]
+                
+                if ready:
+                    stream = min(ready, key=lambda s: s.next_due)
+                    if stream.next_due <= now:
+                        stream.busy = True
+                        return stream
+                    # Nothing due yet: sleep until the earliest deadline or a new frame
+                    self._cond.wait(timeout=stream.next_due - now)
+                else:
+                    self._cond.wait(timeout=0.1)
+        return None
+    
+    def _worker_loop(self) -> None:
+        """Recognition worker: serve due cameras one frame at a time."""
+        while self._running:
+            stream = self._next_stream()
+            if stream is None:
+                break
+            
+            with self._cond:
+                frame = stream.frame
+                seq = stream.frame_seq
+                captured_at = stream.captured_at
+            
+            started = time.perf_counter()
+            result = None
+            try:
+                result = stream.recognize_usecase.execute(frame, active=stream.active)
+            except Exception as e:
+                print(f"❌ Recognition error on {stream.camera_id}: {e}")
+            finished = time.perf_counter()
+            
+            with self._cond:
+                stream.processed_seq = seq
+                stream.busy = False
+                # Next deadline from the start of this run keeps the budget exact;
+                # without a budget the least recently served camera goes next
+                period = 1.0 / stream.fps_budget if stream.fps_budget > 0 else 0.0
+                stream.next_due = started + period if period else finished
+                if result is not None:
+                    stream.processed += 1
+                    stream.last_result = result
+                    stream.latency.add(finished - captured_at, finished - started)
+                self._cond.notify_all()
+            
+            if result is not None and self.on_result:
+                self.on_result(stream.camera_id, result)
@@ -0,0 +1,376 @@
+"""Multi-process recognition backend - one face engine per worker, frames in shared memory."""
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from queue import Empty
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from face_app.infrastructure.runtime.staged_pipeline import StagedRecognitionPipeline, _Job
+
+
+# Seconds between checks for dead worker processes
+HEALTH_CHECK_INTERVAL = 0.5
+
+
+class ProcessRecognitionPipeline(StagedRecognitionPipeline):
+    """
+    Run detection + encoding in worker processes.
+    
+    capture -> preprocess (main) -> [shared-memory slot] -> detect+encode (worker N)
+            -> match (main) -> apply in frame order (main)
+    
+    Each worker builds its own engine from ``engine_factory``. Preprocessed
+    frames are copied into a ring of shared-memory slots and only the slot
+    number travels through the task queue, so frames are never pickled.
+    Matching against the (hot-reloadable) gallery, monitors and the
+    database stay in the main process. Same interface as
+    StagedRecognitionPipeline.
+    
+    Every worker has its own task queue, so the main process knows which
+    frames a worker holds. A worker that dies (segfault, OOM) gives its
+    frames up to the apply stage and its slots back, and is respawned; a
+    worker that cannot build its engine fails the pool: submit_frame()
+    raises from then on.
+    """
+    
+    def __init__(
+        self,
+        recognize_usecase,
+        engine_factory: Callable[[], object],
+        workers: int = 0,
+        slots: int = 0,
+        queue_size: int = 2,
+        stats_window: int = 200
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            recognize_usecase: RecognizeFrameUseCase exposing the stage methods
+            engine_factory: Picklable callable creating a FaceEnginePort in a worker
+                (e.g. functools.partial(FRDlibEngine, model="hog"))
+            workers: Worker processes (0 = one per CPU core)
+            slots: Shared-memory frame slots (0 = 2 per worker)
+            queue_size: Capacity of the in-process queues
+            stats_window: Frames kept for latency percentiles
+        """
+        if not getattr(recognize_usecase, "parallel_stages", True):
+            raise ValueError("Tracking use case keeps state between frames; use StagedRecognitionPipeline")
+        
+        super().__init__(recognize_usecase, queue_size=queue_size, stats_window=stats_window)
+        self.engine_factory = engine_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = slots or self.workers * 2
+        
+        self._mp = mp.get_context("spawn")
+        self._result_queue = None
+        self._task_queues: List = []
+        self._processes: List[Optional[mp.Process]] = []
+        self._ready: List[bool] = []
+        self._last_health_check = 0.0
+        self.error: Optional[str] = None  # Set when the pool cannot work (worker engine failed)
+        
+        # Shared-memory ring, allocated from the first frame's size
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._slot_bytes = 0
+        self._free_slots = None
+        # seq -> (job, worker, slot), and the frames each worker holds
+        self._inflight: Dict[int, Tuple[_Job, int, int]] = {}
+        self._worker_jobs: List[Set[int]] = []
+        self._inflight_lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start worker processes and the main-process threads."""
+        if self._running:
+            return
+        
+        self._running = True
+        self._started_at = time.perf_counter()
+        self._result_queue = self._mp.Queue()
+        
+        for target, name in (
+            (self._dispatch_loop, "pipeline-dispatch"),
+            (self._collect_loop, "pipeline-collect"),
+            (self._apply_loop, "pipeline-apply"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        print(f"✅ Recognition process pool starting ({self.workers} workers, {self.slots} frame slots)")
+    
+    def stop(self) -> None:
+        """Stop threads and workers, free shared memory."""
+        if not self._running:
+            return
+        
+        self._running = False
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+        self._threads = []
+        
+        for task_queue in self._task_queues:
+            if task_queue is not None:
+                task_queue.put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._task_queues = []
+        
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        
+        print("👋 Recognition process pool stopped")
+    
+    def _ensure_workers(self, frame_bytes: int) -> None:
+        """Allocate the slot ring and spawn workers (first frame only)."""
+        if self._shm is not None:
+            return
+        
+        # Room for a full-resolution RGB frame (ROI mode) in every slot
+        self._slot_bytes = frame_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=self._slot_bytes * self.slots)
+        
+        self._free_slots = queue.Queue()
+        for slot in range(self.slots):
+            self._free_slots.put(slot)
+        
+        self._processes = [None] * self.workers
+        self._task_queues = [None] * self.workers
+        self._ready = [False] * self.workers
+        self._worker_jobs = [set() for _ in range(self.workers)]
+        for index in range(self.workers):
+            self._task_queues[index] = self._mp.Queue()
+            self._spawn_worker(index)
+    
+    @property
+    def capacity(self) -> int:
+        """Frames in flight without drops: one per shared-memory slot (dispatch drops when none is free)."""
+        return self.slots
+    
+    def submit_frame(self, frame: np.ndarray, active: bool = True) -> int:
+        """Submit a frame (see StagedRecognitionPipeline); raises once the pool has failed."""
+        if self.error is not None:
+            raise RuntimeError(f"Recognition process pool failed: {self.error}")
+        return super().submit_frame(frame, active)
+    
+    def _spawn_worker(self, index: int) -> None:
+        """Start (or restart) worker ``index`` on its task queue."""
+        self._ready[index] = False
+        process = self._mp.Process(
+            target=_worker_main,
+            args=(index, self.engine_factory, self._shm.name, self._slot_bytes,
+                  self._task_queues[index], self._result_queue),
+            name=f"recognition-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+    
+    def _check_workers(self) -> None:
+        """Give up the frames of dead workers and respawn them (or fail the pool)."""
+        for index, process in enumerate(self._processes):
+            if process is None or process.exitcode is None or not self._running:
+                continue
+            
+            # Died while building its engine: a new one would do the same
+            respawn = self._ready[index]
+            with self._inflight_lock:
+                lost = [self._inflight.pop(seq) for seq in self._worker_jobs[index]]
+                self._worker_jobs[index].clear()
+                stale_queue = self._task_queues[index]
+                if respawn:
+                    # Frames dispatched from now on wait for the replacement
+                    self._task_queues[index] = self._mp.Queue()
+                else:
+                    # Handled once: dispatch and later checks skip this worker
+                    self._task_queues[index] = None
+                    self._processes[index] = None
+            # Nobody reads the old queue any more; don't block on flushing it
+            stale_queue.cancel_join_thread()
+            stale_queue.close()
+            for job, _, slot in lost:
+                self._free_slots.put(slot)
+                self._skip(job.seq)
+            
+            print(f"❌ Recognition worker {index} died (exit code {process.exitcode}), {len(lost)} frames lost")
+            if respawn:
+                self._spawn_worker(index)
+            else:
+                self._fail(f"worker {index} exited with code {process.exitcode} before its engine was ready")
+    
+    def _fail(self, error: str) -> None:
+        """Stop accepting frames; submit_frame() raises from now on."""
+        if self.error is None:
+            self.error = error
+            print(f"❌ Recognition process pool failed: {error}")
+    
+    def _dispatch_loop(self) -> None:
+        """Preprocess in order, then hand frames to workers through free slots."""
+        in_queue = self._queues["preprocess"]
+        
+        while self._running:
+            job = in_queue.get(timeout=0.1)
+            if job is None:
+                continue
+            
+            if self.error is not None:
+                self._skip(job.seq)
+                continue
+            
+            started = time.perf_counter()
+            try:
+                self._run_preprocess(job)
+            except Exception as e:
+                print(f"❌ Pipeline preprocess error (frame {job.seq}): {e}")
+                self._skip(job.seq)
+                continue
+            
+            finished = time.perf_counter()
+            self.stats["preprocess"].add(finished - job.stage_done, finished - started)
+            self.recognize_usecase.observe_stage("preprocess", finished - started)
+            job.stage_done = finished
+            context = job.context
+            
+            if context.skipped:
+                # Nothing to detect: straight to the ordered apply stage
+                self._queues["apply"].put(job)
+                continue
+            
+            rgb = np.ascontiguousarray(context.rgb_frame)
+            self._ensure_workers(max(rgb.nbytes, context.frame_bgr.nbytes))
+            
+            if rgb.nbytes > self._slot_bytes:
+                print(f"⚠️  Frame {job.seq} larger than shared-memory slot, skipped")
+                self._skip(job.seq)
+                continue
+            
+            try:
+                slot = self._free_slots.get_nowait()
+            except Empty:
+                # Every worker is busy: drop instead of queueing stale frames
+                self._on_drop(job)
+                continue
+            
+            offset = slot * self._slot_bytes
+            view = np.ndarray(rgb.shape, dtype=rgb.dtype, buffer=self._shm.buf, offset=offset)
+            view[...] = rgb
+            del view
+            
+            # Workers read the slot; the main process no longer needs the pixels
+            context.rgb_frame = None
+            with self._inflight_lock:
+                # Least busy worker that is still running (or being replaced)
+                workers = [i for i in range(self.workers) if self._task_queues[i] is not None]
+                if workers:
+                    worker = min(workers, key=lambda i: len(self._worker_jobs[i]))
+                    self._inflight[job.seq] = (job, worker, slot)
+                    self._worker_jobs[worker].add(job.seq)
+                    # Under the lock: a dead worker's queue is swapped under it too
+                    self._task_queues[worker].put((job.seq, slot, rgb.shape, rgb.dtype.str, context.regions))
+            if not workers:
+                self._free_slots.put(slot)
+                self._skip(job.seq)
+    
+    def _collect_loop(self) -> None:
+        """Receive worker results, match against the gallery, pass on in any order."""
+        while self._running:
+            now = time.perf_counter()
+            if self._processes and now - self._last_health_check >= HEALTH_CHECK_INTERVAL:
+                self._last_health_check = now
+                self._check_workers()
+            
+            try:
+                worker, seq, detected_faces, error, service = self._result_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            
+            if seq is None:
+                # Worker start-up report: engine ready, or the error that stopped it
+                if error is None:
+                    self._ready[worker] = True
+                else:
+                    self._fail(f"worker {worker} could not create its face engine: {error}")
+                continue
+            
+            with self._inflight_lock:
+                entry = self._inflight.pop(seq, None)
+                if entry is not None:
+                    self._worker_jobs[entry[1]].discard(seq)
+            if entry is None:
+                # Already given up on (its worker was declared dead)
+                continue
+            job, _, slot = entry
+            self._free_slots.put(slot)
+            
+            if error is not None:
+                print(f"❌ Pipeline worker error (frame {seq}): {error}")
+                self._skip(seq)
+                continue
+            
+            finished = time.perf_counter()
+            self.stats["detect"].add(finished - job.stage_done, service)
+            self.recognize_usecase.observe_stage("detect", service)
+            job.stage_done = finished
+            job.context.detected_faces = detected_faces
+            
+            started = time.perf_counter()
+            try:
+                self._run_embed(job)
+            except Exception as e:
+                print(f"❌ Pipeline match error (frame {seq}): {e}")
+                self._skip(seq)
+                continue
+            
+            finished = time.perf_counter()
+            self.stats["embed"].add(finished - job.stage_done, finished - started)
+            self.recognize_usecase.observe_stage("embed", finished - started)
+            job.stage_done = finished
+            self._queues["apply"].put(job)
+
+
+def _worker_main(index: int, engine_factory, shm_name: str, slot_bytes: int, task_queue, result_queue) -> None:
+    """
+    Worker process: build an engine once, then detect + encode frames from shared memory.
+    
+    Results are (worker, seq, detected faces, error, service seconds); seq is
+    None for the start-up report (error None = engine ready).
+    """
+    try:
+        engine = engine_factory()
+    except Exception as e:
+        result_queue.put((index, None, None, f"{type(e).__name__}: {e}", 0.0))
+        return
+    result_queue.put((index, None, None, None, 0.0))
+    shm = shared_memory.SharedMemory(name=shm_name)
+    
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            
+            seq, slot, shape, dtype, regions = task
+            started = time.perf_counter()
+            try:
+                rgb = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=slot * slot_bytes)
+                if regions:
+                    detected_faces = engine.analyze_regions(rgb, regions)
+                else:
+                    detected_faces = engine.analyze_faces(rgb)
+                del rgb
+                result_queue.put((index, seq, detected_faces, None, time.perf_counter() - started))
+            except Exception as e:
+                result_queue.put((index, seq, [], str(e) or type(e).__name__, time.perf_counter() - started))
+    finally:
+        shm.close()
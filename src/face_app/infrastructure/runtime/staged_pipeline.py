@@ -0,0 +1,389 @@
+"""Staged recognition pipeline - preprocess, detect, embed/match and side effects on separate threads."""
+import heapq
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from queue import Queue, Empty, Full
+from typing import Callable, Dict, List, Optional, Set
+import numpy as np
+from face_app.domain.ports import NULL_METRICS
+
+
+STAGES = ("preprocess", "detect", "embed", "apply")
+
+
+class StageStats:
+    """Rolling latency samples for one stage."""
+    
+    def __init__(self, window: int = 200):
+        """
+        Initialize stats.
+        
+        Args:
+            window: Number of recent samples kept for percentiles
+        """
+        self._latency = deque(maxlen=window)  # Queue wait + service time
+        self._service = deque(maxlen=window)  # Time spent in the stage itself
+        self._lock = threading.Lock()
+        self.count = 0
+    
+    def add(self, latency: float, service: float) -> None:
+        """Record one frame (seconds)."""
+        with self._lock:
+            self._latency.append(latency)
+            self._service.append(service)
+            self.count += 1
+    
+    def summary(self) -> Dict[str, float]:
+        """Percentiles in milliseconds."""
+        with self._lock:
+            latency = np.array(self._latency, dtype=np.float64) * 1000
+            service = np.array(self._service, dtype=np.float64) * 1000
+            count = self.count
+        
+        if latency.size == 0:
+            return {"count": count, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "service_p50_ms": 0.0}
+        
+        return {
+            "count": count,
+            "p50_ms": float(np.percentile(latency, 50)),
+            "p95_ms": float(np.percentile(latency, 95)),
+            "p99_ms": float(np.percentile(latency, 99)),
+            "service_p50_ms": float(np.percentile(service, 50)),
+        }
+
+
+@dataclass(order=True)
+class _Job:
+    """One frame travelling through the pipeline."""
+    seq: int
+    frame: Optional[np.ndarray] = field(default=None, compare=False)
+    active: bool = field(default=True, compare=False)
+    context: object = field(default=None, compare=False)
+    submitted: float = field(default=0.0, compare=False)
+    stage_done: float = field(default=0.0, compare=False)  # When the previous stage finished
+
+
+class _DropOldestQueue:
+    """Bounded queue that discards the oldest item instead of blocking the producer."""
+    
+    def __init__(self, maxsize: int, on_drop: Callable[[_Job], None]):
+        self._queue = Queue(maxsize=max(1, maxsize))
+        self._on_drop = on_drop
+    
+    def put(self, job: _Job) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(job)
+                return
+            except Full:
+                try:
+                    self._on_drop(self._queue.get_nowait())
+                except Empty:
+                    pass
+    
+    def get(self, timeout: float) -> Optional[_Job]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+
+class StagedRecognitionPipeline:
+    """
+    Run RecognizeFrameUseCase stages on their own threads.
+    
+    capture (caller) -> preprocess -> detect -> embed/match -> apply (side effects)
+    
+    Queues between stages are bounded and drop the oldest frame when full,
+    so latency stays bounded when recognition is slower than the camera.
+    Frames carry a sequence number; detect/embed may run on several workers
+    and the apply stage puts results back in frame order (skipping dropped
+    frames) before touching monitors, the database, email or MQTT.
+    """
+    
+    def __init__(
+        self,
+        recognize_usecase,
+        queue_size: int = 2,
+        detect_workers: int = 1,
+        embed_workers: int = 1,
+        stats_window: int = 200
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            recognize_usecase: RecognizeFrameUseCase (or subclass) exposing the stage methods
+            queue_size: Capacity of each inter-stage queue
+            detect_workers: Threads for face detection (engine must be thread-safe if > 1)
+            embed_workers: Threads for encoding + matching
+            stats_window: Frames kept for latency percentiles
+        """
+        self.recognize_usecase = recognize_usecase
+        # Stage times and results are reported through the use case's metrics
+        self.metrics = getattr(recognize_usecase, "metrics", None) or NULL_METRICS
+        self._metrics_camera = getattr(recognize_usecase, "camera_id", None) or "default"
+        
+        if not getattr(recognize_usecase, "parallel_stages", True):
+            # Stateful use case (tracking): keep every stage sequential
+            detect_workers = embed_workers = 1
+        self.detect_workers = max(1, detect_workers)
+        self.embed_workers = max(1, embed_workers)
+        self.queue_size = max(1, queue_size)
+        
+        self._queues = {
+            stage: _DropOldestQueue(queue_size, self._on_drop)
+            for stage in STAGES
+        }
+        self.stats = {stage: StageStats(stats_window) for stage in STAGES}
+        self.total = StageStats(stats_window)
+        
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._seq = 0
+        self._dropped = 0
+        
+        # Reordering state (apply stage)
+        self._order_lock = threading.Lock()
+        self._skipped_seqs: Set[int] = set()
+        self._next_seq = 0
+        
+        # Latest result for the presentation layer
+        self._result_cond = threading.Condition()
+        self._result = None
+        self._result_seq = -1
+        self._returned_seq = -1
+        self._applied = 0
+        self._started_at = 0.0
+        self._result_listeners: List[Callable[[int, object], None]] = []
+    
+    def start(self) -> None:
+        """Start stage threads."""
+        if self._running:
+            return
+        
+        self._running = True
+        self._started_at = time.perf_counter()
+        
+        workers = [
+            ("preprocess", 1, self._run_preprocess, "detect"),
+            ("detect", self.detect_workers, self._run_detect, "embed"),
+            ("embed", self.embed_workers, self._run_embed, "apply"),
+        ]
+        for stage, count, fn, next_stage in workers:
+            for i in range(count):
+                thread = threading.Thread(
+                    target=self._stage_loop,
+                    args=(stage, fn, next_stage),
+                    name=f"pipeline-{stage}-{i}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        
+        thread = threading.Thread(target=self._apply_loop, name="pipeline-apply", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        
+        print(f"✅ Recognition pipeline started (detect x{self.detect_workers}, embed x{self.embed_workers})")
+    
+    def stop(self) -> None:
+        """Stop stage threads."""
+        self._running = False
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+        self._threads = []
+        print("👋 Recognition pipeline stopped")
+    
+    def submit_frame(self, frame: np.ndarray, active: bool = True) -> int:
+        """
+        Submit a frame (never blocks; the oldest queued frame is dropped if full).
+        
+        Args:
+            frame: BGR frame (must not be modified by the caller afterwards)
+            active: Control database logging and email for this frame
+        
+        Returns:
+            Sequence number of the frame
+        """
+        now = time.perf_counter()
+        with self._order_lock:
+            seq = self._seq
+            self._seq += 1
+        
+        self._queues["preprocess"].put(_Job(seq=seq, frame=frame, active=active, submitted=now, stage_done=now))
+        return seq
+    
+    def get_result(self, timeout: float = 0.0):
+        """
+        Get the newest recognition result not returned yet.
+        
+        Args:
+            timeout: Seconds to wait for a new result
+        
+        Returns:
+            RecognitionResult or None
+        """
+        with self._result_cond:
+            if self._result_seq <= self._returned_seq and timeout > 0:
+                self._result_cond.wait(timeout)
+            if self._result_seq <= self._returned_seq:
+                return None
+            self._returned_seq = self._result_seq
+            return self._result
+    
+    def add_result_listener(self, callback: Callable[[int, object], None]) -> None:
+        """
+        Register a callback invoked on the apply thread for every applied frame.
+        
+        Args:
+            callback: Function receiving (seq, RecognitionResult); must be quick
+        """
+        self._result_listeners.append(callback)
+    
+    @property
+    def capacity(self) -> int:
+        """
+        Frames that can be in flight without a queue dropping one.
+        
+        Detection is the slow stage: every detect worker busy plus a full
+        queue in front of them. Producers that must not lose frames (fast
+        replay, benchmarks) wait for results beyond this.
+        """
+        return self.queue_size + self.detect_workers
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the frame the newest result belongs to."""
+        return self._result_seq
+    
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Per-stage latency (queue wait + service) and end-to-end latency.
+        
+        Returns:
+            {"stages": {stage: summary}, "total": summary, "fps": float, "dropped": int}
+        """
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "stages": {stage: stats.summary() for stage, stats in self.stats.items()},
+            "total": self.total.summary(),
+            "fps": self._applied / elapsed if elapsed > 0 else 0.0,
+            "dropped": self._dropped,
+        }
+    
+    def format_stats(self) -> str:
+        """One-line latency report."""
+        stats = self.get_stats()
+        parts = [
+            f"{stage} {summary['p50_ms']:.1f}/{summary['p95_ms']:.1f}"
+            for stage, summary in stats["stages"].items()
+        ]
+        total = stats["total"]
+        return (f"⏱️  Pipeline p50/p95 ms: {' | '.join(parts)} | "
+                f"total {total['p50_ms']:.1f}/{total['p95_ms']:.1f} | "
+                f"{stats['fps']:.1f} FPS, {stats['dropped']} dropped")
+    
+    # Stage bodies
+    
+    def _run_preprocess(self, job: _Job) -> None:
+        job.context = self.recognize_usecase.preprocess(job.frame, job.active)
+        job.frame = None
+    
+    def _run_detect(self, job: _Job) -> None:
+        job.context = self.recognize_usecase.detect(job.context)
+    
+    def _run_embed(self, job: _Job) -> None:
+        job.context = self.recognize_usecase.embed_and_match(job.context)
+    
+    # Plumbing
+    
+    def _stage_loop(self, stage: str, fn: Callable[[_Job], None], next_stage: str) -> None:
+        """Worker: take a job, run the stage, pass it on."""
+        in_queue = self._queues[stage]
+        out_queue = self._queues[next_stage]
+        
+        while self._running:
+            job = in_queue.get(timeout=0.1)
+            if job is None:
+                continue
+            
+            started = time.perf_counter()
+            try:
+                fn(job)
+            except Exception as e:
+                print(f"❌ Pipeline {stage} error (frame {job.seq}): {e}")
+                self._skip(job.seq)
+                continue
+            
+            finished = time.perf_counter()
+            self.stats[stage].add(finished - job.stage_done, finished - started)
+            self.recognize_usecase.observe_stage(stage, finished - started)
+            job.stage_done = finished
+            out_queue.put(job)
+    
+    def _apply_loop(self) -> None:
+        """Single worker: restore frame order, then run side effects."""
+        in_queue = self._queues["apply"]
+        pending: List[_Job] = []
+        
+        while self._running:
+            job = in_queue.get(timeout=0.1)
+            if job is not None:
+                heapq.heappush(pending, job)
+            
+            for ready in self._release_in_order(pending):
+                started = time.perf_counter()
+                try:
+                    result = self.recognize_usecase.apply_side_effects(ready.context)
+                except Exception as e:
+                    print(f"❌ Pipeline apply error (frame {ready.seq}): {e}")
+                    continue
+                
+                finished = time.perf_counter()
+                self.stats["apply"].add(finished - ready.stage_done, finished - started)
+                self.total.add(finished - ready.submitted, finished - ready.submitted)
+                self.recognize_usecase.observe_stage("apply", finished - started)
+                self.recognize_usecase.observe_result(result)
+                
+                with self._result_cond:
+                    self._result = result
+                    self._result_seq = ready.seq
+                    self._applied += 1
+                    self._result_cond.notify_all()
+                
+                for listener in self._result_listeners:
+                    listener(ready.seq, result)
+    
+    def _release_in_order(self, pending: List[_Job]) -> List[_Job]:
+        """Pop jobs whose predecessors were all applied or dropped."""
+        ready = []
+        with self._order_lock:
+            while True:
+                if self._next_seq in self._skipped_seqs:
+                    self._skipped_seqs.discard(self._next_seq)
+                    self._next_seq += 1
+                elif pending and pending[0].seq == self._next_seq:
+                    ready.append(heapq.heappop(pending))
+                    self._next_seq += 1
+                elif pending and pending[0].seq < self._next_seq:
+                    # Arrived after being given up on; too late to apply
+                    heapq.heappop(pending)
+                else:
+                    break
+        return ready
+    
+    def _on_drop(self, job: _Job) -> None:
+        """A queue discarded a frame."""
+        self._dropped += 1
+        self.metrics.inc("frames_dropped_total", camera=self._metrics_camera)
+        self._skip(job.seq)
+    
+    def _skip(self, seq: int) -> None:
+        """Let the apply stage move past a frame that will never arrive."""
+        with self._order_lock:
+            if seq >= self._next_seq:
+                self._skipped_seqs.add(seq)
@@ -3,17 +3,81 @@ import cv2
 import numpy as np
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from scipy.optimize import linear_sum_assignment
 from face_app.domain.entities import BoundingBox, FaceMatch
 
 
+# Cost for pairs that must not be assigned (kept finite for linear_sum_assignment)
+_INVALID_COST = 1e6
+
+
+def _tracker_factory():
+    """
+    Fastest OpenCV tracker constructor available.
+    
+    KCF ships with opencv-contrib (``cv2.TrackerKCF_create``, or under
+    ``cv2.legacy`` in OpenCV >= 4.5.1); plain opencv-python only has MIL.
+    """
+    legacy = getattr(cv2, "legacy", None)
+    for factory in (
+        getattr(cv2, "TrackerKCF_create", None),
+        getattr(legacy, "TrackerKCF_create", None),
+        getattr(cv2, "TrackerMIL_create", None),
+    ):
+        if factory is not None:
+            return factory
+    raise RuntimeError("This OpenCV build has no KCF or MIL tracker (install opencv-contrib-python)")
+
+
+def _box_array(boxes: List[BoundingBox]) -> np.ndarray:
+    """Stack boxes into an (N, 4) float array of [left, top, right, bottom]."""
+    return np.array(
+        [(box.left, box.top, box.right, box.bottom) for box in boxes],
+        dtype=np.float32
+    ).reshape(-1, 4)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Intersection over Union.
+    
+    Args:
+        boxes_a: (N, 4) array of [left, top, right, bottom]
+        boxes_b: (M, 4) array of [left, top, right, bottom]
+    
+    Returns:
+        (N, M) IoU matrix
+    """
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersection = inter_w * inter_h
+    
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
 @dataclass
 class TrackedFace:
     """A tracked face across frames."""
     track_id: int
     bbox: BoundingBox
-    match: FaceMatch
+    match: Optional[FaceMatch]  # None until the face has been encoded + matched
     frames_since_update: int = 0
     total_frames: int = 1
+    encoding: Optional[np.ndarray] = None  # Latest embedding of the face (appearance cue)
+    verified_frame: int = -1  # Tracker frame of the last verification (-1 = never)
 
 
 class FaceTracker:
@@ -23,7 +87,8 @@ class FaceTracker:
         self, 
         detect_interval: int = 5,  # Detect every N frames
         max_disappeared: int = 10,  # Remove track after N frames
-        iou_threshold: float = 0.3  # IoU threshold for matching
+        iou_threshold: float = 0.3,  # IoU threshold for matching
+        appearance_weight: float = 0.0  # Weight of embedding distance in assignment cost
     ):
         """
         Initialize face tracker.
@@ -32,10 +97,13 @@ class FaceTracker:
             detect_interval: Run full detection every N frames (track in between)
             max_disappeared: Remove track if not updated for N frames
             iou_threshold: IoU threshold for bbox matching
+            appearance_weight: 0 = IoU only; >0 blends in embedding distance when
+                detections come with embeddings (fewer ID switches in crowds)
         """
         self.detect_interval = detect_interval
         self.max_disappeared = max_disappeared
         self.iou_threshold = iou_threshold
+        self.appearance_weight = appearance_weight
         
         self.tracks: Dict[int, TrackedFace] = {}
         self.next_track_id = 0
@@ -45,14 +113,15 @@ class FaceTracker:
         self.cv_trackers: Dict[int, cv2.Tracker] = {}
     
     def should_detect(self) -> bool:
-        """Check if we should run full detection this frame."""
+        """Check if we should run full detection on the next update_tracks() frame."""
         return self.frame_count % self.detect_interval == 0
     
     def update_tracks(
         self, 
         frame: np.ndarray,
         boxes: Optional[List[BoundingBox]] = None,
-        matches: Optional[List[FaceMatch]] = None
+        matches: Optional[List[FaceMatch]] = None,
+        encodings: Optional[List[np.ndarray]] = None
     ) -> List[TrackedFace]:
         """
         Update tracks with new detections or track existing faces.
@@ -60,53 +129,76 @@ class FaceTracker:
         Args:
             frame: BGR frame
             boxes: New detected boxes (if detection frame)
-            matches: Face matches corresponding to boxes
+            matches: Face matches corresponding to boxes (None keeps the track's identity)
+            encodings: Optional embeddings corresponding to boxes (appearance cue)
             
         Returns:
             List of tracked faces
         """
-        self.frame_count += 1
-        
+        # Decide before advancing the counter, so frame 0 is a detection frame
         if self.should_detect() and boxes is not None:
             # Full detection frame - update/create tracks
-            return self._update_with_detections(frame, boxes, matches or [])
+            tracks = self._update_with_detections(frame, boxes, matches or [], encodings)
         else:
             # Tracking frame - update positions using tracker
-            return self._update_with_tracking(frame)
+            tracks = self._update_with_tracking(frame)
+        
+        self.frame_count += 1
+        return tracks
+    
+    def mark_verified(self, track: TrackedFace, match: FaceMatch, encoding: Optional[np.ndarray] = None) -> None:
+        """
+        Cache the identity of a track after it was encoded + matched.
+        
+        Args:
+            track: Track that was verified
+            match: Match result for its face
+            encoding: Embedding used for the match
+        """
+        track.match = match
+        track.encoding = encoding
+        track.verified_frame = self.frame_count
+    
+    def invalidate_identities(self) -> None:
+        """Force every track to be re-verified (e.g. after the gallery changed)."""
+        for track in self.tracks.values():
+            track.verified_frame = -1
     
     def _update_with_detections(
         self,
         frame: np.ndarray,
         boxes: List[BoundingBox],
-        matches: List[FaceMatch]
+        matches: List[FaceMatch],
+        encodings: Optional[List[np.ndarray]] = None
     ) -> List[TrackedFace]:
-        """Update tracks with new detections."""
-        # Match new detections to existing tracks
+        """Update tracks with new detections (one-to-one optimal assignment)."""
+        matches = list(matches) + [None] * (len(boxes) - len(matches))
+        if encodings is not None and len(encodings) != len(boxes):
+            encodings = None
+        
+        track_ids = list(self.tracks.keys())
+        assignment = self._assign(boxes, encodings, track_ids)
+        
         matched_tracks = set()
-        new_tracks = []
         
-        for box, match in zip(boxes, matches):
-            # Find best matching track
-            best_track_id = None
-            best_iou = 0.0
-            
-            for track_id, track in self.tracks.items():
-                iou = self._compute_iou(box, track.bbox)
-                if iou > best_iou and iou > self.iou_threshold:
-                    best_iou = iou
-                    best_track_id = track_id
+        for i, (box, match) in enumerate(zip(boxes, matches)):
+            track_id = assignment.get(i)
+            encoding = encodings[i] if encodings is not None else None
             
-            if best_track_id is not None:
+            if track_id is not None:
                 # Update existing track
-                track = self.tracks[best_track_id]
+                track = self.tracks[track_id]
                 track.bbox = box
-                track.match = match
+                if match is not None:
+                    track.match = match
+                if encoding is not None:
+                    track.encoding = encoding
                 track.frames_since_update = 0
                 track.total_frames += 1
-                matched_tracks.add(best_track_id)
+                matched_tracks.add(track_id)
                 
                 # Reinitialize CV tracker
-                self._init_cv_tracker(frame, best_track_id, box)
+                self._init_cv_tracker(frame, track_id, box)
             else:
                 # Create new track
                 track = TrackedFace(
@@ -114,9 +206,11 @@ class FaceTracker:
                     bbox=box,
                     match=match,
                     frames_since_update=0,
-                    total_frames=1
+                    total_frames=1,
+                    encoding=encoding
                 )
                 self.tracks[self.next_track_id] = track
+                matched_tracks.add(self.next_track_id)
                 self._init_cv_tracker(frame, self.next_track_id, box)
                 self.next_track_id += 1
         
@@ -135,6 +229,55 @@ class FaceTracker:
         
         return list(self.tracks.values())
     
+    def _assign(
+        self,
+        boxes: List[BoundingBox],
+        encodings: Optional[List[np.ndarray]],
+        track_ids: List[int]
+    ) -> Dict[int, int]:
+        """
+        Assign detections to existing tracks.
+        
+        Cost is 1 - IoU, blended with the embedding (cosine) distance when
+        both sides have an embedding. Pairs below the IoU threshold are never
+        assigned; each track takes at most one detection.
+        
+        Returns:
+            {detection index: track_id}
+        """
+        if not boxes or not track_ids:
+            return {}
+        
+        track_boxes = _box_array([self.tracks[tid].bbox for tid in track_ids])
+        iou = iou_matrix(_box_array(boxes), track_boxes)
+        cost = 1.0 - iou
+        
+        if encodings is not None and self.appearance_weight > 0:
+            track_encodings = [self.tracks[tid].encoding for tid in track_ids]
+            has_encoding = np.array([e is not None for e in track_encodings])
+            
+            if has_encoding.any():
+                dim = len(encodings[0])
+                det = _unit_rows(np.asarray(encodings, dtype=np.float32))
+                trk = _unit_rows(np.stack([
+                    np.asarray(e, dtype=np.float32) if e is not None else np.zeros(dim, np.float32)
+                    for e in track_encodings
+                ]))
+                appearance = np.clip(1.0 - det @ trk.T, 0.0, 1.0)
+                blended = (1 - self.appearance_weight) * cost + self.appearance_weight * appearance
+                cost = np.where(has_encoding[None, :], blended, cost)
+        
+        valid = iou > self.iou_threshold
+        cost = np.where(valid, cost, _INVALID_COST)
+        
+        rows, cols = linear_sum_assignment(cost)
+        
+        return {
+            int(r): track_ids[c]
+            for r, c in zip(rows, cols)
+            if valid[r, c]
+        }
+    
     def _update_with_tracking(self, frame: np.ndarray) -> List[TrackedFace]:
         """Update tracks using OpenCV tracker."""
         tracks_to_remove = []
@@ -169,8 +312,8 @@ class FaceTracker:
     
     def _init_cv_tracker(self, frame: np.ndarray, track_id: int, box: BoundingBox):
         """Initialize OpenCV tracker for a track."""
-        # Use CSRT tracker (accurate but slower) or KCF (faster)
-        tracker = cv2.TrackerKCF_create()
+        # KCF (fast) when opencv-contrib is installed, MIL otherwise
+        tracker = _tracker_factory()()
         
         # Convert bbox to (x, y, w, h)
         bbox_xywh = (
@@ -183,26 +326,6 @@ class FaceTracker:
         tracker.init(frame, bbox_xywh)
         self.cv_trackers[track_id] = tracker
     
-    def _compute_iou(self, box1: BoundingBox, box2: BoundingBox) -> float:
-        """Compute Intersection over Union between two boxes."""
-        # Compute intersection
-        x_left = max(box1.left, box2.left)
-        y_top = max(box1.top, box2.top)
-        x_right = min(box1.right, box2.right)
-        y_bottom = min(box1.bottom, box2.bottom)
-        
-        if x_right < x_left or y_bottom < y_top:
-            return 0.0
-        
-        intersection = (x_right - x_left) * (y_bottom - y_top)
-        
-        # Compute union
-        area1 = (box1.right - box1.left) * (box1.bottom - box1.top)
-        area2 = (box2.right - box2.left) * (box2.bottom - box2.top)
-        union = area1 + area2 - intersection
-        
-        return intersection / union if union > 0 else 0.0
-    
     def reset(self):
         """Reset all tracks."""
         self.tracks.clear()
@@ -4,6 +4,11 @@ from face_app.infrastructure.camera.opencv_camera import OpenCVCamera
 from face_app.infrastructure.face_engines.fr_dlib_engine import FRDlibEngine
 from face_app.infrastructure.repos.filesystem_known_repo import FilesystemKnownRepo
 from face_app.infrastructure.repos.sqlite_recognition_repo import SQLiteRecognitionRepo
+from face_app.infrastructure.repos.gallery_index_store import GalleryIndexBuilder, GalleryIndexStore
+from face_app.infrastructure.repos.dataset_watcher import DatasetWatcher
+from face_app.infrastructure.motion.motion_gate import MotionGate
+from face_app.infrastructure.runtime.staged_pipeline import StagedRecognitionPipeline
+from face_app.infrastructure.runtime.process_pipeline import ProcessRecognitionPipeline
 from face_app.infrastructure.monitoring.stranger_monitor import StrangerMonitor
 from face_app.infrastructure.monitoring.person_detection_monitor import PersonDetectionMonitor
 from face_app.infrastructure.notifications.email_service import EmailNotificationService
@@ -76,7 +81,11 @@ def main():
             print(f"   ✅ Stranger monitor: {settings.STRANGER_THRESHOLD} detections/{settings.STRANGER_TIME_WINDOW}s")
         
         # Initialize application (use cases)
-        load_known_usecase = LoadKnownFacesUseCase(known_repo)
+        load_known_usecase = LoadKnownFacesUseCase(
+            known_repo,
+            metric=face_engine.distance_metric,
+            index_builder=GalleryIndexBuilder(store=GalleryIndexStore.for_repo(known_repo))
+        )
         print("   ✅ Use cases initialized")
         
         # Load known faces
@@ -85,32 +94,34 @@ def main():
         print("=" * 60)
         
         # Initialize known person monitors (one per person)
+        def make_known_person_monitor(person_name: str) -> PersonDetectionMonitor:
+            """Create a monitor that logs a known person once the threshold is reached."""
+            def on_known_person_detected(person: str, count: int, timestamp: datetime):
+                """Callback when known person threshold exceeded."""
+                print(f"\n✅ Xác nhận: {person_name} xuất hiện {count} lần trong {settings.KNOWN_PERSON_TIME_WINDOW}s")
+                
+                # Log to database when threshold reached
+                time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                recognition_repo.insert_event(person_name, time_str)
+                print(f"📝 Logged: {person_name} at {time_str}")
+            
+            monitor = PersonDetectionMonitor(
+                person_name=person_name,
+                time_window_seconds=settings.KNOWN_PERSON_TIME_WINDOW,
+                threshold=settings.KNOWN_PERSON_THRESHOLD,
+                alert_callback=on_known_person_detected,
+                alert_cooldown_seconds=settings.KNOWN_PERSON_LOG_COOLDOWN
+            )
+            print(f"   ✅ {person_name}: {settings.KNOWN_PERSON_THRESHOLD} detections/{settings.KNOWN_PERSON_TIME_WINDOW}s")
+            return monitor
+        
         known_person_monitors = {}
         if settings.ENABLE_KNOWN_PERSON_TRACKING and encodings:
             unique_names = set(names)
             print(f"\n📊 Thiết lập tracking cho {len(unique_names)} người thân:")
             
             for person_name in unique_names:
-                def make_callback(name):
-                    def on_known_person_detected(person: str, count: int, timestamp: datetime):
-                        """Callback when known person threshold exceeded."""
-                        print(f"\n✅ Xác nhận: {name} xuất hiện {count} lần trong {settings.KNOWN_PERSON_TIME_WINDOW}s")
-                        
-                        # Log to database when threshold reached
-                        time_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                        recognition_repo.insert_event(name, time_str)
-                        print(f"📝 Logged: {name} at {time_str}")
-                    return on_known_person_detected
-                
-                monitor = PersonDetectionMonitor(
-                    person_name=person_name,
-                    time_window_seconds=settings.KNOWN_PERSON_TIME_WINDOW,
-                    threshold=settings.KNOWN_PERSON_THRESHOLD,
-                    alert_callback=make_callback(person_name),
-                    alert_cooldown_seconds=settings.KNOWN_PERSON_LOG_COOLDOWN
-                )
-                known_person_monitors[person_name] = monitor
-                print(f"   ✅ {person_name}: {settings.KNOWN_PERSON_THRESHOLD} detections/{settings.KNOWN_PERSON_TIME_WINDOW}s")
+                known_person_monitors[person_name] = make_known_person_monitor(person_name)
         
         if not encodings:
             print("\n⚠️  WARNING: No known faces loaded!")
@@ -121,27 +132,80 @@ def main():
                 print("👋 Exiting...")
                 return
         
+        # Skip detection on static frames (cheap thumbnail differencing)
+        motion_gate = None
+        if settings.ENABLE_MOTION_GATE:
+            motion_gate = MotionGate(
+                thumb_width=settings.MOTION_THUMB_WIDTH,
+                pixel_threshold=settings.MOTION_PIXEL_THRESHOLD,
+                min_area=settings.MOTION_MIN_AREA,
+                hold_frames=settings.MOTION_HOLD_FRAMES,
+                max_region_fraction=settings.MOTION_REGION_MAX_FRACTION
+            )
+        
         recognize_usecase = RecognizeFrameUseCase(
             face_engine=face_engine,
             load_known_usecase=load_known_usecase,
             recognition_repo=recognition_repo,
             match_policy=match_policy,
             stranger_monitor=stranger_monitor,
-            known_person_monitors=known_person_monitors
+            known_person_monitors=known_person_monitors,
+            known_person_monitor_factory=make_known_person_monitor if settings.ENABLE_KNOWN_PERSON_TRACKING else None,
+            motion_gate=motion_gate,
+            process_every_n_frames=settings.PROCESS_EVERY_N_FRAMES
         )
         
+        # Reload known faces in background whenever known_faces/ changes
+        if settings.ENABLE_DATASET_WATCH:
+            dataset_watcher = DatasetWatcher(
+                settings.KNOWN_FACES_DIR,
+                on_change=load_known_usecase.reload_async,
+                interval_seconds=settings.DATASET_WATCH_INTERVAL
+            )
+            dataset_watcher.start()
+        
         # Initialize camera
         print("\n📷 Opening camera...")
         camera = OpenCVCamera()
         print("   ✅ Camera opened successfully")
         
         # Initialize presentation with stranger monitor
-        app = OpenCVApp(camera, recognize_usecase, stranger_monitor=stranger_monitor)
+        # Recognition stages run in the background when the pipeline is enabled
+        pipeline = None
+        if settings.USE_PIPELINE and settings.PIPELINE_BACKEND == "processes":
+            if recognize_usecase.parallel_stages:
+                # One engine per worker process, frames passed through shared memory
+                pipeline = ProcessRecognitionPipeline(
+                    recognize_usecase,
+                    engine_factory=FRDlibEngine,
+                    workers=settings.PIPELINE_PROCESS_WORKERS,
+                    queue_size=settings.PIPELINE_QUEUE_SIZE
+                )
+            else:
+                print("   ⚠️  Process backend does not support tracking, using threads")
+        if settings.USE_PIPELINE and pipeline is None:
+            pipeline = StagedRecognitionPipeline(
+                recognize_usecase,
+                queue_size=settings.PIPELINE_QUEUE_SIZE,
+                detect_workers=settings.PIPELINE_DETECT_WORKERS,
+                embed_workers=settings.PIPELINE_EMBED_WORKERS
+            )
+        
+        app = OpenCVApp(
+            camera,
+            recognize_usecase,
+            stranger_monitor=stranger_monitor,
+            pipeline=pipeline,
+            stats_interval=settings.PIPELINE_STATS_INTERVAL
+        )
         
         # Run app
         print("\n" + "=" * 60)
         app.run()
         
+        if settings.ENABLE_DATASET_WATCH:
+            dataset_watcher.stop()
+        
     except RuntimeError as e:
         print(f"\n❌ Runtime Error: {e}")
         print("💡 Make sure your camera is connected and not in use by another app")
@@ -151,6 +215,10 @@ def main():
         print(f"\n❌ Unexpected Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Write events still queued for the database
+        if 'recognition_repo' in locals():
+            recognition_repo.close()
     
     print("\n" + "=" * 60)
     print("👋 Face Recognition App terminated")
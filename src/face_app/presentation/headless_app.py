@@ -0,0 +1,162 @@
+"""Headless presentation - run recognition over a camera without a window and report throughput."""
+import time
+from typing import Dict, List
+import numpy as np
+from face_app.domain.ports import CameraPort
+from face_app.application.usecases.recognize_frame import RecognizeFrameUseCase
+
+
+class HeadlessApp:
+    """
+    Drive RecognizeFrameUseCase from any CameraPort and measure it.
+    
+    With a replay camera this turns a recorded clip into a repeatable
+    throughput / latency benchmark on a machine without a camera or display.
+    """
+    
+    def __init__(
+        self,
+        camera: CameraPort,
+        recognize_usecase: RecognizeFrameUseCase,
+        pipeline=None,
+        active: bool = False,
+        max_frames: int = 0,
+        max_in_flight: int = 0,
+        stats_interval: float = 10.0
+    ):
+        """
+        Initialize headless app.
+        
+        Args:
+            camera: Camera port (live or replay)
+            recognize_usecase: Use case for recognizing frames
+            pipeline: Optional StagedRecognitionPipeline / ProcessRecognitionPipeline
+            active: Database logging and alerts (off by default for benchmarks)
+            max_frames: Stop after N frames (0 = until the camera ends)
+            max_in_flight: With a pipeline, wait for results once this many frames
+                are queued (0 = never wait, frames are dropped like with a live camera)
+            stats_interval: Seconds between progress reports (0 = none)
+        """
+        self.camera = camera
+        self.recognize_usecase = recognize_usecase
+        self.pipeline = pipeline
+        self.active = active
+        self.max_frames = max_frames
+        self.max_in_flight = max_in_flight
+        self.stats_interval = stats_interval
+        
+        self._latencies: List[float] = []
+        self._frames = 0
+        self._processed = 0
+        self._faces = 0
+    
+    def run(self) -> Dict[str, object]:
+        """
+        Read frames until the camera ends (or max_frames), then report.
+        
+        Returns:
+            Summary dict (see summary())
+        """
+        if not self.camera.is_opened():
+            print("❌ Camera is not opened!")
+            return self.summary(0.0)
+        
+        reuses_buffers = getattr(self.camera, "reuses_buffers", False)
+        if self.pipeline:
+            # get_result() only returns the newest result: count every applied frame instead
+            self.pipeline.add_result_listener(lambda seq, result: self._count(result))
+            self.pipeline.start()
+        
+        started = time.perf_counter()
+        last_report = started
+        last_seq = -1
+        
+        try:
+            while not self.max_frames or self._frames < self.max_frames:
+                ret, frame = self.camera.read()
+                if not ret:
+                    break
+                self._frames += 1
+                
+                if self.pipeline:
+                    queued = frame.copy() if reuses_buffers else frame
+                    last_seq = self.pipeline.submit_frame(queued, active=self.active)
+                    while self.max_in_flight and last_seq - self.pipeline.last_seq >= self.max_in_flight:
+                        if self.pipeline.get_result(timeout=1.0) is None:
+                            break
+                else:
+                    frame_started = time.perf_counter()
+                    result = self.recognize_usecase.execute(frame, active=self.active)
+                    self._latencies.append(time.perf_counter() - frame_started)
+                    self._count(result)
+                
+                now = time.perf_counter()
+                if self.stats_interval and now - last_report >= self.stats_interval:
+                    print(f"⏱️  {self._frames} frames, {self._processed / (now - started):.1f} recognitions/s")
+                    last_report = now
+            
+            if self.pipeline:
+                # Let in-flight frames finish (dropped frames never report back)
+                while self.pipeline.last_seq < last_seq:
+                    if self.pipeline.get_result(timeout=1.0) is None:
+                        break
+        
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrupted by user")
+        
+        finally:
+            elapsed = time.perf_counter() - started
+            if self.pipeline:
+                self.pipeline.stop()
+            self.camera.release()
+        
+        return self.summary(elapsed)
+    
+    def summary(self, elapsed: float) -> Dict[str, object]:
+        """
+        Throughput and latency of the run.
+        
+        Args:
+            elapsed: Wall-clock seconds of the run
+        
+        Returns:
+            {"frames", "processed", "faces", "seconds", "fps", "recognition_fps",
+             "latency_ms": {"p50", "p95", "p99"}, "pipeline": pipeline stats or None}
+        """
+        if self.pipeline:
+            stats = self.pipeline.get_stats()
+            total = stats["total"]
+            latency = {"p50": total["p50_ms"], "p95": total["p95_ms"], "p99": total["p99_ms"]}
+        else:
+            stats = None
+            samples = np.array(self._latencies, dtype=np.float64) * 1000
+            latency = {
+                f"p{q}": float(np.percentile(samples, q)) if samples.size else 0.0
+                for q in (50, 95, 99)
+            }
+        
+        return {
+            "frames": self._frames,
+            "processed": self._processed,
+            "faces": self._faces,
+            "seconds": elapsed,
+            "fps": self._frames / elapsed if elapsed > 0 else 0.0,
+            "recognition_fps": self._processed / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": latency,
+            "pipeline": stats,
+        }
+    
+    @staticmethod
+    def format_summary(summary: Dict[str, object]) -> str:
+        """Human-readable report."""
+        latency = summary["latency_ms"]
+        return (f"📊 {summary['frames']} frames in {summary['seconds']:.1f}s "
+                f"({summary['fps']:.1f} FPS), {summary['processed']} recognized "
+                f"({summary['recognition_fps']:.1f}/s), {summary['faces']} faces | "
+                f"latency p50/p95/p99 {latency['p50']:.1f}/{latency['p95']:.1f}/{latency['p99']:.1f} ms")
+    
+    def _count(self, result) -> None:
+        """Account for one recognition result."""
+        if result.processed:
+            self._processed += 1
+            self._faces += len(result.faces)
@@ -1,4 +1,5 @@
 """OpenCV presentation layer - UI for face recognition."""
+import time
 import cv2
 import numpy as np
 from face_app.domain.ports import CameraPort
@@ -19,6 +20,8 @@ class OpenCVApp:
         recognize_usecase: RecognizeFrameUseCase,
         stranger_monitor=None,
         mqtt_client=None,
+        pipeline=None,
+        stats_interval: float = 10.0,
         window_name: str = "Face Recognition - Press 'q' to quit"
     ):
         """
@@ -29,12 +32,17 @@ class OpenCVApp:
             recognize_usecase: Use case for recognizing frames
             stranger_monitor: Optional stranger detection monitor
             mqtt_client: Optional MQTT client for PIR sensor control
+            pipeline: Optional StagedRecognitionPipeline; recognition then runs in the
+                background and the display keeps camera FPS
+            stats_interval: Seconds between pipeline latency reports
             window_name: Window title
         """
         self.camera = camera
         self.recognize_usecase = recognize_usecase
         self.stranger_monitor = stranger_monitor
         self.mqtt_client = mqtt_client
+        self.pipeline = pipeline
+        self.stats_interval = stats_interval
         self.window_name = window_name
         
         # Khởi tạo active: False nếu dùng MQTT (chờ PIR), True nếu manual mode
@@ -70,6 +78,12 @@ class OpenCVApp:
             print("❌ Camera is not opened!")
             return
         
+        result = RecognitionResult(faces=[])
+        self._camera_reuses_buffers = getattr(self.camera, "reuses_buffers", False)
+        last_stats = time.perf_counter()
+        if self.pipeline:
+            self.pipeline.start()
+        
         try:
             while True:
                 # Read frame
@@ -79,8 +93,22 @@ class OpenCVApp:
                     print("❌ Failed to read frame from camera")
                     break
                 
-                # Run face recognition (active controls DB/email logging)
-                result = self.recognize_usecase.execute(frame, active=self.active)
+                if self.pipeline:
+                    # Hand the frame to the pipeline, draw the newest finished result
+                    # (cameras with a frame ring recycle the buffer on the next read)
+                    queued = frame.copy() if self._camera_reuses_buffers else frame
+                    self.pipeline.submit_frame(queued, active=self.active)
+                    new_result = self.pipeline.get_result()
+                    if new_result is not None:
+                        result = new_result
+                    
+                    now = time.perf_counter()
+                    if now - last_stats >= self.stats_interval:
+                        print(f"\n{self.pipeline.format_stats()}")
+                        last_stats = now
+                else:
+                    # Run face recognition (active controls DB/email logging)
+                    result = self.recognize_usecase.execute(frame, active=self.active)
                 display_frame = self._draw_results(frame, result)
                 
                 # Show frame
@@ -98,9 +126,9 @@ class OpenCVApp:
                     print("\n👋 Quitting...")
                     break
                 elif key == ord('r'):
-                    # Hot reload known faces
-                    print("\n🔄 Reloading known faces...")
-                    self.recognize_usecase.load_known_usecase.reload()
+                    # Hot reload known faces (background, recognition keeps running)
+                    print("\n🔄 Reloading known faces in background...")
+                    self.recognize_usecase.load_known_usecase.reload_async()
                 elif key == ord('a'):
                     # Toggle active mode
                     self.active = not self.active
@@ -112,6 +140,9 @@ class OpenCVApp:
         
         finally:
             # Cleanup
+            if self.pipeline:
+                self.pipeline.stop()
+                print(self.pipeline.format_stats())
             self.camera.release()
             try:
                 cv2.destroyAllWindows()